@@ -0,0 +1,64 @@
+# Copyright 2025 openGemini Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+bytes on the wire and encode time of a record block per compress method
+
+    python benchmark/compress_benchmark.py [rows]
+"""
+import sys
+import timeit
+
+import numpy
+
+from opengemini_client.codec import compress
+from opengemini_client.columns import columns_to_record
+from opengemini_client.models import CompressMethod
+
+
+def build_block(rows: int) -> bytes:
+    rnd = numpy.random.default_rng(1)
+    record, _, _ = columns_to_record(
+        'cpu',
+        {'host': [f'server{i % 50:02d}' for i in range(rows)], 'region': 'us-west'},
+        {
+            'usage_user': numpy.round(rnd.normal(40, 10, rows), 2),
+            'usage_system': numpy.round(rnd.normal(10, 3, rows), 2),
+            'processes': rnd.integers(100, 400, rows),
+            'healthy': rnd.random(rows) > 0.01,
+        },
+        1700000000 * 10 ** 9 + numpy.arange(rows, dtype=numpy.int64) * 10 ** 9,
+    )
+    return record.marshal(b'')
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    block = build_block(rows)
+    print(f"{rows} rows, uncompressed block {len(block)} bytes")
+    print(f"{'method':<14}{'bytes':>12}{'ratio':>8}{'encode ms':>12}{'decode ms':>12}")
+    for method in CompressMethod:
+        if not compress.is_available(method):
+            print(f"{method.name:<14}{'not installed':>12}")
+            continue
+        compressed = compress.compress_block(method, block)
+        number = 10
+        encode = timeit.timeit(lambda m=method: compress.compress_block(m, block), number=number) / number
+        decode = timeit.timeit(lambda m=method, c=compressed: compress.decompress_block(m, c), number=number) / number
+        print(f"{method.name:<14}{len(compressed):>12}{len(block) / len(compressed):>8.2f}"
+              f"{encode * 1000:>12.2f}{decode * 1000:>12.2f}")
+
+
+if __name__ == '__main__':
+    main()
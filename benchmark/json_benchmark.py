@@ -0,0 +1,89 @@
+# Copyright 2025 openGemini Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+decode time of query response bodies per installed json decoder, including the QueryResult conversion
+
+    python benchmark/json_benchmark.py [rows]
+"""
+import json
+import random
+import sys
+import timeit
+
+from opengemini_client.client_impl import resolve_query_result
+from opengemini_client.codec.json_decode import available_decoders
+
+_start = 1700000000 * 10 ** 9
+
+
+def response(series: list) -> bytes:
+    return json.dumps({'results': [{'statement_id': 0, 'series': series}]}).encode()
+
+
+def wide_series(rows: int) -> bytes:
+    """
+    one series of 50 float and integer fields
+    """
+    rnd = random.Random(1)
+    columns = ['time'] + [f'f{i}' for i in range(25)] + [f'i{i}' for i in range(25)]
+    values = [[_start + row * 10 ** 9] + [round(rnd.uniform(0, 100), 3) for _ in range(25)]
+              + [rnd.randint(0, 10 ** 6) for _ in range(25)] for row in range(rows)]
+    return response([{'name': 'cpu', 'columns': columns, 'values': values}])
+
+
+def many_small_series(rows: int) -> bytes:
+    """
+    a group by over many tag values, each series holds a few rows
+    """
+    rnd = random.Random(2)
+    series = [{'name': 'cpu', 'tags': {'host': f'server{i:05d}', 'region': f'region{i % 8}'},
+               'columns': ['time', 'usage'],
+               'values': [[_start + row * 10 ** 9, round(rnd.uniform(0, 100), 2)] for row in range(4)]}
+              for i in range(max(1, rows // 4))]
+    return response(series)
+
+
+def string_heavy(rows: int) -> bytes:
+    """
+    long, partly non ascii tag and string field values
+    """
+    rnd = random.Random(3)
+    words = ['request', 'latency', 'gateway', 'überprüfung', 'kubernetes', 'pod', '数据库', 'timeout']
+    series = []
+    for i in range(max(1, rows // 100)):
+        tags = {'service': '-'.join(rnd.choices(words, k=4)), 'pod': f'pod-{rnd.getrandbits(64):016x}',
+                'path': '/' + '/'.join(rnd.choices(words, k=6))}
+        values = [[_start + row * 10 ** 9, ' '.join(rnd.choices(words, k=12)), f'trace-{rnd.getrandbits(128):032x}']
+                  for row in range(100)]
+        series.append({'name': 'logs', 'tags': tags, 'columns': ['time', 'message', 'trace_id'], 'values': values})
+    return response(series)
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    decoders = available_decoders()
+    print(f"{'shape':<20}{'bytes':>12}" + ''.join(f"{name + ' ms':>14}" for name in decoders))
+    for shape in (wide_series, many_small_series, string_heavy):
+        body = shape(rows)
+        timings = []
+        for decoder in decoders.values():
+            number = 5
+            elapsed = timeit.timeit(lambda d=decoder: resolve_query_result(d(body)), number=number) / number
+            timings.append(elapsed)
+        print(f"{shape.__name__:<20}{len(body):>12}" + ''.join(f"{t * 1000:>14.2f}" for t in timings))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+# Copyright 2025 openGemini Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+line protocol encode time with and without the series key cache, for points repeating few series and for
+points that all belong to different series
+
+    python benchmark/series_key_benchmark.py [points]
+"""
+import sys
+import time
+from typing import List, Optional
+
+from opengemini_client.line_protocol import SeriesKeyCache, encode_batch_points
+from opengemini_client.models import BatchPoints, Point, Precision, SeriesKeyCacheConfig
+
+
+def build_points(points: int, series: int, first: int) -> BatchPoints:
+    return BatchPoints(points=[
+        Point(measurement='cpu usage', precision=Precision.PrecisionSecond,
+              tags={'host': f'server {i % series:08d}', 'region': 'us-west,2', 'rack': f'r{i % series % 40}'},
+              fields={'usage_user': 40.5, 'processes': i}, timestamp=1700000000 + i)
+        for i in range(first, first + points)
+    ])
+
+
+def encode_time(batches: List[BatchPoints], series_keys: Optional[SeriesKeyCache]) -> float:
+    start = time.perf_counter()
+    for batch_points in batches:
+        encode_batch_points(batch_points, series_keys)
+    return (time.perf_counter() - start) / len(batches)
+
+
+def main():
+    points = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    batches = 5
+    print(f"{batches} batches of {points} points")
+    print(f"{'workload':<18}{'no cache ms':>12}{'cache ms':>12}{'hit rate':>10}{'bypassed':>10}{'cache bytes':>13}")
+    # high cardinality batches never repeat a series, not even across batches
+    for name, series in [('low cardinality', 50), ('high cardinality', points * batches)]:
+        workload = [build_points(points, series, i * points) for i in range(batches)]
+        plain = encode_time(workload, None)
+        cache = SeriesKeyCache(SeriesKeyCacheConfig())
+        cached = encode_time(workload, cache)
+        stats = cache.stats()
+        print(f"{name:<18}{plain * 1000:>12.2f}{cached * 1000:>12.2f}{stats.hit_rate:>10.2%}"
+              f"{stats.bypassed:>10}{stats.size:>13}")
+
+
+if __name__ == '__main__':
+    main()
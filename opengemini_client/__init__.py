@@ -13,23 +13,41 @@
 # limitations under the License.
 
 from .client_impl import OpenGeminiDBClient as Client
+from .async_client import AsyncOpenGeminiDBClient as AsyncClient
 
 from .models import (
     Address,
     AuthConfig,
     AuthType,
+    BalanceStrategy,
+    BalancerConfig,
     BatchConfig,
     BatchPoints,
+    ColumnarSeries,
+    CompactPoint,
+    CompressMethod,
     Config,
+    GrpcConfig,
+    HedgeConfig,
     KeyValue,
+    MetadataCacheConfig,
+    OverflowPolicy,
+    ParallelWriteConfig,
+    ParallelWriteResult,
     Point,
     Precision,
     Query,
+    QueryCacheConfig,
     QueryResult,
+    ResponseFormat,
     RetentionPolicy,
+    RetryConfig,
     RpConfig,
     Series,
+    SeriesKeyCacheConfig,
     SeriesResult,
+    SpoolConfig,
+    SubBatchResult,
     TlsConfig,
     ValuesResult
 )
@@ -43,3 +61,9 @@ from .measurement import (
     Measurement,
     MeasurementCondition
 )
+
+from .schema import (
+    SchemaRegistry,
+    SchemaRow,
+    SchemaWriter
+)
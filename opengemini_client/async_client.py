@@ -0,0 +1,554 @@
+# Copyright 2025 openGemini Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+asyncio client, same surface as client.Client with awaitable methods
+"""
+import asyncio
+import logging
+import ssl
+from http import HTTPStatus
+from typing import AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+import aiohttp
+import grpc
+from requests import HTTPError
+
+from opengemini_client import grpc_client
+from opengemini_client.balancer import Balancer
+from opengemini_client.batch_writer import AsyncBatchWriter, WriteCallback, call_callbacks
+from opengemini_client.cache import DATABASE_LIST, batch_measurements, invalidating, invalidating_metadata, \
+    new_metadata_cache, new_query_cache
+from opengemini_client.client_impl import check_config, build_headers, compress_body, resolve_query_result, \
+    create_database_command, drop_database_command, create_retention_policy_command, \
+    show_retention_policies_command, drop_retention_policy_command, create_measurement_command, \
+    show_measurements_command, drop_measurement_command, check_show_command, resolve_databases, \
+    resolve_retention_policies, resolve_values_any, resolve_values_key_value, resolve_measurements, resolve_series, \
+    line_protocol_body, parallel_workers, split_batch_points, write_params, chunked_query_params, JsonLineSplitter, \
+    resolve_query_chunk, query_params, line_protocol_bytes
+from opengemini_client.codec.query_format import body_decoder
+from opengemini_client.columns import ColumnValues, encode_columns
+from opengemini_client.line_protocol import new_series_key_cache
+from opengemini_client.measurement import Measurement, MeasurementCondition
+from opengemini_client.models import Config, BatchPoints, Point, Precision, Query, QueryResult, RpConfig, \
+    Series, ValuesResult, ParallelWriteResult, SubBatchResult
+from opengemini_client.retry import LatencyTracker, backoff_delay, can_retry, is_retryable_status, hedge_delay
+from opengemini_client.schema import SchemaRegistry, SchemaRow, SchemaWriter
+from opengemini_client.spool import UNREACHABLE_ERRORS, SpoolEntry, SpoolKind, append_or_raise, is_unreachable, \
+    new_spool, records_entry, spools
+from opengemini_client.url_const import UrlConst
+
+logger = logging.getLogger(__name__)
+
+
+async def _async_chunks(chunks: Iterable[bytes]) -> AsyncIterator[bytes]:
+    for chunk in chunks:
+        yield chunk
+
+
+class AsyncOpenGeminiDBClient:  # pylint: disable=too-many-public-methods
+    """
+    asyncio client backed by one aiohttp connection pool per http endpoint and one grpc.aio channel
+    per grpc endpoint, connections are opened lazily on the running event loop
+    """
+
+    def __init__(self, config: Config):
+        self.config = check_config(config)
+        protocol = "http://"
+        self.ssl_context = None
+        if config.tls_enabled:
+            protocol = "https://"
+            self.ssl_context = ssl.create_default_context(cafile=config.tls_config.ca_file or None)
+            if config.tls_config.cert_file:
+                self.ssl_context.load_cert_chain(config.tls_config.cert_file, config.tls_config.key_file or None)
+        self.endpoints = [f"{protocol}{addr.host}:{addr.port}" for addr in config.address]
+        self.balancer = Balancer(self.endpoints, self.config.balancer_config)
+        self.probes = set()
+        self.sessions: Dict[str, aiohttp.ClientSession] = {}
+        self.timeout = aiohttp.ClientTimeout(total=config.timeout.total_seconds(),
+                                             sock_connect=config.connection_timeout.total_seconds())
+        if self.config.grpc_config is not None:
+            self.grpc_endpoints = [f"{addr.host}:{addr.port}" for addr in config.grpc_config.address]
+            self.grpc_balancer = Balancer(self.grpc_endpoints, self.config.balancer_config)
+            self.grpc_pool = grpc_client.AioChannelPool(self.config.grpc_config)
+        self.query_cache = new_query_cache(self.config.query_cache_config)
+        self.metadata_cache = new_metadata_cache(self.config.metadata_cache_config)
+        self.schemas = SchemaRegistry()
+        self.series_keys = new_series_key_cache(self.config.series_key_cache_config)
+        if self.config.retry_config is None or self.config.retry_config.retryable_exceptions is None:
+            self.retryable_exceptions = (aiohttp.ClientConnectionError, asyncio.TimeoutError)
+        else:
+            self.retryable_exceptions = self.config.retry_config.retryable_exceptions
+        self.query_latency = LatencyTracker(self.config.hedge_config.window if self.config.hedge_config else 1)
+        self.batch_writer = None
+        if self.config.batch_config is not None:
+            self.batch_writer = AsyncBatchWriter(self.config.batch_config, self._send_batch)
+        # the replay task is started on the running event loop once the spool holds entries
+        self.spool = new_spool(self.config.spool_config)
+        self.spool_task: Optional[asyncio.Task] = None
+
+    async def close(self):
+        if self.batch_writer is not None:
+            await self.batch_writer.close()
+        if self.spool is not None:
+            if self.spool_task is not None:
+                self.spool_task.cancel()
+            self.spool.close()
+        for probe in list(self.probes):
+            probe.cancel()
+        if self.config.grpc_config is not None:
+            await self.grpc_pool.close()
+        sessions = list(self.sessions.values())
+        self.sessions.clear()
+        for session in sessions:
+            await session.close()
+
+    async def __aenter__(self):
+        self._start_replay()
+        return self
+
+    async def __aexit__(self, _exc_type, _exc_val, _exc_tb):
+        await self.close()
+
+    def _start_probes(self, balancer: Balancer, probe: Callable[[str], Awaitable[None]]):
+        for endpoint in balancer.take_probes():
+            task = asyncio.get_running_loop().create_task(probe(endpoint))
+            self.probes.add(task)
+            task.add_done_callback(self.probes.discard)
+
+    async def _probe_grpc(self, endpoint: str):
+        healthy = False
+        try:
+            healthy = await grpc_client.aio_ping(self.grpc_pool.stub(endpoint), self.config.connection_timeout.seconds)
+        finally:
+            self.grpc_balancer.probed(endpoint, healthy)
+
+    async def _probe_http(self, endpoint: str):
+        healthy = False
+        try:
+            timeout = aiohttp.ClientTimeout(total=self.config.connection_timeout.total_seconds())
+            async with self._session(endpoint).get(UrlConst.PING, timeout=timeout) as resp:
+                healthy = resp.status == HTTPStatus.NO_CONTENT
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            pass
+        finally:
+            self.balancer.probed(endpoint, healthy)
+
+    def _get_grpc_server_url(self):
+        self._start_probes(self.grpc_balancer, self._probe_grpc)
+        return self.grpc_balancer.pick()
+
+    def _get_server_url(self):
+        self._start_probes(self.balancer, self._probe_http)
+        return self.balancer.pick()
+
+    def _session(self, server_url: str) -> aiohttp.ClientSession:
+        session = self.sessions.get(server_url)
+        if session is None:
+            connector = aiohttp.TCPConnector(ssl=self.ssl_context if self.ssl_context is not None else True)
+            session = aiohttp.ClientSession(base_url=server_url, connector=connector, timeout=self.timeout)
+            self.sessions[server_url] = session
+        return session
+
+    async def _request(self, method, server_url, url_path, headers=None, body=None, params=None,
+                       failover: bool = True) -> Tuple[int, bytes]:
+        retry_config = self.config.retry_config
+        attempt = 1
+        while True:
+            try:
+                status, content = await self._send_request(method, server_url, url_path, headers, body, params)
+                if 200 <= status < 300:
+                    return status, content
+                err = HTTPError(f"request error resp, code: {status}, body: {content.decode(errors='replace')}")
+                retryable = is_retryable_status(retry_config, status)
+            except self.retryable_exceptions as e:
+                err, retryable = e, True
+            if not retryable or not can_retry(retry_config, attempt):
+                raise err
+            await asyncio.sleep(backoff_delay(retry_config, attempt))
+            attempt += 1
+            if failover and retry_config.failover:
+                server_url = self._get_server_url()
+
+    async def _send_request(self, method, server_url, url_path, headers=None, body=None,
+                            params=None) -> Tuple[int, bytes]:
+        headers = build_headers(self.config, method, url_path, dict(headers) if headers else None)
+        body = compress_body(self.config, body() if callable(body) else body, headers)
+        if body is not None and not isinstance(body, (bytes, bytearray)):
+            body = _async_chunks(body)
+        start = self.balancer.begin(server_url)
+        healthy = False
+        try:
+            async with self._session(server_url).request(method, url_path, data=body, headers=headers,
+                                                         params=params) as resp:
+                content = await resp.read()
+                healthy = resp.status < 500
+        finally:
+            self.balancer.end(server_url, start, healthy)
+        return resp.status, content
+
+    async def ping(self, idx: int):
+        if idx >= len(self.endpoints) or idx < 0:
+            raise ValueError("openGeminiDB client error. Index out of range")
+        status, content = await self._request('GET', self.endpoints[idx], UrlConst.PING, failover=False)
+        if status != HTTPStatus.NO_CONTENT:
+            raise HTTPError(f"ping error resp, code: {status}, body: {content.decode(errors='replace')}")
+
+    async def query(self, query: Query) -> QueryResult:
+        decode = body_decoder(self.config, query.response_format)
+        if self.query_cache is not None:
+            cached = self.query_cache.get(query)
+            if cached is not None:
+                return cached
+        params, headers = query_params(query), {'Accept': query.response_format.value}
+        if self.config.hedge_config is None:
+            status, content = await self._timed_query(self._get_server_url(), params, headers)
+        else:
+            status, content = await self._hedged_query(params, headers)
+        if status == HTTPStatus.OK:
+            qr = resolve_query_result(decode(content))
+            qr.precision = query.precision
+            if self.query_cache is not None:
+                self.query_cache.put(query, qr, len(content))
+            return qr
+        raise HTTPError(f"query error resp, code: {status}, body: {content.decode(errors='replace')}")
+
+    async def query_iter(self, query: Query, chunk_size: int = 10000) -> AsyncIterator[Series]:
+        """
+        send query with chunked=true and yield series fragments while the response is read
+        """
+        params = chunked_query_params(query, chunk_size)
+        server_url = self._get_server_url()
+        headers = build_headers(self.config, 'GET', UrlConst.QUERY)
+        start = self.balancer.begin(server_url)
+        healthy = False
+        try:
+            resp = await self._session(server_url).get(UrlConst.QUERY, params=params, headers=headers)
+            healthy = resp.status < 500
+        finally:
+            self.balancer.end(server_url, start, healthy)
+        async with resp:
+            if resp.status != HTTPStatus.OK:
+                content = await resp.read()
+                raise HTTPError(f"query error resp, code: {resp.status}, body: {content.decode(errors='replace')}")
+            splitter = JsonLineSplitter()
+            async for data in resp.content.iter_any():
+                for line in splitter.feed(data):
+                    for series in resolve_query_chunk(self.config.json_decoder(line)):
+                        yield series
+            for line in splitter.close():
+                for series in resolve_query_chunk(self.config.json_decoder(line)):
+                    yield series
+
+    async def _timed_query(self, server_url: str, params: dict, headers: dict) -> Tuple[int, bytes]:
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        result = await self._request('GET', server_url, UrlConst.QUERY, headers=headers, params=params)
+        self.query_latency.record(loop.time() - start)
+        return result
+
+    async def _hedged_query(self, params: dict, headers: dict) -> Tuple[int, bytes]:
+        server_url = self._get_server_url()
+        primary = asyncio.ensure_future(self._timed_query(server_url, params, headers))
+        done, _ = await asyncio.wait({primary}, timeout=hedge_delay(self.config.hedge_config, self.query_latency))
+        if done:
+            return primary.result()
+        hedge = asyncio.ensure_future(self._timed_query(self.balancer.pick_other(server_url), params, headers))
+        pending = {primary, hedge}
+        try:
+            while True:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                if not pending:
+                    # both failed, report the error of the first request
+                    return primary.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _query_post(self, query: Query) -> QueryResult:
+        params = {'db': query.database, 'q': query.command, 'rp': query.retention_policy}
+        status, content = await self._request('POST', self._get_server_url(), UrlConst.QUERY, params=params)
+        if status == HTTPStatus.OK:
+            return resolve_query_result(self.config.json_decoder(content))
+        raise HTTPError(f"query_post error resp, code: {status}, body: {content.decode(errors='replace')}")
+
+    async def _write_line_protocol(self, database: str, rp: str, body, operation: str, server_url: str = None):
+        if server_url is None:
+            server_url = self._get_server_url()
+        status, content = await self._request('POST', server_url, UrlConst.WRITE, params=write_params(database, rp),
+                                               body=body)
+        if status == HTTPStatus.NO_CONTENT:
+            return
+        raise HTTPError(f"{operation} error resp, code: {status}, body: {content.decode(errors='replace')}")
+
+    async def write_columns(self, database: str, measurement: str, tags: Dict[str, Union[str, ColumnValues]],
+                            fields: Dict[str, ColumnValues], timestamps: ColumnValues,
+                            precision: Precision = Precision.PrecisionNanoSecond, rp: str = ''):
+        if not database:
+            raise ValueError("empty database name")
+        body = encode_columns(measurement, tags, fields, timestamps, precision)
+        with invalidating(self.query_cache, database, [measurement]):
+            await self._write_or_spool(lambda: SpoolEntry(SpoolKind.LINE_PROTOCOL, database, rp, body),
+                                       lambda: self._write_line_protocol(database, rp, body, "write_columns"))
+
+    async def write_batch_points(self, database: str, batch_points: BatchPoints, rp: str = ''):
+        body = line_protocol_body(self.config, batch_points, self.series_keys)
+        with invalidating(self.query_cache, database, batch_measurements(batch_points)):
+            await self._write_or_spool(
+                lambda: SpoolEntry(SpoolKind.LINE_PROTOCOL, database, rp, line_protocol_bytes(body)),
+                lambda: self._write_line_protocol(database, rp, body, "write_batch_points"))
+
+    async def write_batch_points_parallel(self, database: str, batch_points: BatchPoints,
+                                          rp: str = '') -> ParallelWriteResult:
+        if not database:
+            raise ValueError("empty database name")
+        if self.config.parallel_write_config is None:
+            raise ValueError("parallel write requires parallel_write_config")
+        result = split_batch_points(batch_points, self.config.parallel_write_config.sub_batch_size,
+                                    self._get_server_url)
+        semaphore = asyncio.Semaphore(parallel_workers(self.config))
+        with invalidating(self.query_cache, database, batch_measurements(batch_points)):
+            await asyncio.gather(*(self._write_sub_batch(database, rp, sub, semaphore) for sub in result.sub_batches))
+        return result
+
+    async def _write_sub_batch(self, database: str, rp: str, sub: SubBatchResult, semaphore: asyncio.Semaphore):
+        async with semaphore:
+            try:
+                body = line_protocol_body(self.config, sub.batch_points, self.series_keys)
+                await self._write_line_protocol(database, rp, body, "write_batch_points_parallel", sub.endpoint)
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                sub.error = e
+
+    def register_schema(self, measurement: Measurement,
+                        precision: Precision = Precision.PrecisionNanoSecond) -> SchemaWriter:
+        return self.schemas.register(measurement, precision)
+
+    async def write_rows(self, writer: SchemaWriter, rows: Iterable[SchemaRow]):
+        measurement = writer.measurement
+        if not measurement.database:
+            raise ValueError("empty database name")
+        body = writer.encode(rows)
+        with invalidating(self.query_cache, measurement.database, [measurement.measurement]):
+            await self._write_or_spool(
+                lambda: SpoolEntry(SpoolKind.LINE_PROTOCOL, measurement.database, measurement.retention_policy, body),
+                lambda: self._write_line_protocol(measurement.database, measurement.retention_policy, body,
+                                                  "write_rows"))
+
+    async def write_rows_by_grpc(self, writer: SchemaWriter, rows: Iterable[SchemaRow]):
+        measurement = writer.measurement
+        if not measurement.database:
+            raise ValueError("empty database name")
+        records = writer.to_records(rows, self.config.grpc_config.compress_method)
+        with invalidating(self.query_cache, measurement.database, [measurement.measurement]):
+            await self._write_or_spool(
+                lambda: records_entry(measurement.database, measurement.retention_policy, records),
+                lambda: self._write_records(measurement.database, records, measurement.retention_policy))
+
+    async def _send_batch(self, database: str, rp: str, batch_points: BatchPoints):
+        await self.write_batch_points(database, batch_points, rp)
+
+    async def write_point(self, database: str, point: Point, callback: Optional[WriteCallback] = None, rp: str = ''):
+        await self.write_points(database, [point], callback, rp)
+
+    async def write_points(self, database: str, points: List[Point], callback: Optional[WriteCallback] = None,
+                           rp: str = ''):
+        """
+        with batch_config the points are queued, a full queue applies batch_config.overflow_policy, and
+        callback is called once they have been sent, otherwise they are written before returning
+        """
+        if not database:
+            raise ValueError("empty database name")
+        if self.batch_writer is None:
+            err = None
+            try:
+                await self.write_batch_points(database, BatchPoints(points=points), rp)
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                if callback is None:
+                    raise
+                err = e
+            if callback is not None:
+                await call_callbacks([callback], err)
+        else:
+            await self.batch_writer.write(database, rp, points, callback)
+
+    async def flush(self):
+        if self.batch_writer is not None:
+            await self.batch_writer.flush()
+
+    def _grpc_user(self):
+        if self.config.grpc_config.auth_config is None:
+            return '', ''
+        return self.config.grpc_config.auth_config.username, self.config.grpc_config.auth_config.password
+
+    async def _write_records(self, database: str, records, rp: str):
+        username, password = self._grpc_user()
+        endpoint = self._get_grpc_server_url()
+        start = self.grpc_balancer.begin(endpoint)
+        healthy = False
+        try:
+            response = await self.grpc_pool.stub(endpoint).Write(
+                grpc_client.new_write_request(database, records, rp, username, password),
+                timeout=self.config.timeout.seconds,
+            )
+            healthy = True
+        finally:
+            self.grpc_balancer.end(endpoint, start, healthy)
+        grpc_client.check_write_response(response)
+
+    async def write_by_grpc(self, database: str, batch_points: BatchPoints, rp: str = ''):
+        records = grpc_client.points_to_records(batch_points, self.config.grpc_config.compress_method)
+        with invalidating(self.query_cache, database, batch_measurements(batch_points)):
+            await self._write_or_spool(lambda: records_entry(database, rp, records),
+                                       lambda: self._write_records(database, records, rp))
+
+    async def write_columns_by_grpc(self, database: str, measurement: str,
+                                    tags: Dict[str, Union[str, ColumnValues]], fields: Dict[str, ColumnValues],
+                                    timestamps: ColumnValues, precision: Precision = Precision.PrecisionNanoSecond,
+                                    rp: str = ''):
+        if not database:
+            raise ValueError("empty database name")
+        records = grpc_client.columns_to_records(measurement, tags, fields, timestamps, precision,
+                                                 self.config.grpc_config.compress_method)
+        with invalidating(self.query_cache, database, [measurement]):
+            await self._write_or_spool(lambda: records_entry(database, rp, records),
+                                       lambda: self._write_records(database, records, rp))
+
+    async def _write_or_spool(self, entry: Callable[[], SpoolEntry], send: Callable[[], Awaitable[None]]):
+        """
+        send the batch, or append it to the spool when the cluster is unreachable or batches are already
+        spooled, which keeps them in order
+        """
+        err = None
+        if self.spool is None or self.spool.empty():
+            err = await self._try_send(send)
+            if err is None:
+                return
+        try:
+            append_or_raise(self.spool, entry(), err)
+        finally:
+            self._start_replay()
+
+    async def _try_send(self, send: Callable[[], Awaitable[None]]) -> Optional[Exception]:
+        # returns the error of a write that goes to the spool, raises any other
+        try:
+            await send()
+        except (*UNREACHABLE_ERRORS, grpc.RpcError) as e:
+            if spools(self.spool, e):
+                return e
+            raise
+        return None
+
+    def _start_replay(self):
+        if self.spool is None or self.spool.empty():
+            return
+        if self.spool_task is None or self.spool_task.done():
+            self.spool_task = asyncio.get_running_loop().create_task(self._replay_spool())
+
+    async def _replay_spool(self):
+        interval = self.config.spool_config.replay_interval.total_seconds()
+        while not self.spool.empty():
+            await asyncio.sleep(interval)
+            if await self._cluster_up():
+                await self._drain_spool()
+
+    async def _cluster_up(self) -> bool:
+        try:
+            status, _ = await self._send_request('GET', self._get_server_url(), UrlConst.PING)
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            return False
+        return status == HTTPStatus.NO_CONTENT
+
+    async def _drain_spool(self):
+        # mirrors Spool.replay
+        while (entry := self.spool.peek()) is not None:
+            try:
+                if entry.kind == SpoolKind.RECORDS:
+                    await self._write_records(entry.database, grpc_client.unmarshal_records(entry.payload), entry.rp)
+                else:
+                    await self._write_line_protocol(entry.database, entry.rp, entry.payload, "spool replay")
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                if is_unreachable(e):
+                    return
+                logger.error("dropping spooled batch for database %s: %s", entry.database, e)
+            self.spool.ack(entry)
+
+    async def create_database(self, database: str, rp: RpConfig = None):
+        query_string = create_database_command(database, rp)
+        with invalidating_metadata(self.metadata_cache, database, DATABASE_LIST):
+            return await self._query_post(Query(database=database, command=query_string, retention_policy=''))
+
+    async def show_databases(self) -> List[str]:
+        return resolve_databases(await self._metadata_query(DATABASE_LIST, "SHOW DATABASES"))
+
+    async def drop_database(self, database: str):
+        query_string = drop_database_command(database)
+        with invalidating_metadata(self.metadata_cache, database, DATABASE_LIST):
+            return await self._query_post(Query(database=database, command=query_string, retention_policy=''))
+
+    async def create_retention_policy(self, dbname, rp_config: RpConfig, is_default: bool):
+        query_string = create_retention_policy_command(dbname, rp_config, is_default)
+        with invalidating_metadata(self.metadata_cache, dbname):
+            return await self._query_post(Query(database=dbname, command=query_string, retention_policy=''))
+
+    async def show_retention_policies(self, dbname: str):
+        return resolve_retention_policies(await self._metadata_query(dbname, show_retention_policies_command(dbname)))
+
+    async def drop_retention_policy(self, dbname, retention_policy: str):
+        query_string = drop_retention_policy_command(dbname, retention_policy)
+        with invalidating_metadata(self.metadata_cache, dbname):
+            return await self._query_post(Query(database=dbname, command=query_string,
+                                                retention_policy=retention_policy))
+
+    async def _metadata_query(self, database: str, command: str) -> QueryResult:
+        cached = None if self.metadata_cache is None else self.metadata_cache.get(database, command)
+        if cached is not None:
+            return cached
+        qr = await self.query(Query(database=database, command=command, retention_policy=''))
+        if self.metadata_cache is not None:
+            self.metadata_cache.put(database, command, qr)
+        return qr
+
+    async def _show_query_result(self, database, command: str) -> QueryResult:
+        check_show_command(database, command)
+        return await self._metadata_query(database, command)
+
+    async def create_measurement(self, measurement: Measurement):
+        command = create_measurement_command(measurement)
+        with invalidating_metadata(self.metadata_cache, measurement.database):
+            return await self._query_post(Query(database=measurement.database, command=command, retention_policy=''))
+
+    async def show_measurements(self, condition: MeasurementCondition) -> List[str]:
+        qr = await self._metadata_query(condition.database, show_measurements_command(condition))
+        return resolve_measurements(qr)
+
+    async def drop_measurement(self, database: str, retention_policy: str, measurement: str):
+        command = drop_measurement_command(database, measurement)
+        with invalidating_metadata(self.metadata_cache, database):
+            return await self._query_post(Query(database=database, command=command,
+                                                retention_policy=retention_policy))
+
+    async def show_tag_keys(self, database, command: str) -> List[ValuesResult]:
+        return resolve_values_any(await self._show_query_result(database, command))
+
+    async def show_tag_values(self, database, command: str) -> List[ValuesResult]:
+        return resolve_values_key_value(await self._show_query_result(database, command))
+
+    async def show_field_keys(self, database, command: str) -> List[ValuesResult]:
+        return resolve_values_key_value(await self._show_query_result(database, command))
+
+    async def show_series(self, database, command: str) -> List[str]:
+        return resolve_series(resolve_values_any(await self._show_query_result(database, command)))
@@ -0,0 +1,165 @@
+# Copyright 2025 openGemini Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import gzip
+import json
+import time
+import unittest
+from datetime import datetime, timedelta
+from http import HTTPStatus
+
+from requests import HTTPError
+
+from opengemini_client import line_protocol, models, test_utils
+from opengemini_client.async_client import AsyncOpenGeminiDBClient
+from opengemini_client.balancer_test import closed_port
+from opengemini_client.record.record_view import RecordView
+
+_query_body = json.dumps({'results': [{'statement_id': 0, 'series': [
+    {'name': 'cpu', 'columns': ['time', 'value'], 'values': [[1, 1.5], [2, 2.5]]}]}]}).encode()
+
+_show_body = json.dumps({'results': [{'statement_id': 0, 'series': [
+    {'name': 'databases', 'columns': ['name'], 'values': [['db0'], ['db1']]}]}]}).encode()
+
+
+def handle(request: test_utils.StubRequest) -> test_utils.StubResponse:
+    if request.path == '/query' and request.params.get('q', '').startswith('SHOW'):
+        return test_utils.StubResponse(status=HTTPStatus.OK, body=_show_body)
+    if request.path == '/query':
+        return test_utils.StubResponse(status=HTTPStatus.OK, body=_query_body)
+    if request.params.get('db') == 'missing':
+        return test_utils.StubResponse(status=HTTPStatus.NOT_FOUND, body=b'database not found')
+    return test_utils.StubResponse()
+
+
+def new_points(count: int):
+    return [models.Point(measurement='async_mm', precision=models.Precision.PrecisionSecond, fields={'x': float(i)},
+                         tags={'host': 'h1'}, timestamp=datetime.fromtimestamp(1700000000 + i)) for i in range(count)]
+
+
+class AsyncClientTest(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.server = test_utils.StubServer(handle)
+        self.server.start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def new_client(self, **kwargs) -> AsyncOpenGeminiDBClient:
+        return AsyncOpenGeminiDBClient(models.Config(address=[self.server.address], **kwargs))
+
+    async def test_ping_and_query(self):
+        async with self.new_client() as cli:
+            await cli.ping(0)
+            qr = await cli.query(models.Query(database='db0', command='select * from cpu', retention_policy=''))
+        self.assertEqual([[1, 1.5], [2, 2.5]], qr.results[0].series[0].values)
+        self.assertEqual('ns', self.server.requests[1].params['epoch'])
+
+    async def test_ddl_and_show(self):
+        async with self.new_client() as cli:
+            rp = models.RpConfig(name='rp0', duration='1d', shard_group_duration='', index_duration='')
+            await cli.create_database('db0', rp)
+            self.assertEqual(['db0', 'db1'], await cli.show_databases())
+            await cli.drop_database('db0')
+            with self.assertRaises(ValueError):
+                await cli.drop_database('')
+        self.assertEqual('POST', self.server.requests[0].method)
+        self.assertEqual('CREATE DATABASE db0 WITH DURATION 1d REPLICATION 1 NAME rp0',
+                         self.server.requests[0].params['q'])
+        self.assertEqual('DROP DATABASE db0', self.server.requests[2].params['q'])
+
+    async def test_write_batch_points(self):
+        points = new_points(100)
+        async with self.new_client(gzip_enabled=True) as cli:
+            await cli.write_batch_points('db0', models.BatchPoints(points=points), rp='rp0')
+            with self.assertRaises(HTTPError):
+                await cli.write_batch_points('missing', models.BatchPoints(points=points))
+        request = self.server.requests[0]
+        self.assertEqual({'db': 'db0', 'rp': 'rp0'}, request.params)
+        self.assertEqual('gzip', request.headers['Content-Encoding'])
+        self.assertEqual(line_protocol.encode_batch_points(models.BatchPoints(points=points)),
+                         gzip.decompress(request.body))
+
+    async def test_write_streaming(self):
+        points = new_points(5000)
+        async with self.new_client(gzip_enabled=True, gzip_streaming=True) as cli:
+            await cli.write_batch_points('db0', models.BatchPoints(points=points))
+        request = self.server.requests[0]
+        self.assertEqual('chunked', request.headers['Transfer-Encoding'])
+        self.assertEqual(line_protocol.encode_batch_points(models.BatchPoints(points=points)),
+                         gzip.decompress(request.body))
+
+    async def test_batch_write(self):
+        errors = []
+        batch_config = models.BatchConfig(batch_interval=60000, batch_size=10)
+        async with self.new_client(batch_config=batch_config) as cli:
+            await cli.write_points('db0', new_points(25), errors.append)
+            await cli.flush()
+            self.assertEqual(3, len(self.server.requests))
+            await cli.write_point('db0', new_points(1)[0], errors.append)
+        self.assertEqual(4, len(self.server.requests))
+        self.assertEqual([None] * 4, errors)
+        self.assertEqual(25, sum(len(r.body.splitlines()) for r in self.server.requests[:3]))
+
+    async def test_write_parallel(self):
+        with test_utils.StubServer(handle) as server2:
+            cfg = models.Config(address=[self.server.address, server2.address],
+                                parallel_write_config=models.ParallelWriteConfig(sub_batch_size=10))
+            async with AsyncOpenGeminiDBClient(cfg) as cli:
+                result = await cli.write_batch_points_parallel('db0', models.BatchPoints(points=new_points(35)))
+                failed = await cli.write_batch_points_parallel('missing', models.BatchPoints(points=new_points(5)))
+        self.assertTrue(result.success)
+        self.assertEqual(4, len(result.sub_batches))
+        self.assertEqual(3, len(self.server.requests))
+        self.assertEqual(2, len(server2.requests))
+        self.assertEqual([0], [sub.index for sub in failed.failed])
+
+    async def test_retry_and_failover(self):
+        dead = models.Address(host='127.0.0.1', port=closed_port())
+        retry_config = models.RetryConfig(initial_backoff=timedelta(milliseconds=1))
+        cfg = models.Config(address=[dead, self.server.address], retry_config=retry_config)
+        async with AsyncOpenGeminiDBClient(cfg) as cli:
+            for _ in range(4):
+                await cli.write_batch_points('db0', models.BatchPoints(points=new_points(1)))
+            with self.assertRaises(HTTPError):
+                await cli.write_batch_points('missing', models.BatchPoints(points=new_points(1)))
+        self.assertEqual(5, len(self.server.requests))
+
+    async def test_hedged_query(self):
+        def slow(request):
+            time.sleep(1)
+            return handle(request)
+
+        hedge_config = models.HedgeConfig(initial_delay=timedelta(milliseconds=50))
+        with test_utils.StubServer(slow) as slow_server:
+            cfg = models.Config(address=[slow_server.address, self.server.address], hedge_config=hedge_config)
+            async with AsyncOpenGeminiDBClient(cfg) as cli:
+                start = time.monotonic()
+                qr = await cli.query(models.Query(database='db0', command='select * from cpu', retention_policy=''))
+                self.assertLess(time.monotonic() - start, 0.5)
+        self.assertEqual([[1, 1.5], [2, 2.5]], qr.results[0].series[0].values)
+        self.assertEqual(1, len(self.server.requests))
+
+    async def test_write_by_grpc(self):
+        with test_utils.StubGrpcServer() as grpc_server:
+            grpc_config = models.GrpcConfig(address=[grpc_server.address])
+            async with self.new_client(grpc_config=grpc_config) as cli:
+                await cli.write_by_grpc('db0', models.BatchPoints(points=new_points(3)))
+                await cli.write_columns_by_grpc('db0', 'async_mm', {'host': 'h1'}, {'x': [1.5, 2.5]}, [1, 2])
+        requests = grpc_server.service.requests
+        self.assertEqual(2, len(requests))
+        self.assertEqual(1, len(grpc_server.service.peers))
+        self.assertEqual('async_mm', requests[0].records[0].measurement)
+        self.assertEqual([1.5, 2.5], RecordView.decode(requests[1].records[0].block).column('x').values().tolist())
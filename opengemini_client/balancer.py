@@ -0,0 +1,158 @@
+# Copyright 2025 openGemini Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+endpoint selection with health tracking, shared by the http and grpc transports of both clients
+"""
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List
+
+from opengemini_client.models import BalanceStrategy, BalancerConfig
+
+
+@dataclass
+class EndpointStats:
+    endpoint: str
+    # requests sent to the endpoint that have not finished yet
+    outstanding: int = 0
+    # exponentially weighted moving average of successful request latency, in seconds
+    ewma_latency: float = 0.0
+    # failures since the last success
+    failures: int = 0
+    # monotonic time until which the endpoint receives no traffic, 0 while it is healthy
+    ejected_until: float = 0.0
+    # a probe has been handed out and has not reported back yet
+    probing: bool = False
+
+    @property
+    def ejected(self) -> bool:
+        return self.ejected_until > 0
+
+
+class Balancer:
+    """
+    pick an endpoint for every request by strategy among the healthy ones; an endpoint is ejected after
+    max_failures consecutive failures and comes back once eject_duration has passed and, when probing is
+    enabled, a probe handed out by take_probes has succeeded
+    """
+
+    def __init__(self, endpoints: List[str], config: BalancerConfig, clock: Callable[[], float] = time.monotonic):
+        if len(endpoints) == 0:
+            raise ValueError("balancer needs at least one endpoint")
+        self.config = config
+        self._clock = clock
+        self._stats: Dict[str, EndpointStats] = {endpoint: EndpointStats(endpoint) for endpoint in endpoints}
+        self._order = list(self._stats.values())
+        self._next = 0
+        self._lock = threading.Lock()
+
+    @property
+    def endpoints(self) -> List[str]:
+        return [stats.endpoint for stats in self._order]
+
+    def pick(self) -> str:
+        with self._lock:
+            now = self._clock()
+            candidates = [stats for stats in self._order if self._available(stats, now)]
+            if len(candidates) == 0:
+                # every endpoint is ejected, keep trying them in turn rather than failing without a request
+                candidates = self._order
+            start = self._next % len(candidates)
+            self._next += 1
+            rotated = candidates[start:] + candidates[:start]
+            if self.config.strategy == BalanceStrategy.LEAST_OUTSTANDING:
+                return min(rotated, key=lambda stats: stats.outstanding).endpoint
+            if self.config.strategy == BalanceStrategy.EWMA:
+                return min(rotated, key=lambda stats: stats.ewma_latency * (stats.outstanding + 1)).endpoint
+            return rotated[0].endpoint
+
+    def pick_other(self, endpoint: str) -> str:
+        """
+        pick an endpoint other than endpoint when there is one
+        """
+        for _ in range(len(self._order)):
+            other = self.pick()
+            if other != endpoint:
+                return other
+        return endpoint
+
+    def _available(self, stats: EndpointStats, now: float) -> bool:
+        if not stats.ejected:
+            return True
+        if stats.ejected_until > now or self.config.probe_enabled:
+            return False
+        # no probe, let traffic through again and eject on the next failure
+        stats.ejected_until = 0.0
+        stats.failures = self.config.max_failures - 1
+        return True
+
+    def begin(self, endpoint: str) -> float:
+        """
+        count a request to endpoint as outstanding, returns the start time to pass to end
+        """
+        with self._lock:
+            stats = self._stats.get(endpoint)
+            if stats is not None:
+                stats.outstanding += 1
+            return self._clock()
+
+    def end(self, endpoint: str, start: float, ok: bool):
+        with self._lock:
+            stats = self._stats.get(endpoint)
+            if stats is None:
+                return
+            stats.outstanding -= 1
+            if ok:
+                latency = self._clock() - start
+                if stats.ewma_latency == 0:
+                    stats.ewma_latency = latency
+                else:
+                    alpha = self.config.ewma_alpha
+                    stats.ewma_latency = alpha * latency + (1 - alpha) * stats.ewma_latency
+                stats.failures = 0
+                return
+            stats.failures += 1
+            if 0 < self.config.max_failures <= stats.failures and not stats.ejected:
+                stats.ejected_until = self._clock() + self.config.eject_duration.total_seconds()
+
+    def take_probes(self) -> List[str]:
+        """
+        ejected endpoints due for a probe, each one is handed out once until its result is reported to probed
+        """
+        if not self.config.probe_enabled:
+            return []
+        with self._lock:
+            now = self._clock()
+            due = [stats for stats in self._order if stats.ejected and not stats.probing and stats.ejected_until <= now]
+            for stats in due:
+                stats.probing = True
+            return [stats.endpoint for stats in due]
+
+    def probed(self, endpoint: str, ok: bool):
+        with self._lock:
+            stats = self._stats.get(endpoint)
+            if stats is None:
+                return
+            stats.probing = False
+            if ok:
+                stats.ejected_until = 0.0
+                stats.failures = 0
+            else:
+                stats.ejected_until = self._clock() + self.config.eject_duration.total_seconds()
+
+    def stats(self) -> List[EndpointStats]:
+        with self._lock:
+            return [EndpointStats(**vars(stats)) for stats in self._order]
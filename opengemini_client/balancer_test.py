@@ -0,0 +1,139 @@
+# Copyright 2025 openGemini Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import socket
+import time
+import unittest
+from collections import Counter
+from datetime import timedelta
+
+from opengemini_client import client_impl, models, test_utils
+from opengemini_client.balancer import Balancer
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def closed_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class BalancerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+
+    def new_balancer(self, **kwargs) -> Balancer:
+        return Balancer(['a', 'b', 'c'], models.BalancerConfig(**kwargs), self.clock)
+
+    def request(self, balancer: Balancer, endpoint: str, latency: float = 0.01, ok: bool = True):
+        start = balancer.begin(endpoint)
+        self.clock.now += latency
+        balancer.end(endpoint, start, ok)
+
+    def test_round_robin(self):
+        balancer = self.new_balancer()
+        self.assertEqual(['a', 'b', 'c', 'a', 'b', 'c'], [balancer.pick() for _ in range(6)])
+
+    def test_least_outstanding(self):
+        balancer = self.new_balancer(strategy=models.BalanceStrategy.LEAST_OUTSTANDING)
+        balancer.begin('a')
+        balancer.begin('a')
+        balancer.begin('b')
+        self.assertEqual({'c'}, {balancer.pick() for _ in range(6)})
+        balancer.begin('c')
+        self.assertEqual({'b', 'c'}, {balancer.pick() for _ in range(6)})
+
+    def test_ewma_prefers_fast_endpoint(self):
+        balancer = self.new_balancer(strategy=models.BalanceStrategy.EWMA)
+        for _ in range(5):
+            self.request(balancer, 'a', 0.5)
+            self.request(balancer, 'b', 0.01)
+            self.request(balancer, 'c', 0.1)
+        self.assertEqual(Counter({'b': 10}), Counter(balancer.pick() for _ in range(10)))
+        # a request in flight doubles the weight of b, c is still more expensive
+        balancer.begin('b')
+        self.assertEqual('b', balancer.pick())
+        for _ in range(10):
+            self.request(balancer, 'b', 0.3)
+        self.assertEqual('c', balancer.pick())
+
+    def test_eject_and_probe(self):
+        balancer = self.new_balancer(max_failures=2, eject_duration=timedelta(seconds=5))
+        self.request(balancer, 'a', ok=False)
+        self.assertIn('a', {balancer.pick() for _ in range(3)})
+        self.request(balancer, 'a', ok=False)
+        self.assertEqual({'b', 'c'}, {balancer.pick() for _ in range(6)})
+        self.assertEqual([], balancer.take_probes())
+
+        self.clock.now += 5
+        self.assertEqual(['a'], balancer.take_probes())
+        self.assertEqual([], balancer.take_probes())
+        self.assertEqual({'b', 'c'}, {balancer.pick() for _ in range(6)})
+        balancer.probed('a', False)
+        self.clock.now += 4
+        self.assertEqual([], balancer.take_probes())
+        self.clock.now += 1
+        self.assertEqual(['a'], balancer.take_probes())
+        balancer.probed('a', True)
+        self.assertEqual({'a', 'b', 'c'}, {balancer.pick() for _ in range(6)})
+        self.assertEqual(0, balancer.stats()[0].failures)
+
+    def test_readmit_without_probe(self):
+        balancer = self.new_balancer(max_failures=3, eject_duration=timedelta(seconds=5), probe_enabled=False)
+        for _ in range(3):
+            self.request(balancer, 'a', ok=False)
+        self.assertNotIn('a', {balancer.pick() for _ in range(6)})
+        self.clock.now += 5
+        self.assertEqual([], balancer.take_probes())
+        self.assertIn('a', {balancer.pick() for _ in range(3)})
+        # one more failure ejects it again
+        self.request(balancer, 'a', ok=False)
+        self.assertNotIn('a', {balancer.pick() for _ in range(6)})
+
+    def test_all_ejected(self):
+        balancer = self.new_balancer(max_failures=1)
+        for endpoint in ('a', 'b', 'c'):
+            self.request(balancer, endpoint, ok=False)
+        self.assertEqual(['a', 'b', 'c'], [balancer.pick() for _ in range(3)])
+
+    def test_client_skips_dead_endpoint(self):
+        with test_utils.StubServer() as server:
+            dead = models.Address(host='127.0.0.1', port=closed_port())
+            balancer_config = models.BalancerConfig(max_failures=1, eject_duration=timedelta(milliseconds=100))
+            cfg = models.Config(address=[dead, server.address], balancer_config=balancer_config)
+            with client_impl.OpenGeminiDBClient(cfg) as cli:
+                failures = 0
+                for _ in range(10):
+                    try:
+                        cli.write_batch_points('db0', models.BatchPoints())
+                    except Exception:  # pylint: disable=broad-exception-caught
+                        failures += 1
+                self.assertEqual(1, failures)
+                self.assertEqual(9, len(server.requests))
+                self.assertTrue(cli.balancer.stats()[0].ejected)
+                # the probe of the dead endpoint fails and keeps it ejected
+                time.sleep(0.15)
+                cli.write_batch_points('db0', models.BatchPoints())
+                time.sleep(0.1)
+                self.assertTrue(cli.balancer.stats()[0].ejected)
+                self.assertFalse(cli.balancer.stats()[0].probing)
@@ -0,0 +1,381 @@
+# Copyright 2025 openGemini Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import inspect
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from opengemini_client.models import BatchConfig, BatchPoints, OverflowPolicy, Point, estimate_point_size
+
+logger = logging.getLogger(__name__)
+
+WriteCallback = Callable[[Optional[Exception]], None]
+SendFunc = Callable[[str, str, BatchPoints], None]
+AsyncSendFunc = Callable[[str, str, BatchPoints], Awaitable[None]]
+
+ErrBatchWriterClosed = "batch writer is closed"
+ErrWriteQueueFull = "write queue is full"
+
+# a queued point, the callback of its write and its estimated size
+Entry = Tuple[Point, Optional[WriteCallback], int]
+Batch = Tuple[str, str, List[Entry]]
+
+
+@dataclass
+class WriteQueueStats:
+    # points and their estimated bytes waiting to be sent, a batch leaves the queue when it is taken to be sent
+    queued_points: int = 0
+    queued_bytes: int = 0
+    # points dropped by OverflowPolicy.DROP_OLDEST and OverflowPolicy.DROP_NEWEST
+    dropped_oldest: int = 0
+    dropped_newest: int = 0
+    # points of writes that raised because the queue was full
+    rejected: int = 0
+    # writes that had to wait for room
+    blocked: int = 0
+
+
+def new_entries(points: List[Point], callback: Optional[WriteCallback]) -> List[Entry]:
+    return [(point, callback, estimate_point_size(point)) for point in points if point is not None]
+
+
+class WriteQueue:
+    """
+    points queued per (database, retention policy) and bounded by the batch config, shared by both writers
+    which guard it with their own lock
+    """
+
+    def __init__(self, batch_config: BatchConfig):
+        self.size = batch_config.batch_size
+        self.max_points = batch_config.max_queued_points
+        self.max_bytes = batch_config.max_queued_bytes
+        self.policy = batch_config.overflow_policy
+        self.queues: Dict[Tuple[str, str], List[Entry]] = {}
+        # keys with batch_size points queued, or every key while a write waits for room
+        self.full = set()
+        self.stats = WriteQueueStats()
+
+    def fits(self, entries: List[Entry]) -> bool:
+        # an empty queue takes any write, so that a write beyond the bounds is not refused forever
+        if self.stats.queued_points == 0:
+            return True
+        if 0 < self.max_points < self.stats.queued_points + len(entries):
+            return False
+        return not 0 < self.max_bytes < self.stats.queued_bytes + sum(size for _, _, size in entries)
+
+    def admit(self, key: Tuple[str, str], entries: List[Entry]) -> Optional[List[Entry]]:
+        """
+        queue entries as the overflow policy allows, returns the entries it dropped, or None when the write
+        has to wait for room
+        """
+        dropped = []
+        if not self.fits(entries):
+            if self.policy == OverflowPolicy.DROP_NEWEST:
+                self.stats.dropped_newest += len(entries)
+                return entries
+            if self.policy == OverflowPolicy.RAISE:
+                self.reject(entries)
+            if self.policy == OverflowPolicy.BLOCK:
+                self.full.update(self.queues)
+                return None
+            dropped = self._drop_oldest(entries)
+        queue = self.queues.setdefault(key, [])
+        queue.extend(entries)
+        self._account(entries, 1)
+        if len(queue) >= self.size:
+            self.full.add(key)
+        return dropped
+
+    def reject(self, entries: List[Entry]):
+        self.stats.rejected += len(entries)
+        raise RuntimeError(ErrWriteQueueFull)
+
+    def take(self, keys: Iterable[Tuple[str, str]]) -> List[Batch]:
+        batches = []
+        for key in list(keys):
+            queue = self.queues.pop(key, [])
+            self._account(queue, -1)
+            for i in range(0, len(queue), self.size):
+                batches.append((key[0], key[1], queue[i:i + self.size]))
+        self.full.clear()
+        return batches
+
+    def _drop_oldest(self, entries: List[Entry]) -> List[Entry]:
+        # queues are created in the order of their first point and never refilled, so the head of the first
+        # queue is the point queued the longest
+        dropped = []
+        for key in list(self.queues):
+            queue = self.queues[key]
+            count = 0
+            while count < len(queue) and not self.fits(entries):
+                self._account(queue[count:count + 1], -1)
+                count += 1
+            dropped.extend(queue[:count])
+            del queue[:count]
+            if len(queue) == 0:
+                del self.queues[key]
+                self.full.discard(key)
+            if self.fits(entries):
+                break
+        self.stats.dropped_oldest += len(dropped)
+        return dropped
+
+    def _account(self, entries: List[Entry], sign: int):
+        self.stats.queued_points += sign * len(entries)
+        self.stats.queued_bytes += sign * sum(size for _, _, size in entries)
+
+
+def batch_callbacks(database: str, entries: List[Entry], err: Optional[Exception]) -> List[WriteCallback]:
+    # each distinct callback is called once per batch, errors nobody listens to are logged
+    callbacks = {id(cb): cb for _, cb, _ in entries if cb is not None}
+    if err is not None and len(callbacks) == 0:
+        logger.error("batch write to database %s failed: %s", database, err)
+    return list(callbacks.values())
+
+
+def dropped_callbacks(entries: List[Entry]) -> List[WriteCallback]:
+    # dropped points are counted in WriteQueueStats, their callbacks are called with ErrWriteQueueFull
+    return list({id(cb): cb for _, cb, _ in entries if cb is not None}.values())
+
+
+class BatchWriter:
+    """
+    buffer points per (database, retention policy) and send them from a background thread
+    whenever batch_size points are queued or batch_interval has elapsed
+    """
+
+    def __init__(self, batch_config: BatchConfig, send: SendFunc):
+        self._interval = batch_config.batch_interval / 1000
+        self._block_timeout = batch_config.block_timeout.total_seconds()
+        self._send = send
+        self._queue = WriteQueue(batch_config)
+        self._closed = False
+        # notified when points are queued, taken to be sent or the writer is closed
+        self._cond = threading.Condition()
+        # serialize take-and-send so batches of one queue always reach the server in order
+        self._send_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="opengemini-batch-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, database: str, rp: str, points: List[Point], callback: Optional[WriteCallback] = None):
+        entries = new_entries(points, callback)
+        with self._cond:
+            if self._closed:
+                raise RuntimeError(ErrBatchWriterClosed)
+            dropped = self._queue.admit((database, rp), entries)
+            if dropped is None:
+                dropped = self._wait_for_room((database, rp), entries)
+            if self._queue.full:
+                self._cond.notify_all()
+        for cb in dropped_callbacks(dropped):
+            _call_dropped(cb)
+
+    def _wait_for_room(self, key: Tuple[str, str], entries: List[Entry]) -> List[Entry]:
+        self._queue.stats.blocked += 1
+        deadline = time.monotonic() + self._block_timeout
+        dropped = None
+        while dropped is None:
+            self._cond.notify_all()
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self._queue.reject(entries)
+            self._cond.wait(remaining)
+            if self._closed:
+                raise RuntimeError(ErrBatchWriterClosed)
+            dropped = self._queue.admit(key, entries)
+        return dropped
+
+    def stats(self) -> WriteQueueStats:
+        with self._cond:
+            return WriteQueueStats(**vars(self._queue.stats))
+
+    def flush(self):
+        with self._send_lock:
+            with self._cond:
+                batches = self._take(self._queue.queues.keys())
+            self._send_batches(batches)
+
+    def close(self):
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+
+    def _take(self, keys) -> List[Batch]:
+        batches = self._queue.take(keys)
+        self._cond.notify_all()
+        return batches
+
+    def _send_batches(self, batches: List[Batch]):
+        for database, rp, entries in batches:
+            err = None
+            try:
+                self._send(database, rp, BatchPoints(points=[point for point, _, _ in entries]))
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                err = e
+            for cb in batch_callbacks(database, entries, err):
+                try:
+                    cb(err)
+                except Exception as e:  # pylint: disable=broad-exception-caught
+                    logger.error("batch write callback raised: %s", e)
+
+    def _run(self):
+        deadline = time.monotonic() + self._interval
+        while True:
+            with self._cond:
+                while not self._closed and len(self._queue.full) == 0 and time.monotonic() < deadline:
+                    self._cond.wait(deadline - time.monotonic())
+                closed = self._closed
+                flush_all = closed or time.monotonic() >= deadline
+            if flush_all:
+                deadline = time.monotonic() + self._interval
+            with self._send_lock:
+                with self._cond:
+                    batches = self._take(self._queue.queues.keys() if flush_all else self._queue.full)
+                self._send_batches(batches)
+            if closed:
+                return
+
+
+def _call_dropped(cb: WriteCallback):
+    try:
+        cb(RuntimeError(ErrWriteQueueFull))
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        logger.error("batch write callback raised: %s", e)
+
+
+class AsyncBatchWriter:
+    """
+    asyncio counterpart of BatchWriter, the flush task is started on the running loop by the first write;
+    callbacks may be plain functions or coroutine functions
+    """
+
+    def __init__(self, batch_config: BatchConfig, send: AsyncSendFunc):
+        self._interval = batch_config.batch_interval / 1000
+        self._block_timeout = batch_config.block_timeout.total_seconds()
+        self._send = send
+        self._queue = WriteQueue(batch_config)
+        self._closed = False
+        self._wakeup: Optional[asyncio.Event] = None
+        # notified when points are taken to be sent or the writer is closed, for writes waiting for room
+        self._room: Optional[asyncio.Condition] = None
+        self._send_lock: Optional[asyncio.Lock] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def _start(self):
+        if self._task is None:
+            self._wakeup = asyncio.Event()
+            self._room = asyncio.Condition()
+            self._send_lock = asyncio.Lock()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def write(self, database: str, rp: str, points: List[Point], callback: Optional[WriteCallback] = None):
+        if self._closed:
+            raise RuntimeError(ErrBatchWriterClosed)
+        self._start()
+        entries = new_entries(points, callback)
+        dropped = self._queue.admit((database, rp), entries)
+        if dropped is None:
+            dropped = await self._wait_for_room((database, rp), entries)
+        if self._queue.full:
+            self._wakeup.set()
+        await call_callbacks(dropped_callbacks(dropped), RuntimeError(ErrWriteQueueFull))
+
+    async def _wait_for_room(self, key: Tuple[str, str], entries: List[Entry]) -> List[Entry]:
+        self._queue.stats.blocked += 1
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self._block_timeout
+        async with self._room:
+            while True:
+                self._wakeup.set()
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    self._queue.reject(entries)
+                try:
+                    await asyncio.wait_for(self._room.wait(), remaining)
+                except asyncio.TimeoutError:
+                    pass
+                if self._closed:
+                    raise RuntimeError(ErrBatchWriterClosed)
+                dropped = self._queue.admit(key, entries)
+                if dropped is not None:
+                    return dropped
+
+    def stats(self) -> WriteQueueStats:
+        return WriteQueueStats(**vars(self._queue.stats))
+
+    async def flush(self):
+        if self._task is None:
+            return
+        async with self._send_lock:
+            await self._send_batches(await self._take(self._queue.queues.keys()))
+
+    async def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        if self._task is not None:
+            self._wakeup.set()
+            await self._task
+
+    async def _take(self, keys) -> List[Batch]:
+        batches = self._queue.take(keys)
+        async with self._room:
+            self._room.notify_all()
+        return batches
+
+    async def _send_batches(self, batches: List[Batch]):
+        for database, rp, entries in batches:
+            err = None
+            try:
+                await self._send(database, rp, BatchPoints(points=[point for point, _, _ in entries]))
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                err = e
+            await call_callbacks(batch_callbacks(database, entries, err), err)
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self._interval
+        while True:
+            if not self._closed and len(self._queue.full) == 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), max(0.0, deadline - loop.time()))
+                except asyncio.TimeoutError:
+                    pass
+            self._wakeup.clear()
+            closed = self._closed
+            flush_all = closed or loop.time() >= deadline
+            if flush_all:
+                deadline = loop.time() + self._interval
+            async with self._send_lock:
+                await self._send_batches(await self._take(self._queue.queues.keys() if flush_all else
+                                                          self._queue.full))
+            if closed:
+                return
+
+
+async def call_callbacks(callbacks: List[WriteCallback], err: Optional[Exception]):
+    for cb in callbacks:
+        try:
+            result = cb(err)
+            if inspect.isawaitable(result):
+                await result
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.error("batch write callback raised: %s", e)
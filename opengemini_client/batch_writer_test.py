@@ -0,0 +1,235 @@
+# Copyright 2025 openGemini Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import threading
+import time
+import unittest
+from datetime import timedelta
+from http import HTTPStatus
+
+from opengemini_client import models, test_utils
+from opengemini_client.async_client import AsyncOpenGeminiDBClient
+from opengemini_client.batch_writer import AsyncBatchWriter, BatchWriter
+
+
+def new_point(value: int) -> models.Point:
+    return models.Point(measurement='batch_mm', precision=models.Precision.PrecisionSecond, fields={'x': value})
+
+
+class BatchWriterTest(unittest.TestCase):
+
+    def setUp(self):
+        self.sent = []
+        self.event = threading.Event()
+
+    def send(self, database, rp, batch_points):
+        self.sent.append((database, rp, [p.fields['x'] for p in batch_points.points]))
+        self.event.set()
+
+    def test_flush_when_batch_size_reached(self):
+        writer = BatchWriter(models.BatchConfig(batch_interval=60 * 1000, batch_size=3), self.send)
+        writer.write('db', '', [new_point(1), new_point(2)])
+        self.assertFalse(self.event.wait(0.2))
+        writer.write('db', '', [new_point(3)])
+        self.assertTrue(self.event.wait(5))
+        self.assertEqual([('db', '', [1, 2, 3])], self.sent)
+        writer.close()
+
+    def test_flush_when_batch_interval_elapsed(self):
+        writer = BatchWriter(models.BatchConfig(batch_interval=50, batch_size=1000), self.send)
+        writer.write('db', 'rp1', [new_point(1)])
+        self.assertTrue(self.event.wait(5))
+        self.assertEqual([('db', 'rp1', [1])], self.sent)
+        writer.close()
+
+    def test_queues_split_by_database_and_rp(self):
+        writer = BatchWriter(models.BatchConfig(batch_interval=60 * 1000, batch_size=1000), self.send)
+        writer.write('db1', '', [new_point(1)])
+        writer.write('db2', '', [new_point(2)])
+        writer.write('db1', 'rp', [new_point(3)])
+        writer.write('db1', '', [new_point(4)])
+        writer.flush()
+        self.assertEqual([('db1', '', [1, 4]), ('db2', '', [2]), ('db1', 'rp', [3])], self.sent)
+        writer.close()
+
+    def test_close_drains_queue(self):
+        writer = BatchWriter(models.BatchConfig(batch_interval=60 * 1000, batch_size=2), self.send)
+        writer.write('db', '', [new_point(i) for i in range(5)])
+        writer.close()
+        self.assertEqual([[0, 1], [2, 3], [4]], [points for _, _, points in self.sent])
+        with self.assertRaises(RuntimeError):
+            writer.write('db', '', [new_point(5)])
+
+    def test_callback_receives_error(self):
+        errors = []
+
+        def failing_send(_database, _rp, _batch_points):
+            raise ValueError("write failed")
+
+        writer = BatchWriter(models.BatchConfig(batch_interval=60 * 1000, batch_size=10), failing_send)
+        writer.write('db', '', [new_point(1), new_point(2)], callback=errors.append)
+        writer.flush()
+        self.assertEqual(1, len(errors))
+        self.assertRegex(str(errors[0]), "write failed")
+        writer.close()
+
+    def test_callback_receives_none_on_success(self):
+        results = []
+        writer = BatchWriter(models.BatchConfig(batch_interval=10, batch_size=10), self.send)
+        writer.write('db', '', [new_point(1)], callback=results.append)
+        deadline = time.monotonic() + 5
+        while len(results) == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual([None], results)
+        writer.close()
+
+
+def bounded_config(policy: models.OverflowPolicy, **kwargs) -> models.BatchConfig:
+    return models.BatchConfig(batch_interval=60 * 1000, batch_size=3, max_queued_points=3, overflow_policy=policy,
+                              **kwargs)
+
+
+class WriteQueueTest(unittest.TestCase):
+
+    def setUp(self):
+        self.sent = []
+
+    def send(self, _database, _rp, batch_points):
+        self.sent.append([p.fields['x'] for p in batch_points.points])
+
+    def test_drop_newest(self):
+        errors = []
+        writer = BatchWriter(bounded_config(models.OverflowPolicy.DROP_NEWEST), self.send)
+        writer.write('db', '', [new_point(1), new_point(2)])
+        writer.write('db', '', [new_point(3), new_point(4)], callback=errors.append)
+        stats = writer.stats()
+        self.assertEqual((2, 2), (stats.queued_points, stats.dropped_newest))
+        self.assertEqual(2 * models.estimate_point_size(new_point(1)), stats.queued_bytes)
+        self.assertEqual(1, len(errors))
+        writer.close()
+        self.assertEqual([[1, 2]], self.sent)
+        self.assertEqual((0, 0), (writer.stats().queued_points, writer.stats().queued_bytes))
+
+    def test_drop_oldest(self):
+        writer = BatchWriter(bounded_config(models.OverflowPolicy.DROP_OLDEST), self.send)
+        writer.write('db1', '', [new_point(1)])
+        writer.write('db2', '', [new_point(2)])
+        writer.write('db1', '', [new_point(3), new_point(4)])
+        self.assertEqual(1, writer.stats().dropped_oldest)
+        writer.close()
+        self.assertEqual([[3, 4], [2]], sorted(self.sent, key=len, reverse=True))
+
+    def test_raise(self):
+        writer = BatchWriter(bounded_config(models.OverflowPolicy.RAISE), self.send)
+        writer.write('db', '', [new_point(1), new_point(2)])
+        with self.assertRaises(RuntimeError):
+            writer.write('db', '', [new_point(3), new_point(4)])
+        self.assertEqual(2, writer.stats().rejected)
+        writer.close()
+        self.assertEqual([[1, 2]], self.sent)
+
+    def test_max_queued_bytes(self):
+        size = models.estimate_point_size(new_point(1))
+        config = models.BatchConfig(batch_interval=60 * 1000, batch_size=100, max_queued_bytes=2 * size,
+                                    overflow_policy=models.OverflowPolicy.DROP_NEWEST)
+        writer = BatchWriter(config, self.send)
+        for i in range(3):
+            writer.write('db', '', [new_point(i)])
+        self.assertEqual((2, 1), (writer.stats().queued_points, writer.stats().dropped_newest))
+        writer.close()
+
+    def test_block_until_sent(self):
+        release = threading.Event()
+
+        def slow_send(database, rp, batch_points):
+            release.wait(5)
+            self.send(database, rp, batch_points)
+
+        writer = BatchWriter(bounded_config(models.OverflowPolicy.BLOCK, block_timeout=timedelta(seconds=5)),
+                             slow_send)
+        writer.write('db', '', [new_point(1), new_point(2)])
+        threading.Timer(0.1, release.set).start()
+        # waits until the queued points are taken to be sent
+        writer.write('db', '', [new_point(3), new_point(4)])
+        writer.write('db', '', [new_point(5)])
+        self.assertEqual(1, writer.stats().blocked)
+        writer.close()
+        self.assertEqual([1, 2, 3, 4, 5], [x for batch in self.sent for x in batch])
+
+    def test_block_timeout(self):
+        release = threading.Event()
+
+        def stuck_send(_database, _rp, _batch_points):
+            release.wait(5)
+
+        config = bounded_config(models.OverflowPolicy.BLOCK, block_timeout=timedelta(milliseconds=50))
+        writer = BatchWriter(config, stuck_send)
+        writer.write('db', '', [new_point(i) for i in range(3)])
+        while writer.stats().queued_points > 0:
+            time.sleep(0.01)
+        writer.write('db', '', [new_point(3), new_point(4)])
+        with self.assertRaises(RuntimeError):
+            writer.write('db', '', [new_point(5), new_point(6)])
+        self.assertEqual((1, 2), (writer.stats().blocked, writer.stats().rejected))
+        release.set()
+        writer.close()
+
+
+class AsyncWriteQueueTest(unittest.IsolatedAsyncioTestCase):
+
+    async def test_block_until_sent(self):
+        sent = []
+
+        async def send(_database, _rp, batch_points):
+            await asyncio.sleep(0.05)
+            sent.extend(p.fields['x'] for p in batch_points.points)
+
+        writer = AsyncBatchWriter(bounded_config(models.OverflowPolicy.BLOCK), send)
+        for i in range(0, 8, 2):
+            await writer.write('db', '', [new_point(i), new_point(i + 1)])
+        self.assertLessEqual(writer.stats().queued_points, 3)
+        await writer.close()
+        self.assertEqual(list(range(8)), sent)
+
+    async def test_drop_newest(self):
+        errors = []
+        writer = AsyncBatchWriter(bounded_config(models.OverflowPolicy.DROP_NEWEST), self._discard)
+        await writer.write('db', '', [new_point(1), new_point(2)])
+        await writer.write('db', '', [new_point(3), new_point(4)], callback=errors.append)
+        self.assertEqual(2, writer.stats().dropped_newest)
+        self.assertEqual(1, len(errors))
+        await writer.close()
+
+    @staticmethod
+    async def _discard(_database, _rp, _batch_points):
+        return None
+
+
+class AsyncClientCallbackTest(unittest.IsolatedAsyncioTestCase):
+
+    async def test_coroutine_callback_without_batch_writer(self):
+        def handler(_request: test_utils.StubRequest) -> test_utils.StubResponse:
+            return test_utils.StubResponse(status=HTTPStatus.BAD_REQUEST, body=b'bad')
+
+        errors = []
+
+        async def callback(err):
+            errors.append(err)
+
+        with test_utils.StubServer(handler) as server:
+            async with AsyncOpenGeminiDBClient(models.Config(address=[server.address])) as cli:
+                await cli.write_points('db', [new_point(1)], callback)
+        self.assertEqual(1, len(errors))
+        self.assertIsNotNone(errors[0])
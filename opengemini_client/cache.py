@@ -0,0 +1,330 @@
+# Copyright 2025 openGemini Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+client side caching of query results, shared by both clients
+"""
+import contextlib
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Set, Tuple
+
+from opengemini_client.models import BatchPoints, MetadataCacheConfig, Query, QueryCacheConfig, QueryResult
+
+# tag of the cached queries reading measurements that could not be told from the command
+ANY_MEASUREMENT = None
+# database of the show databases lookup
+DATABASE_LIST = ''
+
+_from_clause = re.compile(
+    r'\bfrom\s+(.+?)(?=\s+(?:where|group|order|limit|offset|slimit|soffset|fill|tz)\b|;|$)',
+    re.IGNORECASE | re.DOTALL)
+_identifier_part = re.compile(r'"((?:[^"\\]|\\.)*)"|([^."\s]+)')
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    # entries dropped to stay within the entry or size bound
+    evictions: int = 0
+    # entries found expired on lookup
+    expirations: int = 0
+    # entries dropped by invalidate or invalidate_tag
+    invalidations: int = 0
+    entries: int = 0
+    size: int = 0
+
+
+@dataclass
+class _Entry:
+    value: Any
+    size: int
+    expires: float
+    tags: Tuple[Hashable, ...]
+
+
+def check_query_cache_config(query_cache_config: QueryCacheConfig):
+    if query_cache_config is None:
+        return
+    if query_cache_config.max_entries < 1:
+        raise ValueError("query cache max entries must be at least 1")
+    if query_cache_config.max_bytes < 0:
+        raise ValueError("query cache max bytes must not be negative")
+    if query_cache_config.ttl.total_seconds() <= 0:
+        raise ValueError("query cache ttl must be greater than 0")
+
+
+def check_metadata_cache_config(metadata_cache_config: MetadataCacheConfig):
+    if metadata_cache_config is None:
+        return
+    if metadata_cache_config.max_entries < 1:
+        raise ValueError("metadata cache max entries must be at least 1")
+    if metadata_cache_config.ttl.total_seconds() <= 0:
+        raise ValueError("metadata cache ttl must be greater than 0")
+
+
+def _failed(result: QueryResult) -> bool:
+    return result.error is not None or any(res.error is not None for res in result.results)
+
+
+class TTLCache:
+    """
+    a thread safe least recently used cache whose entries expire ttl seconds after they were stored, bounded by
+    max_entries and, when max_size is set, by the summed size of the entries; entries carry tags to drop them
+    in groups
+    """
+
+    def __init__(self, max_entries: int, ttl: float, max_size: int = 0, clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self.max_size = max_size
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._tagged: Dict[Hashable, Set[Hashable]] = {}
+        self._stats = CacheStats()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires <= self._clock():
+                self._remove(key)
+                self._stats.expirations += 1
+                entry = None
+            if entry is None:
+                self._stats.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self._stats.hits += 1
+            return entry.value
+
+    def put(self, key: Hashable, value: Any, size: int = 0, tags: Iterable[Hashable] = ()):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if 0 < self.max_size < size:
+                return
+            entry = _Entry(value=value, size=size, expires=self._clock() + self.ttl, tags=tuple(tags))
+            self._entries[key] = entry
+            self._stats.size += size
+            for tag in entry.tags:
+                self._tagged.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries or 0 < self.max_size < self._stats.size:
+                self._remove(next(iter(self._entries)))
+                self._stats.evictions += 1
+
+    def invalidate(self, key: Hashable) -> bool:
+        with self._lock:
+            if key not in self._entries:
+                return False
+            self._remove(key)
+            self._stats.invalidations += 1
+            return True
+
+    def invalidate_tag(self, tag: Hashable) -> int:
+        """
+        drop every entry stored with tag, returns the number of entries dropped
+        """
+        with self._lock:
+            keys = list(self._tagged.get(tag, ()))
+            for key in keys:
+                self._remove(key)
+            self._stats.invalidations += len(keys)
+            return len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tagged.clear()
+            self._stats.size = 0
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(**{**vars(self._stats), 'entries': len(self._entries)})
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _remove(self, key: Hashable):
+        entry = self._entries.pop(key)
+        self._stats.size -= entry.size
+        for tag in entry.tags:
+            keys = self._tagged[tag]
+            keys.discard(key)
+            if not keys:
+                del self._tagged[tag]
+
+
+def is_cacheable(command: str) -> bool:
+    """
+    only queries made of select statements without an into clause are cached
+    """
+    statements = [statement.strip() for statement in command.split(';') if statement.strip()]
+    return len(statements) > 0 and all(
+        statement[:6].lower() == 'select' and re.search(r'\binto\b', statement, re.IGNORECASE) is None
+        for statement in statements)
+
+
+def _split_identifier(source: str) -> Optional[List[str]]:
+    parts = []
+    pos = 0
+    while pos < len(source):
+        match = _identifier_part.match(source, pos)
+        if match is None:
+            return None
+        parts.append(match.group(1).replace('\\"', '"') if match.group(1) is not None else match.group(2))
+        pos = match.end()
+        if pos < len(source):
+            if source[pos] != '.':
+                return None
+            pos += 1
+    return parts
+
+
+def query_measurements(database: str, command: str) -> Set[Tuple[str, Optional[str]]]:
+    """
+    the (database, measurement) pairs a query reads, measurement is ANY_MEASUREMENT for sources that are
+    regular expressions, subqueries or could not be parsed
+    """
+    read = set()
+    for match in _from_clause.finditer(command):
+        for source in match.group(1).split(','):
+            source = source.strip()
+            parts = None if source.startswith(('(', '/')) else _split_identifier(source)
+            if not parts or len(parts) > 3:
+                read.add((database, ANY_MEASUREMENT))
+                continue
+            read.add((parts[0] if len(parts) == 3 else database, parts[-1]))
+    return read or {(database, ANY_MEASUREMENT)}
+
+
+class QueryCache:
+    """
+    results of select queries keyed on the query fields, tagged with the measurements the command reads
+    so that writes through the client can drop them
+    """
+
+    def __init__(self, config: QueryCacheConfig, clock: Callable[[], float] = time.monotonic):
+        self.config = config
+        self._cache = TTLCache(max_entries=config.max_entries, ttl=config.ttl.total_seconds(),
+                               max_size=config.max_bytes, clock=clock)
+
+    @staticmethod
+    def _key(query: Query) -> Hashable:
+        return query.database, query.command, query.retention_policy, query.precision, query.response_format
+
+    def get(self, query: Query) -> Optional[QueryResult]:
+        """
+        the cached result, shared between callers and not to be modified
+        """
+        if not is_cacheable(query.command):
+            return None
+        return self._cache.get(self._key(query))
+
+    def put(self, query: Query, result: QueryResult, size: int):
+        if not is_cacheable(query.command) or _failed(result):
+            return
+        self._cache.put(self._key(query), result, size, query_measurements(query.database, query.command))
+
+    def invalidate_writes(self, database: str, measurements: Iterable[str]):
+        if not self.config.invalidate_on_write:
+            return
+        self._cache.invalidate_tag((database, ANY_MEASUREMENT))
+        for measurement in set(measurements):
+            self._cache.invalidate_tag((database, measurement))
+
+    def clear(self):
+        self._cache.clear()
+
+    def stats(self) -> CacheStats:
+        return self._cache.stats()
+
+
+class MetadataCache:
+    """
+    results of the show_* lookups keyed on database and command; the entries of a database are dropped when
+    the client runs a ddl statement on it, schema created by writes shows up once the entries expire or are
+    refreshed
+    """
+
+    def __init__(self, config: MetadataCacheConfig, clock: Callable[[], float] = time.monotonic):
+        self.config = config
+        self._cache = TTLCache(max_entries=config.max_entries, ttl=config.ttl.total_seconds(), clock=clock)
+
+    def get(self, database: str, command: str) -> Optional[QueryResult]:
+        return self._cache.get((database, command))
+
+    def put(self, database: str, command: str, result: QueryResult):
+        if not _failed(result):
+            self._cache.put((database, command), result, tags=[database])
+
+    def invalidate(self, *databases: str):
+        for database in databases:
+            self._cache.invalidate_tag(database)
+
+    def refresh(self, database: Optional[str] = None):
+        """
+        drop the cached lookups of database, or all of them, so that the next lookups reach the server
+        """
+        if database is None:
+            self._cache.clear()
+        else:
+            self.invalidate(database)
+
+    def stats(self) -> CacheStats:
+        return self._cache.stats()
+
+
+def new_query_cache(query_cache_config: Optional[QueryCacheConfig]) -> Optional[QueryCache]:
+    return None if query_cache_config is None else QueryCache(query_cache_config)
+
+
+def new_metadata_cache(metadata_cache_config: Optional[MetadataCacheConfig]) -> Optional[MetadataCache]:
+    return None if metadata_cache_config is None else MetadataCache(metadata_cache_config)
+
+
+def batch_measurements(batch_points: BatchPoints) -> Iterator[str]:
+    """
+    measurements written by batch_points, skipping the None entries the serializers skip as well
+    """
+    return (point.measurement for point in batch_points.points if point is not None)
+
+
+@contextlib.contextmanager
+def invalidating(query_cache: Optional[QueryCache], database: str, measurements: Iterable[str]) -> Iterator[None]:
+    """
+    drop the cached results reading measurements once the write in the block is done, measurements is only
+    consumed when there is a cache; a failed write may have been applied in part and invalidates as well
+    """
+    try:
+        yield
+    finally:
+        if query_cache is not None:
+            query_cache.invalidate_writes(database, measurements)
+
+
+@contextlib.contextmanager
+def invalidating_metadata(metadata_cache: Optional[MetadataCache], *databases: str) -> Iterator[None]:
+    """
+    drop the cached lookups of databases once the ddl statement in the block is done, whether it succeeded
+    """
+    try:
+        yield
+    finally:
+        if metadata_cache is not None:
+            metadata_cache.invalidate(*databases)
@@ -0,0 +1,269 @@
+# Copyright 2025 openGemini Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import unittest
+from datetime import datetime, timedelta
+from http import HTTPStatus
+
+from opengemini_client import client_impl, models, test_utils
+from opengemini_client.async_client import AsyncOpenGeminiDBClient
+from opengemini_client.balancer_test import FakeClock
+from opengemini_client.cache import ANY_MEASUREMENT, MetadataCache, TTLCache, is_cacheable, query_measurements
+from opengemini_client.measurement import MeasurementCondition
+
+
+def query_handler(request: test_utils.StubRequest) -> test_utils.StubResponse:
+    if request.path.startswith('/write'):
+        return test_utils.StubResponse()
+    body = json.dumps({'results': [{'statement_id': 0, 'series': [
+        {'name': 'cpu', 'columns': ['time', 'q'], 'values': [[1, request.params['q']]]}]}]})
+    return test_utils.StubResponse(status=HTTPStatus.OK, body=body.encode())
+
+
+def select(command: str) -> models.Query:
+    return models.Query(database='db0', command=command, retention_policy='')
+
+
+def cpu_point() -> models.BatchPoints:
+    return models.BatchPoints(points=[models.Point(measurement='cpu', precision=models.Precision.PrecisionSecond,
+                                                   fields={'v': 1.0}, timestamp=datetime.fromtimestamp(1700000000))])
+
+
+class TTLCacheTest(unittest.TestCase):
+
+    def test_lru_eviction(self):
+        cache = TTLCache(max_entries=2, ttl=10)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        self.assertEqual(1, cache.get('a'))
+        cache.put('c', 3)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual([1, 3], [cache.get('a'), cache.get('c')])
+        stats = cache.stats()
+        self.assertEqual((3, 1, 1, 2), (stats.hits, stats.misses, stats.evictions, stats.entries))
+
+    def test_size_bound(self):
+        cache = TTLCache(max_entries=10, ttl=10, max_size=100)
+        cache.put('a', 1, size=60)
+        cache.put('b', 2, size=30)
+        cache.put('c', 3, size=30)
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(60, cache.stats().size)
+        cache.put('huge', 4, size=101)
+        self.assertIsNone(cache.get('huge'))
+        self.assertEqual(2, len(cache))
+
+    def test_ttl(self):
+        clock = FakeClock()
+        cache = TTLCache(max_entries=10, ttl=5, clock=clock)
+        cache.put('a', 1)
+        clock.now += 4.9
+        self.assertEqual(1, cache.get('a'))
+        clock.now += 0.1
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(1, cache.stats().expirations)
+        self.assertEqual(0, len(cache))
+
+    def test_tags(self):
+        cache = TTLCache(max_entries=10, ttl=10)
+        cache.put('a', 1, tags=['x', 'y'])
+        cache.put('b', 2, tags=['y'])
+        cache.put('c', 3)
+        self.assertEqual(2, cache.invalidate_tag('y'))
+        self.assertEqual(0, cache.invalidate_tag('x'))
+        self.assertTrue(cache.invalidate('c'))
+        self.assertEqual((0, 3), (len(cache), cache.stats().invalidations))
+
+
+class QueryParseTest(unittest.TestCase):
+
+    def test_is_cacheable(self):
+        self.assertTrue(is_cacheable('SELECT * FROM cpu'))
+        self.assertTrue(is_cacheable(' select * from cpu; select * from mem;'))
+        self.assertFalse(is_cacheable('show measurements'))
+        self.assertFalse(is_cacheable('select * into cpu_copy from cpu'))
+        self.assertFalse(is_cacheable('select * from cpu; drop measurement cpu'))
+
+    def test_query_measurements(self):
+        self.assertEqual({('db0', 'cpu')}, query_measurements('db0', 'select * from cpu where time > now() - 1h'))
+        self.assertEqual({('db0', 'cpu'), ('db0', 'mem x'), ('db1', 'disk')},
+                         query_measurements('db0', 'SELECT * FROM cpu, "mem x", db1.autogen."disk" GROUP BY *'))
+        self.assertEqual({('db0', 'cpu'), ('db0', 'mem')},
+                         query_measurements('db0', 'select * from autogen.cpu; select * from mem limit 1'))
+        for command in ('select * from /cp.*/', 'select mean(v) from (select * from cpu)', 'select 1'):
+            with self.subTest(command=command):
+                self.assertIn(('db0', ANY_MEASUREMENT), query_measurements('db0', command))
+
+
+class QueryCacheClientTest(unittest.TestCase):
+
+    def test_repeated_query_is_cached(self):
+        cfg = models.QueryCacheConfig(max_entries=10)
+        with test_utils.StubServer(query_handler) as server:
+            with client_impl.OpenGeminiDBClient(models.Config(address=[server.address],
+                                                              query_cache_config=cfg)) as cli:
+                first = cli.query(select('select * from cpu'))
+                self.assertIs(first, cli.query(select('select * from cpu')))
+                cli.query(models.Query(database='db0', command='select * from cpu', retention_policy='',
+                                       precision=models.Precision.PrecisionSecond))
+                cli.query(select('show measurements'))
+                cli.query(select('show measurements'))
+                stats = cli.query_cache.stats()
+        self.assertEqual(4, len(server.requests))
+        self.assertEqual((1, 2, 2), (stats.hits, stats.misses, stats.entries))
+
+    def test_write_invalidates(self):
+        with test_utils.StubServer(query_handler) as server:
+            with client_impl.OpenGeminiDBClient(models.Config(address=[server.address],
+                                                              query_cache_config=models.QueryCacheConfig())) as cli:
+                for command in ('select * from cpu', 'select * from mem', 'select * from /.*/'):
+                    cli.query(select(command))
+                cli.write_batch_points('db0', cpu_point())
+                self.assertEqual(1, cli.query_cache.stats().entries)
+                cli.write_batch_points('db1', cpu_point())
+                cli.query(select('select * from mem'))
+                self.assertEqual(1, cli.query_cache.stats().hits)
+                cli.query(select('select * from cpu'))
+        self.assertEqual(6, len(server.requests))
+
+    def test_write_with_none_points(self):
+        with test_utils.StubServer(query_handler) as server:
+            with client_impl.OpenGeminiDBClient(models.Config(address=[server.address],
+                                                              query_cache_config=models.QueryCacheConfig())) as cli:
+                cli.query(select('select * from cpu'))
+                batch_points = cpu_point()
+                batch_points.points.append(None)
+                cli.write_batch_points('db0', batch_points)
+                self.assertEqual(0, cli.query_cache.stats().entries)
+        self.assertEqual(['/query', '/write'], [r.path for r in server.requests])
+
+    def test_no_invalidation_on_write(self):
+        cfg = models.QueryCacheConfig(invalidate_on_write=False, ttl=timedelta(minutes=1))
+        with test_utils.StubServer(query_handler) as server:
+            with client_impl.OpenGeminiDBClient(models.Config(address=[server.address],
+                                                              query_cache_config=cfg)) as cli:
+                cli.query(select('select * from cpu'))
+                cli.write_batch_points('db0', cpu_point())
+                cli.query(select('select * from cpu'))
+        self.assertEqual(2, len(server.requests))
+
+    def test_invalid_config(self):
+        address = [models.Address(host='127.0.0.1', port=8086)]
+        for cfg in (models.QueryCacheConfig(max_entries=0), models.QueryCacheConfig(ttl=timedelta(0)),
+                    models.QueryCacheConfig(max_bytes=-1)):
+            with self.subTest(cfg=cfg), self.assertRaises(ValueError):
+                client_impl.OpenGeminiDBClient(models.Config(address=address, query_cache_config=cfg))
+
+
+class AsyncQueryCacheTest(unittest.IsolatedAsyncioTestCase):
+
+    async def test_cache_and_invalidate(self):
+        with test_utils.StubServer(query_handler) as server:
+            async with AsyncOpenGeminiDBClient(models.Config(address=[server.address],
+                                                             query_cache_config=models.QueryCacheConfig())) as cli:
+                await cli.query(select('select * from cpu'))
+                await cli.query(select('select * from cpu'))
+                batch_points = cpu_point()
+                batch_points.points.append(None)
+                await cli.write_batch_points('db0', batch_points)
+                await cli.query(select('select * from cpu'))
+        self.assertEqual(['/query', '/write', '/query'], [r.path for r in server.requests])
+
+
+def show_handler(request: test_utils.StubRequest) -> test_utils.StubResponse:
+    command = request.params['q'].upper()
+    if command.startswith('SHOW DATABASES'):
+        series = {'name': 'databases', 'columns': ['name'], 'values': [['db0'], ['db1']]}
+    elif command.startswith('SHOW MEASUREMENTS'):
+        series = {'name': 'measurements', 'columns': ['name'], 'values': [['cpu']]}
+    elif command.startswith('SHOW TAG KEYS'):
+        series = {'name': 'cpu', 'columns': ['tagKey'], 'values': [['host']]}
+    else:
+        return test_utils.StubResponse(status=HTTPStatus.OK, body=b'{"results":[{"statement_id":0}]}')
+    body = json.dumps({'results': [{'statement_id': 0, 'series': [series]}]})
+    return test_utils.StubResponse(status=HTTPStatus.OK, body=body.encode())
+
+
+class MetadataCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = test_utils.StubServer(show_handler)
+        self.server.start()
+        self.cli = client_impl.OpenGeminiDBClient(models.Config(
+            address=[self.server.address], metadata_cache_config=models.MetadataCacheConfig()))
+
+    def tearDown(self):
+        self.cli.close()
+        self.server.stop()
+
+    def show_count(self, prefix: str) -> int:
+        return sum(1 for r in self.server.requests if r.params['q'].upper().startswith(prefix))
+
+    def test_lookups_are_cached(self):
+        for _ in range(3):
+            self.assertEqual(['db0', 'db1'], self.cli.show_databases())
+            self.assertEqual(['cpu'], self.cli.show_measurements(MeasurementCondition(database='db0')))
+            self.assertEqual(['host'], self.cli.show_tag_keys('db0', 'SHOW TAG KEYS FROM cpu')[0].values)
+        self.assertEqual(3, len(self.server.requests))
+        self.assertEqual(6, self.cli.metadata_cache.stats().hits)
+
+    def test_ddl_invalidates(self):
+        self.cli.show_databases()
+        self.cli.show_measurements(MeasurementCondition(database='db0'))
+        self.cli.show_measurements(MeasurementCondition(database='db1'))
+        self.cli.drop_measurement('db0', '', 'cpu')
+        self.cli.show_databases()
+        self.cli.show_measurements(MeasurementCondition(database='db0'))
+        self.cli.show_measurements(MeasurementCondition(database='db1'))
+        self.assertEqual((1, 3), (self.show_count('SHOW DATABASES'), self.show_count('SHOW MEASUREMENTS')))
+        self.cli.create_database('db2')
+        self.cli.show_databases()
+        self.cli.show_measurements(MeasurementCondition(database='db1'))
+        self.assertEqual((2, 3), (self.show_count('SHOW DATABASES'), self.show_count('SHOW MEASUREMENTS')))
+
+    def test_refresh(self):
+        self.cli.show_measurements(MeasurementCondition(database='db0'))
+        self.cli.show_measurements(MeasurementCondition(database='db1'))
+        self.cli.metadata_cache.refresh('db0')
+        self.cli.show_measurements(MeasurementCondition(database='db0'))
+        self.cli.show_measurements(MeasurementCondition(database='db1'))
+        self.assertEqual(3, self.show_count('SHOW MEASUREMENTS'))
+        self.cli.metadata_cache.refresh()
+        self.cli.show_measurements(MeasurementCondition(database='db1'))
+        self.assertEqual(4, self.show_count('SHOW MEASUREMENTS'))
+
+    def test_ttl(self):
+        clock = FakeClock()
+        cache = MetadataCache(models.MetadataCacheConfig(ttl=timedelta(seconds=30)), clock=clock)
+        cache.put('db0', 'SHOW MEASUREMENTS', models.QueryResult())
+        clock.now += 29
+        self.assertIsNotNone(cache.get('db0', 'SHOW MEASUREMENTS'))
+        clock.now += 1
+        self.assertIsNone(cache.get('db0', 'SHOW MEASUREMENTS'))
+        cache.put('db0', 'SHOW MEASUREMENTS', models.QueryResult(error='database not found'))
+        self.assertIsNone(cache.get('db0', 'SHOW MEASUREMENTS'))
+
+
+class AsyncMetadataCacheTest(unittest.IsolatedAsyncioTestCase):
+
+    async def test_cache_and_invalidate(self):
+        with test_utils.StubServer(show_handler) as server:
+            cfg = models.Config(address=[server.address], metadata_cache_config=models.MetadataCacheConfig())
+            async with AsyncOpenGeminiDBClient(cfg) as cli:
+                self.assertEqual(['db0', 'db1'], await cli.show_databases())
+                self.assertEqual(['db0', 'db1'], await cli.show_databases())
+                await cli.drop_database('db1')
+                await cli.show_databases()
+        self.assertEqual(3, len(server.requests))
@@ -16,13 +16,15 @@
 client module
 """
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Union
 
-from opengemini_client.models import BatchPoints, QueryResult, Query, RpConfig, ValuesResult
+from opengemini_client.models import BatchPoints, ParallelWriteResult, Point, Precision, QueryResult, Query, RpConfig, \
+    Series, ValuesResult
 from opengemini_client.measurement import Measurement, MeasurementCondition
+from opengemini_client.schema import SchemaRow, SchemaWriter
 
 
-class Client(ABC):
+class Client(ABC):  # pylint: disable=too-many-public-methods
     """
     Client abstract class responsible for communicating with the openGemini
     """
@@ -43,15 +45,109 @@ class Client(ABC):
         :return: returns a two-tuple. the first one is the query result and the second is an error message
         """
 
+    def query_iter(self, query: Query, chunk_size: int = 10000) -> Iterator[Series]:
+        """
+        query with chunked responses, series are yielded while the response is read so memory stays bounded
+        :param query: Query object
+        :param chunk_size: rows per chunk sent by the server, a series longer than that arrives in several
+                           fragments with the same name and tags
+        :return: iterator of Series fragments, the request is sent when iteration starts
+        """
+
     @abstractmethod
-    def write_batch_points(self, database: str, batch_points: BatchPoints):
+    def write_batch_points(self, database: str, batch_points: BatchPoints, rp: str = ''):
         """
         batch points to assigned database
         :param database:  name
         :param batch_points: BatchPoints object
+        :param rp: retention policy
         :return: return an error message
         """
 
+    def write_batch_points_parallel(self, database: str, batch_points: BatchPoints,
+                                    rp: str = '') -> ParallelWriteResult:
+        """
+        split batch_points into sub-batches of parallel_write_config.sub_batch_size points and send them
+        concurrently, spread over every configured address
+        :param database: name
+        :param batch_points: BatchPoints object
+        :param rp: retention policy
+        :return: one SubBatchResult per sub-batch, failed ones carry the error and can be written again
+        """
+
+    @abstractmethod
+    def write_columns(self, database: str, measurement: str, tags: Dict[str, Union[str, Sequence[str]]],
+                      fields: Dict[str, Sequence[Any]], timestamps: Sequence[Any],
+                      precision: Precision = Precision.PrecisionNanoSecond, rp: str = ''):
+        """
+        write column arrays as line protocol, without building a Point per row
+        :param database: name
+        :param measurement: measurement name
+        :param tags: tag name to a string shared by all rows, or to a sequence with one string (or None) per row
+        :param fields: field name to a numpy array or sequence with one value (None or NaN for null) per row
+        :param timestamps: integer epochs in precision, or a numpy datetime64 array
+        :param precision: precision of integer timestamps, datetime64 timestamps are rounded to it
+        :param rp: retention policy
+        """
+
+    def write_columns_by_grpc(self, database: str, measurement: str, tags: Dict[str, Union[str, Sequence[str]]],
+                              fields: Dict[str, Sequence[Any]], timestamps: Sequence[Any],
+                              precision: Precision = Precision.PrecisionNanoSecond, rp: str = ''):
+        """
+        write column arrays as one gRPC record, same arguments as write_columns
+        """
+
+    def register_schema(self, measurement: Measurement,
+                        precision: Precision = Precision.PrecisionNanoSecond) -> SchemaWriter:
+        """
+        compile the tags and typed fields of measurement into a writer for write_rows
+        :param measurement: Measurement with database, retention_policy, measurement, tags and fields set
+        :param precision: precision of integer timestamps in the rows
+        :return: the writer, also kept in the client's schemas registry
+        """
+
+    def write_rows(self, writer: SchemaWriter, rows: Iterable[SchemaRow]):
+        """
+        write rows of values in schema order to the database and retention policy of the writer's measurement
+        :param writer: SchemaWriter returned by register_schema
+        :param rows: tag values, field values and the timestamp of every row, see SchemaRow
+        """
+
+    def write_rows_by_grpc(self, writer: SchemaWriter, rows: Iterable[SchemaRow]):
+        """
+        write rows as one gRPC record, same arguments as write_rows
+        """
+
+    @abstractmethod
+    def write_point(self, database: str, point: Point, callback: Optional[Callable[[Optional[Exception]], None]] = None,
+                    rp: str = ''):
+        """
+        write a single point, buffered by the background writer when batch_config is set
+        :param database: name
+        :param point: Point object
+        :param callback: called with None or the write error once the point has been sent
+        :param rp: retention policy
+        """
+
+    @abstractmethod
+    def write_points(self, database: str, points: List[Point],
+                     callback: Optional[Callable[[Optional[Exception]], None]] = None, rp: str = ''):
+        """
+        write points, buffered by the background writer when batch_config is set; when its queue is full the
+        write blocks, drops points or raises as batch_config.overflow_policy says
+        :param database: name
+        :param points: Point list
+        :param callback: called with None or the write error once the points have been sent, or with an error
+            for points dropped from a full queue
+        :param rp: retention policy
+        """
+
+    @abstractmethod
+    def flush(self):
+        """
+        send all points buffered by write_point/write_points and wait for the requests to finish
+        """
+
     def write_by_grpc(self, database: str, batch_points: BatchPoints, rp: str = ''):
         """
         batch points to assigned database
@@ -14,25 +14,44 @@
 
 import base64
 import datetime
+import functools
 import gzip
-import io
-import itertools
-import os.path
+import threading
+import time
+import zlib
 from abc import ABC
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, TimeoutError as FuturesTimeoutError, wait
 from http import HTTPStatus
-from typing import List
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Union
 
 import grpc
 import requests
 from requests import HTTPError
+from requests.adapters import HTTPAdapter
 
 from opengemini_client import grpc_client
+from opengemini_client.balancer import Balancer
+from opengemini_client.batch_writer import BatchWriter, WriteCallback
+from opengemini_client.cache import DATABASE_LIST, batch_measurements, check_metadata_cache_config, \
+    check_query_cache_config, invalidating, invalidating_metadata, new_metadata_cache, new_query_cache
+from opengemini_client.codec.compress import check_available
+from opengemini_client.codec.json_decode import default_decoder
+from opengemini_client.codec.query_format import body_decoder
 from opengemini_client.client import Client
+from opengemini_client.columns import ColumnValues, encode_columns
+from opengemini_client.line_protocol import SeriesKeyCache, check_series_key_cache_config, encode_batch_points, \
+    iter_batch_points, new_series_key_cache
 from opengemini_client.measurement import Measurement, MeasurementCondition
 from opengemini_client.models import Config, BatchPoints, Query, QueryResult, Series, SeriesResult, RpConfig, \
-    ValuesResult, KeyValue, AuthConfig
+    ValuesResult, KeyValue, AuthConfig, Point, Precision, ParallelWriteConfig, ParallelWriteResult, \
+    SubBatchResult
+from opengemini_client.schema import SchemaRegistry, SchemaRow, SchemaWriter
+from opengemini_client.retry import LatencyTracker, backoff_delay, can_retry, is_retryable_status, check_hedge_config, \
+    check_retry_config, hedge_delay
+from opengemini_client.spool import UNREACHABLE_ERRORS, SpoolEntry, SpoolKind, append_or_raise, check_spool_config, \
+    new_spool, records_entry, spools
 from opengemini_client.url_const import UrlConst
-from opengemini_client.models import AuthType, TlsConfig
+from opengemini_client.models import AuthType, TlsConfig, BalancerConfig, BatchConfig, ResponseFormat
 
 
 def check_auth_config(auth_config: AuthConfig):
@@ -46,6 +65,36 @@ def check_auth_config(auth_config: AuthConfig):
             raise ValueError("invalid auth config due to empty token")
 
 
+def check_parallel_write_config(parallel_write_config: ParallelWriteConfig):
+    if parallel_write_config is not None:
+        if parallel_write_config.sub_batch_size <= 0:
+            raise ValueError("parallel write enabled, sub batch size must be greater than 0")
+        if parallel_write_config.max_workers < 0:
+            raise ValueError("parallel write enabled, max workers must not be negative")
+
+
+def check_balancer_config(balancer_config: BalancerConfig):
+    if balancer_config.max_failures < 0:
+        raise ValueError("balancer max failures must not be negative")
+    if not 0 < balancer_config.ewma_alpha <= 1:
+        raise ValueError("balancer ewma alpha must be in (0, 1]")
+
+
+def check_batch_config(batch_config: BatchConfig):
+    if batch_config is None:
+        return
+    if batch_config.batch_interval <= 0:
+        raise ValueError("batch enabled,batch interval must be greater than 0")
+    if batch_config.batch_size <= 0:
+        raise ValueError("batch enabled,batch size must be greater than 0")
+    if batch_config.max_queued_points < 0 or batch_config.max_queued_bytes < 0:
+        raise ValueError("batch enabled,max queued points and bytes must not be negative")
+    if 0 < batch_config.max_queued_points < batch_config.batch_size:
+        raise ValueError("batch enabled,max queued points must not be less than the batch size")
+    if batch_config.block_timeout.total_seconds() < 0:
+        raise ValueError("batch enabled,block timeout must not be negative")
+
+
 def check_config(config: Config):
     if len(config.address) == 0:
         raise ValueError("must have at least one address")
@@ -55,15 +104,29 @@ def check_config(config: Config):
     if config.tls_enabled and config.tls_config is None:
         config.tls_config = TlsConfig()
 
-    if config.batch_config is not None:
-        if config.batch_config.batch_interval <= 0:
-            raise ValueError("batch enabled,batch interval must be greater than 0")
-        if config.batch_config.batch_size <= 0:
-            raise ValueError("batch enabled,batch size must be greater than 0")
+    check_batch_config(config.batch_config)
 
     if config.timeout is None or config.timeout <= datetime.timedelta(seconds=0):
         config.timeout = datetime.timedelta(seconds=30)
 
+    if not 1 <= config.gzip_level <= 9:
+        raise ValueError("gzip level must be between 1 and 9")
+
+    check_parallel_write_config(config.parallel_write_config)
+
+    if config.json_decoder is None:
+        config.json_decoder = default_decoder()
+
+    if config.balancer_config is None:
+        config.balancer_config = BalancerConfig()
+    check_balancer_config(config.balancer_config)
+    check_retry_config(config.retry_config)
+    check_query_cache_config(config.query_cache_config)
+    check_metadata_cache_config(config.metadata_cache_config)
+    check_spool_config(config.spool_config)
+    check_series_key_cache_config(config.series_key_cache_config)
+    check_hedge_config(config.hedge_config)
+
     if config.connection_timeout is None or config.connection_timeout <= datetime.timedelta(seconds=0):
         config.connection_timeout = datetime.timedelta(seconds=10)
 
@@ -78,22 +141,24 @@ def check_config(config: Config):
     if config.grpc_config.tls_enable and config.grpc_config.tls_config is None:
         config.grpc_config.tls_config = TlsConfig()
 
+    check_available(config.grpc_config.compress_method)
+
     return config
 
 
-def resolve_query_body(resp: requests.Response):
-    json_data = resp.json()
+def new_series(series: dict) -> Series:
+    return Series(
+        name=series.get('name', ''),
+        tags=series.get('tags') or {},
+        columns=series.get('columns', []),
+        values=series.get('values', [])
+    )
+
+
+def resolve_query_result(json_data: dict) -> QueryResult:
     results = [
         SeriesResult(
-            series=[
-                Series(
-                    name=series.get('name', ''),
-                    columns=series.get('columns', []),
-                    values=series.get('values', [])
-                )
-                for series in result.get('series', [])
-                if series.get('values', [])
-            ],
+            series=[new_series(series) for series in result.get('series', []) if series.get('values', [])],
             error=result.get('error')
         )
         for result in json_data.get('results', [])
@@ -101,7 +166,288 @@ def resolve_query_body(resp: requests.Response):
     return QueryResult(results=results, error=json_data.get('error'))
 
 
-class OpenGeminiDBClient(Client, ABC):
+def resolve_query_chunk(json_data: dict) -> List[Series]:
+    """
+    series fragments of one document of a chunked query response, errors are raised
+    """
+    if json_data.get('error') is not None:
+        raise HTTPError(f"query error result, error: {json_data['error']}")
+    fragments = []
+    for result in json_data.get('results', []):
+        if result.get('error') is not None:
+            raise HTTPError(f"query error result, error: {result['error']}")
+        fragments.extend(new_series(series) for series in result.get('series', []) if series.get('values', []))
+    return fragments
+
+
+class JsonLineSplitter:
+    """
+    split a chunked query response into its newline separated json documents as the bytes arrive,
+    only the incomplete last document is buffered
+    """
+
+    def __init__(self):
+        self._buf = bytearray()
+
+    def feed(self, data: bytes) -> List[bytes]:
+        end = data.rfind(b'\n')
+        if end < 0:
+            self._buf += data
+            return []
+        self._buf += data[:end]
+        lines = self._buf.split(b'\n')
+        self._buf = bytearray(data[end + 1:])
+        return [line for line in lines if line.strip()]
+
+    def close(self) -> List[bytes]:
+        rest = bytes(self._buf).strip()
+        self._buf = bytearray()
+        return [rest] if rest else []
+
+
+def query_params(query: Query) -> Dict[str, str]:
+    return {'db': query.database, 'q': query.command, 'rp': query.retention_policy, 'epoch': query.precision.epoch()}
+
+
+def chunked_query_params(query: Query, chunk_size: int) -> Dict[str, str]:
+    if chunk_size <= 0:
+        raise ValueError("chunk size must be greater than 0")
+    if query.response_format != ResponseFormat.JSON:
+        raise ValueError("chunked queries support only the JSON response format")
+    return {**query_params(query), 'chunked': 'true', 'chunk_size': str(chunk_size)}
+
+
+def resolve_query_body(config: Config, resp: requests.Response) -> QueryResult:
+    return resolve_query_result(config.json_decoder(resp.content))
+
+
+def build_headers(config: Config, method: str, url_path: str, headers: Optional[dict] = None) -> dict:
+    if headers is None:
+        headers = {}
+
+    if config.gzip_enabled:
+        headers["Accept-Encoding"] = "gzip"
+
+    if not config.auth_config:
+        return headers
+
+    if url_path in UrlConst.no_auth_required:
+        if method in UrlConst.no_auth_required[url_path]:
+            return headers
+
+    if config.auth_config.auth_type == AuthType.PASSWORD:
+        encode_string = f"{config.auth_config.username}:{config.auth_config.password}"
+        authorization = "Basic " + base64.b64encode(encode_string.encode()).decode()
+        headers["Authorization"] = authorization
+
+    return headers
+
+
+def create_database_command(database: str, rp: Optional[RpConfig] = None) -> str:
+    if not database:
+        raise ValueError("empty database name")
+    query_string = f"CREATE DATABASE {database}"
+    if rp:
+        query_string += f" WITH DURATION {rp.duration} REPLICATION 1"
+        if rp.shard_group_duration:
+            query_string += f" SHARD DURATION {rp.shard_group_duration}"
+        if rp.index_duration:
+            query_string += f" INDEX DURATION {rp.index_duration}"
+        if rp.name:
+            query_string += f" NAME {rp.name}"
+    return query_string
+
+
+def drop_database_command(database: str) -> str:
+    if not database:
+        raise ValueError("empty database name")
+    return f"DROP DATABASE {database}"
+
+
+def create_retention_policy_command(dbname: str, rp_config: RpConfig, is_default: bool) -> str:
+    if not dbname:
+        raise ValueError("empty database name")
+    if not rp_config:
+        raise ValueError("rp_config is required")
+
+    query_string = (f"CREATE RETENTION POLICY {rp_config.name} ON {dbname} DURATION {rp_config.duration}"
+                    f" REPLICATION 1")
+    if rp_config.shard_group_duration:
+        query_string += f" SHARD DURATION {rp_config.shard_group_duration}"
+    if rp_config.index_duration:
+        query_string += f" INDEX DURATION {rp_config.index_duration}"
+    if is_default:
+        query_string += " DEFAULT"
+    return query_string
+
+
+def show_retention_policies_command(dbname: str) -> str:
+    if not dbname:
+        raise ValueError("empty database name")
+    return f"SHOW RETENTION POLICIES ON {dbname}"
+
+
+def drop_retention_policy_command(dbname: str, retention_policy: str) -> str:
+    if not dbname:
+        raise ValueError("empty database name")
+    if not retention_policy:
+        raise ValueError("empty retention policy name")
+    return f"DROP RETENTION POLICY {retention_policy} ON {dbname}"
+
+
+def create_measurement_command(measurement: Measurement) -> str:
+    if measurement is None:
+        raise ValueError("empty measurement")
+    measurement.check()
+    return measurement.to_string()
+
+
+def show_measurements_command(condition: MeasurementCondition) -> str:
+    if condition is None:
+        raise ValueError("empty measurement condition")
+    condition.check()
+    return condition.to_string()
+
+
+def drop_measurement_command(database: str, measurement: str) -> str:
+    if not database:
+        raise ValueError("empty database name")
+    if not measurement:
+        raise ValueError("empty measurement name")
+    return f"DROP MEASUREMENT {measurement}"
+
+
+def check_show_command(database: str, command: str):
+    if not database:
+        raise ValueError("empty database name")
+    if not command:
+        raise ValueError("empty query command")
+
+
+def resolve_databases(qr: QueryResult) -> List[str]:
+    if not qr.results or not qr.results[0].series:
+        return []
+    return [val[0] for val in qr.results[0].series[0].values if val]
+
+
+def resolve_retention_policies(qr: QueryResult) -> list:
+    if not qr.results or not qr.results[0].series:
+        return []
+    return [list(val) for val in qr.results[0].series[0].values if val]
+
+
+def resolve_values_any(query_results: QueryResult) -> List[ValuesResult]:
+    values_results = []
+    if len(query_results.results) == 0:
+        return values_results
+    for res in query_results.results[0].series:
+        values_result = ValuesResult(measurement=res.name, values=[])
+        for values in res.values:
+            for value in values:
+                values_result.values.append(value)
+        values_results.append(values_result)
+    return values_results
+
+
+def resolve_values_key_value(query_results: QueryResult) -> List[ValuesResult]:
+    values_results = []
+    if len(query_results.results) == 0:
+        return values_results
+    for res in query_results.results[0].series:
+        values_result = ValuesResult(measurement=res.name, values=[])
+        for values in res.values:
+            if len(values) < 2:
+                continue
+            values_result.values.append(KeyValue(name=values[0], value=values[1]))
+        values_results.append(values_result)
+    return values_results
+
+
+def resolve_measurements(result: QueryResult) -> List[str]:
+    if result.error is not None:
+        raise HTTPError(f"show_measurements error result, error: {result.error}")
+    measurements = []
+    if len(result.results) == 0 or len(result.results[0].series) == 0:
+        return measurements
+    if result.results[0].error is not None:
+        raise HTTPError(f"show_measurements error result, error: {result.results[0].error}")
+    for v in result.results[0].series[0].values:
+        if isinstance(v[0], str):
+            measurements.append(str(v[0]))
+    return measurements
+
+
+def resolve_series(values_result: List[ValuesResult]) -> List[str]:
+    series = []
+    if len(values_result) == 0:
+        return series
+    for value in values_result[0].values:
+        if isinstance(value, str):
+            series.append(value)
+    return series
+
+
+def gzip_stream(chunks: Iterable[bytes], level: int) -> Iterator[bytes]:
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def compress_body(config: Config, body, headers: dict):
+    """
+    gzip the request body when gzip is enabled and set Content-Encoding, iterables of chunks are
+    compressed lazily
+    """
+    if not config.gzip_enabled or body is None:
+        return body
+    if not isinstance(body, (bytes, bytearray)):
+        headers["Content-Encoding"] = "gzip"
+        return gzip_stream(body, config.gzip_level)
+    if len(body) >= config.gzip_min_size:
+        headers["Content-Encoding"] = "gzip"
+        return gzip.compress(body, compresslevel=config.gzip_level)
+    return body
+
+
+def line_protocol_bytes(body: Union[bytes, Callable[[], Iterable[bytes]]]) -> bytes:
+    return body if isinstance(body, bytes) else b''.join(body())
+
+
+def write_params(database: str, rp: str) -> Dict[str, str]:
+    params = {'db': database}
+    if rp:
+        params['rp'] = rp
+    return params
+
+
+def line_protocol_body(config: Config, batch_points: BatchPoints, series_keys: Optional[SeriesKeyCache] = None):
+    # a streamed body is serialized again by every attempt of the request
+    if config.gzip_enabled and config.gzip_streaming:
+        return functools.partial(iter_batch_points, batch_points, series_keys=series_keys)
+    return encode_batch_points(batch_points, series_keys)
+
+
+def parallel_workers(config: Config) -> int:
+    return config.parallel_write_config.max_workers or len(config.address)
+
+
+def split_batch_points(batch_points: BatchPoints, sub_batch_size: int,
+                       next_endpoint: Callable[[], str]) -> ParallelWriteResult:
+    """
+    cut batch_points into sub-batches of sub_batch_size points, each assigned to the next endpoint
+    """
+    points = [point for point in batch_points.points if point is not None]
+    result = ParallelWriteResult()
+    for index, start in enumerate(range(0, len(points), sub_batch_size)):
+        result.sub_batches.append(SubBatchResult(index=index, endpoint=next_endpoint(),
+                                                 batch_points=BatchPoints(points=points[start:start + sub_batch_size])))
+    return result
+
+
+class OpenGeminiDBClient(Client, ABC):  # pylint: disable=too-many-public-methods
 
     def __init__(self, config: Config):
         self.config = check_config(config)
@@ -112,92 +458,158 @@ class OpenGeminiDBClient(Client, ABC):
             self.session.cert = (config.tls_config.cert_file, config.tls_config.key_file)
             self.session.verify = config.tls_config.ca_file
         self.endpoints = [f"{protocol}{addr.host}:{addr.port}" for addr in config.address]
-        self.endpoints_iter = itertools.cycle(self.endpoints)
+        self.balancer = Balancer(self.endpoints, self.config.balancer_config)
         if self.config.grpc_config is not None:
             self.grpc_endpoints = [f"{addr.host}:{addr.port}" for addr in config.grpc_config.address]
-            self.grpc_endpoints_iter = itertools.cycle(self.grpc_endpoints)
+            self.grpc_balancer = Balancer(self.grpc_endpoints, self.config.balancer_config)
+            self.grpc_pool = grpc_client.ChannelPool(self.config.grpc_config)
+        self.batch_writer = None
+        if self.config.batch_config is not None:
+            self.batch_writer = BatchWriter(self.config.batch_config, self._send_batch)
+        if self.config.retry_config is None or self.config.retry_config.retryable_exceptions is None:
+            self.retryable_exceptions = (requests.ConnectionError, requests.Timeout)
+        else:
+            self.retryable_exceptions = self.config.retry_config.retryable_exceptions
+        self.query_latency = LatencyTracker(self.config.hedge_config.window if self.config.hedge_config else 1)
+        self.query_cache = new_query_cache(self.config.query_cache_config)
+        self.metadata_cache = new_metadata_cache(self.config.metadata_cache_config)
+        self.schemas = SchemaRegistry()
+        self.series_keys = new_series_key_cache(self.config.series_key_cache_config)
+        self.hedge_executor = None
+        if self.config.hedge_config is not None:
+            self.hedge_executor = ThreadPoolExecutor(max_workers=self.config.hedge_config.max_workers,
+                                                     thread_name_prefix="opengemini-hedged-query")
+        self.parallel_executor = None
+        if self.config.parallel_write_config is not None:
+            workers = parallel_workers(self.config)
+            adapter = HTTPAdapter(pool_maxsize=workers)
+            self.session.mount("http://", adapter)
+            self.session.mount("https://", adapter)
+            self.parallel_executor = ThreadPoolExecutor(max_workers=workers,
+                                                        thread_name_prefix="opengemini-parallel-write")
+        self.spool = new_spool(self.config.spool_config)
+        if self.spool is not None:
+            self.spool_stop = threading.Event()
+            self.spool_thread = threading.Thread(target=self._replay_spool, name="opengemini-spool-replay",
+                                                 daemon=True)
+            self.spool_thread.start()
 
     def close(self):
+        if self.batch_writer is not None:
+            self.batch_writer.close()
+        if self.parallel_executor is not None:
+            self.parallel_executor.shutdown()
+        if self.hedge_executor is not None:
+            self.hedge_executor.shutdown()
+        if self.spool is not None:
+            self.spool_stop.set()
+            self.spool_thread.join()
+            self.spool.close()
+        if self.config.grpc_config is not None:
+            self.grpc_pool.close()
         self.session.close()
 
     def __enter__(self):
         return self
 
     def __exit__(self, _exc_type, _exc_val, _exc_tb):
-        self.session.close()
+        self.close()
 
     def _get_server_url(self):
-        return next(self.endpoints_iter)
+        self._start_probes(self.balancer, self._probe_http)
+        return self.balancer.pick()
 
     def _get_grpc_server_url(self):
-        return next(self.grpc_endpoints_iter)
-
-    def _get_grpc_channel(self):
-        server_url = self._get_grpc_server_url()
-        if self.config.grpc_config.tls_enable is False:
-            return grpc.insecure_channel(server_url)
-
-        root_certificates = None
-        private_key = None
-        certificate_chain = None
-        if os.path.exists(self.config.grpc_config.tls_config.ca_file):
-            with open(self.config.grpc_config.tls_config.ca_file, 'rb') as fd:
-                root_certificates = fd.read()
-        if os.path.exists(self.config.grpc_config.tls_config.cert_file):
-            with open(self.config.grpc_config.tls_config.cert_file, 'rb') as fd:
-                certificate_chain = fd.read()
-        if os.path.exists(self.config.grpc_config.tls_config.key_file):
-            with open(self.config.grpc_config.tls_config.key_file, 'rb') as fd:
-                private_key = fd.read()
-        return grpc.secure_channel(
-            target=server_url,
-            credentials=grpc.ssl_channel_credentials(root_certificates, private_key, certificate_chain)
-        )
+        self._start_probes(self.grpc_balancer, self._probe_grpc)
+        return self.grpc_balancer.pick()
+
+    @staticmethod
+    def _start_probes(balancer: Balancer, probe: Callable[[str], None]):
+        for endpoint in balancer.take_probes():
+            threading.Thread(target=probe, args=(endpoint,), name="opengemini-probe", daemon=True).start()
+
+    def _probe_http(self, endpoint: str):
+        healthy = False
+        try:
+            resp = self.session.get(endpoint + UrlConst.PING, timeout=self.config.connection_timeout.seconds)
+            healthy = resp.status_code == HTTPStatus.NO_CONTENT
+        except requests.RequestException:
+            pass
+        finally:
+            self.balancer.probed(endpoint, healthy)
+
+    def _probe_grpc(self, endpoint: str):
+        healthy = False
+        try:
+            healthy = grpc_client.ping(self.grpc_pool.stub(endpoint), self.config.connection_timeout.seconds)
+        finally:
+            self.grpc_balancer.probed(endpoint, healthy)
+
+    def _call_grpc(self, call: Callable[[object], None]):
+        endpoint = self._get_grpc_server_url()
+        start = self.grpc_balancer.begin(endpoint)
+        healthy = False
+        try:
+            call(self.grpc_pool.stub(endpoint))
+            healthy = True
+        except HTTPError:
+            # the server answered with an error code, the endpoint itself is fine
+            healthy = True
+            raise
+        finally:
+            self.grpc_balancer.end(endpoint, start, healthy)
 
     def _update_headers(self, method, url_path, headers=None) -> dict:
-        if headers is None:
-            headers = {}
-
-        if not self.config.auth_config:
-            return headers
-
-        if url_path in UrlConst.no_auth_required:
-            if method in UrlConst.no_auth_required[url_path]:
-                return headers
-
-        if self.config.auth_config.auth_type == AuthType.PASSWORD:
-            encode_string = f"{self.config.auth_config.username}:{self.config.auth_config.password}"
-            authorization = "Basic " + base64.b64encode(encode_string.encode()).decode()
-            headers["Authorization"] = authorization
-
-        if self.config.gzip_enabled:
-            headers.update({"Content-Encoding": "gzip", "Accept-Encoding": "gzip"})
-
-        return headers
-
-    def _request(self, method, server_url, url_path, headers=None, body=None, params=None) -> requests.Response:
+        return build_headers(self.config, method, url_path, headers)
+
+    def _request(self, method, server_url, url_path, headers=None, body=None, params=None,
+                 failover: bool = True, stream: bool = False) -> requests.Response:
+        """
+        send the request, retrying by retry_config; body is bytes or a callable returning a fresh iterable
+        of chunks for every attempt
+        """
+        retry_config = self.config.retry_config
+        attempt = 1
+        while True:
+            try:
+                resp = self._send_request(method, server_url, url_path, headers, body, params, stream)
+                if 200 <= resp.status_code < 300:
+                    return resp
+                err = HTTPError(f"request error resp, code: {resp.status_code}, body: {resp.text}", response=resp)
+                retryable = is_retryable_status(retry_config, resp.status_code)
+            except self.retryable_exceptions as e:
+                err, retryable = e, True
+            if not retryable or not can_retry(retry_config, attempt):
+                raise err
+            time.sleep(backoff_delay(retry_config, attempt))
+            attempt += 1
+            if failover and retry_config.failover:
+                server_url = self._get_server_url()
+
+    def _send_request(self, method, server_url, url_path, headers=None, body=None, params=None,
+                      stream: bool = False) -> requests.Response:
         if params is None:
             params = {}
-        headers = self._update_headers(method, url_path, headers)
+        headers = self._update_headers(method, url_path, dict(headers) if headers else None)
         full_url = server_url + url_path
-        if self.config.gzip_enabled and body is not None:
-            compressed = io.BytesIO()
-            with gzip.GzipFile(compresslevel=9, fileobj=compressed, mode='w') as f:
-                f.write(body)
-                body = compressed.getvalue()
+        body = compress_body(self.config, body() if callable(body) else body, headers)
 
         req = requests.Request(method, full_url, data=body, headers=headers, params=params)
         prepared = req.prepare()
         timeout = (self.config.connection_timeout.seconds, self.config.timeout.seconds)
-        resp = self.session.send(prepared, timeout=timeout)
-        if not 200 <= resp.status_code < 300:
-            raise HTTPError(f"request error resp, code: {resp.status_code}, body: {resp.text}")
+        start = self.balancer.begin(server_url)
+        healthy = False
+        try:
+            resp = self.session.send(prepared, timeout=timeout, stream=stream)
+            healthy = resp.status_code < 500
+        finally:
+            self.balancer.end(server_url, start, healthy)
         return resp
 
     def _exec_http_request_by_index(self, idx, method, url_path, headers=None, body=None) -> requests.Response:
         if idx >= len(self.endpoints) or idx < 0:
             raise ValueError("openGeminiDB client error. Index out of range")
-        return self._request(method, self.endpoints[idx], url_path, headers, body)
+        return self._request(method, self.endpoints[idx], url_path, headers, body, failover=False)
 
     def ping(self, idx: int):
         resp = self._exec_http_request_by_index(idx, 'GET', UrlConst.PING)
@@ -205,187 +617,293 @@ class OpenGeminiDBClient(Client, ABC):
             raise HTTPError(f"ping error resp, code: {resp.status_code}, body: {resp.text}")
 
     def query(self, query: Query) -> QueryResult:
-        server_url = self._get_server_url()
-        params = {'db': query.database, 'q': query.command, 'rp': query.retention_policy,
-                  'epoch': query.precision.epoch()}
-
-        resp = self._request(method='GET', server_url=server_url, url_path=UrlConst.QUERY, params=params)
+        if self.query_cache is not None:
+            cached = self.query_cache.get(query)
+            if cached is not None:
+                return cached
+        params = query_params(query)
+        decode = body_decoder(self.config, query.response_format)
+        headers = {'Accept': query.response_format.value}
+
+        if self.hedge_executor is None:
+            resp = self._timed_query(self._get_server_url(), params, headers)
+        else:
+            resp = self._hedged_query(params, headers)
         if resp.status_code == HTTPStatus.OK:
-            return resolve_query_body(resp)
+            qr = resolve_query_result(decode(resp.content))
+            qr.precision = query.precision
+            if self.query_cache is not None:
+                self.query_cache.put(query, qr, len(resp.content))
+            return qr
         raise HTTPError(f"query error resp, code: {resp.status_code}, body: {resp.text}")
 
+    def query_iter(self, query: Query, chunk_size: int = 10000) -> Iterator[Series]:
+        params = chunked_query_params(query, chunk_size)
+        resp = self._request(method='GET', server_url=self._get_server_url(), url_path=UrlConst.QUERY, params=params,
+                             stream=True)
+        with resp:
+            splitter = JsonLineSplitter()
+            for data in resp.iter_content(chunk_size=64 * 1024):
+                for line in splitter.feed(data):
+                    yield from resolve_query_chunk(self.config.json_decoder(line))
+            for line in splitter.close():
+                yield from resolve_query_chunk(self.config.json_decoder(line))
+
+    def _timed_query(self, server_url: str, params: dict, headers: dict) -> requests.Response:
+        start = time.monotonic()
+        resp = self._request(method='GET', server_url=server_url, url_path=UrlConst.QUERY, headers=headers,
+                             params=params)
+        self.query_latency.record(time.monotonic() - start)
+        return resp
+
+    def _hedged_query(self, params: dict, headers: dict) -> requests.Response:
+        server_url = self._get_server_url()
+        primary = self.hedge_executor.submit(self._timed_query, server_url, params, headers)
+        try:
+            return primary.result(timeout=hedge_delay(self.config.hedge_config, self.query_latency))
+        except FuturesTimeoutError:
+            pass
+        hedge = self.hedge_executor.submit(self._timed_query, self.balancer.pick_other(server_url), params,
+                                           headers)
+        done, _ = wait([primary, hedge], return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                return future.result()
+        # the first answer is an error, the other request may still succeed
+        return (hedge if primary in done else primary).result()
+
     def _query_post(self, query: Query) -> QueryResult:
         server_url = self._get_server_url()
         params = {'db': query.database, 'q': query.command, 'rp': query.retention_policy}
 
         resp = self._request(method='POST', server_url=server_url, url_path=UrlConst.QUERY, params=params)
         if resp.status_code == HTTPStatus.OK:
-            return resolve_query_body(resp)
+            return resolve_query_body(self.config, resp)
         raise HTTPError(f"query_post error resp, code: {resp.status_code}, body: {resp.text}")
 
-    def write_batch_points(self, database: str, batch_points: BatchPoints):
-        server_url = self._get_server_url()
-        params = {'db': database}
-        with io.StringIO() as writer:
-            for point in batch_points.points:
-                if point is None:
-                    continue
-                writer.write(point.to_string())
-                writer.write('\n')
-            body = writer.getvalue().encode()
-        resp = self._request(method="POST", server_url=server_url, url_path=UrlConst.WRITE, params=params, body=body)
+    def _write_line_protocol(self, database: str, rp: str, body: bytes, operation: str, server_url: str = None):
+        if server_url is None:
+            server_url = self._get_server_url()
+        resp = self._request(method="POST", server_url=server_url, url_path=UrlConst.WRITE,
+                             params=write_params(database, rp), body=body)
         if resp.status_code == HTTPStatus.NO_CONTENT:
             return
-        raise HTTPError(f"write_batch_points error resp, code: {resp.status_code}, body: {resp.text}")
+        raise HTTPError(f"{operation} error resp, code: {resp.status_code}, body: {resp.text}")
 
-    def write_by_grpc(self, database: str, batch_points: BatchPoints, rp: str = ''):
-        username = ''
-        password = ''
-        if self.config.grpc_config.auth_config is not None:
-            username = self.config.grpc_config.auth_config.username
-            password = self.config.grpc_config.auth_config.password
-
-        # send grpc request
-        channel = self._get_grpc_channel()
-        grpc_client.write(
-            channel=channel,
+    def write_batch_points(self, database: str, batch_points: BatchPoints, rp: str = ''):
+        body = line_protocol_body(self.config, batch_points, self.series_keys)
+        with invalidating(self.query_cache, database, batch_measurements(batch_points)):
+            self._write_or_spool(
+                lambda: SpoolEntry(SpoolKind.LINE_PROTOCOL, database, rp, line_protocol_bytes(body)),
+                lambda: self._write_line_protocol(database, rp, body, "write_batch_points"))
+
+    def write_batch_points_parallel(self, database: str, batch_points: BatchPoints,
+                                    rp: str = '') -> ParallelWriteResult:
+        if not database:
+            raise ValueError("empty database name")
+        if self.parallel_executor is None:
+            raise ValueError("parallel write requires parallel_write_config")
+        result = split_batch_points(batch_points, self.config.parallel_write_config.sub_batch_size,
+                                    self._get_server_url)
+        with invalidating(self.query_cache, database, batch_measurements(batch_points)):
+            futures = [self.parallel_executor.submit(self._write_sub_batch, database, rp, sub)
+                       for sub in result.sub_batches]
+            wait(futures)
+        return result
+
+    def _write_sub_batch(self, database: str, rp: str, sub: SubBatchResult):
+        try:
+            body = line_protocol_body(self.config, sub.batch_points, self.series_keys)
+            self._write_line_protocol(database, rp, body, "write_batch_points_parallel", sub.endpoint)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            sub.error = e
+
+    def write_columns(self, database: str, measurement: str, tags: Dict[str, Union[str, ColumnValues]],
+                      fields: Dict[str, ColumnValues], timestamps: ColumnValues,
+                      precision: Precision = Precision.PrecisionNanoSecond, rp: str = ''):
+        if not database:
+            raise ValueError("empty database name")
+        body = encode_columns(measurement, tags, fields, timestamps, precision)
+        with invalidating(self.query_cache, database, [measurement]):
+            self._write_or_spool(lambda: SpoolEntry(SpoolKind.LINE_PROTOCOL, database, rp, body),
+                                 lambda: self._write_line_protocol(database, rp, body, "write_columns"))
+
+    def register_schema(self, measurement: Measurement,
+                        precision: Precision = Precision.PrecisionNanoSecond) -> SchemaWriter:
+        return self.schemas.register(measurement, precision)
+
+    def write_rows(self, writer: SchemaWriter, rows: Iterable[SchemaRow]):
+        database, rp = writer.measurement.database, writer.measurement.retention_policy
+        if not database:
+            raise ValueError("empty database name")
+        body = writer.encode(rows)
+        with invalidating(self.query_cache, database, [writer.measurement.measurement]):
+            self._write_or_spool(lambda: SpoolEntry(SpoolKind.LINE_PROTOCOL, database, rp, body),
+                                 lambda: self._write_line_protocol(database, rp, body, "write_rows"))
+
+    def write_rows_by_grpc(self, writer: SchemaWriter, rows: Iterable[SchemaRow]):
+        database = writer.measurement.database
+        if not database:
+            raise ValueError("empty database name")
+        with invalidating(self.query_cache, database, [writer.measurement.measurement]):
+            self._write_records_or_spool(database, writer.to_records(rows, self.config.grpc_config.compress_method),
+                                         writer.measurement.retention_policy)
+
+    def _send_batch(self, database: str, rp: str, batch_points: BatchPoints):
+        self.write_batch_points(database, batch_points, rp)
+
+    def write_point(self, database: str, point: Point, callback: Optional[WriteCallback] = None, rp: str = ''):
+        self.write_points(database, [point], callback, rp)
+
+    def write_points(self, database: str, points: List[Point], callback: Optional[WriteCallback] = None,
+                     rp: str = ''):
+        if not database:
+            raise ValueError("empty database name")
+        if self.batch_writer is not None:
+            self.batch_writer.write(database, rp, points, callback)
+            return
+        try:
+            self.write_batch_points(database, BatchPoints(points=points), rp)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            if callback is None:
+                raise
+            callback(e)
+            return
+        if callback is not None:
+            callback(None)
+
+    def flush(self):
+        if self.batch_writer is not None:
+            self.batch_writer.flush()
+
+    def _grpc_user(self):
+        if self.config.grpc_config.auth_config is None:
+            return '', ''
+        return self.config.grpc_config.auth_config.username, self.config.grpc_config.auth_config.password
+
+    def _write_records(self, database: str, records: list, rp: str):
+        username, password = self._grpc_user()
+        self._call_grpc(lambda stub: grpc_client.write_records(
+            stub=stub,
             database=database,
-            batch_points=batch_points,
+            records=records,
             rp=rp,
             username=username,
             password=password,
             timeout=self.config.timeout.seconds,
-        )
+        ))
 
-    def create_database(self, database: str, rp: RpConfig = None):
+    def _write_records_or_spool(self, database: str, records: list, rp: str):
+        self._write_or_spool(lambda: records_entry(database, rp, records),
+                             lambda: self._write_records(database, records, rp))
+
+    def write_by_grpc(self, database: str, batch_points: BatchPoints, rp: str = ''):
+        with invalidating(self.query_cache, database, batch_measurements(batch_points)):
+            self._write_records_or_spool(
+                database, grpc_client.points_to_records(batch_points, self.config.grpc_config.compress_method), rp)
+
+    def write_columns_by_grpc(self, database: str, measurement: str, tags: Dict[str, Union[str, ColumnValues]],
+                              fields: Dict[str, ColumnValues], timestamps: ColumnValues,
+                              precision: Precision = Precision.PrecisionNanoSecond, rp: str = ''):
         if not database:
             raise ValueError("empty database name")
-        query_string = f"CREATE DATABASE {database}"
-        if rp:
-            query_string += f" WITH DURATION {rp.duration} REPLICATION 1"
-            if rp.shard_group_duration:
-                query_string += f" SHARD DURATION {rp.shard_group_duration}"
-            if rp.index_duration:
-                query_string += f" INDEX DURATION {rp.index_duration}"
-            if rp.name:
-                query_string += f" NAME {rp.name}"
-        return self._query_post(Query(database=database, command=query_string, retention_policy=''))
+        with invalidating(self.query_cache, database, [measurement]):
+            self._write_records_or_spool(database, grpc_client.columns_to_records(
+                measurement, tags, fields, timestamps, precision, self.config.grpc_config.compress_method), rp)
+
+    def _write_or_spool(self, entry: Callable[[], SpoolEntry], send: Callable[[], None]):
+        """
+        send the batch, or append it to the spool when the cluster is unreachable or batches are already
+        spooled, which keeps them in order
+        """
+        if self.spool is not None and not self.spool.empty():
+            append_or_raise(self.spool, entry(), None)
+            return
+        try:
+            send()
+        except (*UNREACHABLE_ERRORS, grpc.RpcError) as e:
+            if not spools(self.spool, e):
+                raise
+            append_or_raise(self.spool, entry(), e)
+
+    def _replay_spool(self):
+        interval = self.config.spool_config.replay_interval.total_seconds()
+        while not self.spool_stop.wait(interval):
+            if not self.spool.empty() and self._cluster_up():
+                self.spool.replay(self._send_spooled, self.spool_stop.is_set)
+
+    def _cluster_up(self) -> bool:
+        try:
+            resp = self._send_request('GET', self._get_server_url(), UrlConst.PING)
+        except requests.RequestException:
+            return False
+        return resp.status_code == HTTPStatus.NO_CONTENT
+
+    def _send_spooled(self, entry: SpoolEntry):
+        if entry.kind == SpoolKind.RECORDS:
+            self._write_records(entry.database, grpc_client.unmarshal_records(entry.payload), entry.rp)
+        else:
+            self._write_line_protocol(entry.database, entry.rp, entry.payload, "spool replay")
+
+    def _metadata_query(self, database: str, command: str) -> QueryResult:
+        qr = None if self.metadata_cache is None else self.metadata_cache.get(database, command)
+        if qr is None:
+            qr = self.query(Query(database=database, command=command, retention_policy=''))
+            if self.metadata_cache is not None:
+                self.metadata_cache.put(database, command, qr)
+        return qr
+
+    def create_database(self, database: str, rp: RpConfig = None):
+        query_string = create_database_command(database, rp)
+        with invalidating_metadata(self.metadata_cache, database, DATABASE_LIST):
+            return self._query_post(Query(database=database, command=query_string, retention_policy=''))
 
     def show_databases(self) -> List[str]:
         query_string = "SHOW DATABASES"
-        qr = self.query(Query(database='', command=query_string, retention_policy=''))
-        if not qr.results or not qr.results[0].series:
-            return []
-        return [val[0] for val in qr.results[0].series[0].values if val]
+        return resolve_databases(self._metadata_query(DATABASE_LIST, query_string))
 
     def drop_database(self, database: str):
-        if not database:
-            raise ValueError("empty database name")
-        query_string = f"DROP DATABASE {database}"
-        return self._query_post(Query(database=database, command=query_string, retention_policy=''))
+        query_string = drop_database_command(database)
+        with invalidating_metadata(self.metadata_cache, database, DATABASE_LIST):
+            return self._query_post(Query(database=database, command=query_string, retention_policy=''))
 
     def create_retention_policy(self, dbname, rp_config: RpConfig, is_default: bool):
-        if not dbname:
-            raise ValueError("empty database name")
-        if not rp_config:
-            raise ValueError("rp_config is required")
-
-        query_string = (f"CREATE RETENTION POLICY {rp_config.name} ON {dbname} DURATION {rp_config.duration}"
-                        f" REPLICATION 1")
-        if rp_config.shard_group_duration:
-            query_string += f" SHARD DURATION {rp_config.shard_group_duration}"
-        if rp_config.index_duration:
-            query_string += f" INDEX DURATION {rp_config.index_duration}"
-        if is_default:
-            query_string += " DEFAULT"
-
-        return self._query_post(Query(database=dbname, command=query_string, retention_policy=''))
+        query_string = create_retention_policy_command(dbname, rp_config, is_default)
+        with invalidating_metadata(self.metadata_cache, dbname):
+            return self._query_post(Query(database=dbname, command=query_string, retention_policy=''))
 
     def show_retention_policies(self, dbname: str):
-        if not dbname:
-            raise ValueError("empty database name")
-
-        query_string = f"SHOW RETENTION POLICIES ON {dbname}"
-        qr = self.query(Query(database=dbname, command=query_string, retention_policy=''))
-        if not qr.results or not qr.results[0].series:
-            return []
-        return [val for val in qr.results[0].series[0].values if val]
+        query_string = show_retention_policies_command(dbname)
+        return resolve_retention_policies(self._metadata_query(dbname, query_string))
 
     def drop_retention_policy(self, dbname, retention_policy: str):
-        if not dbname:
-            raise ValueError("empty database name")
-        if not retention_policy:
-            raise ValueError("empty retention policy name")
-
-        query_string = f"DROP RETENTION POLICY {retention_policy} ON {dbname}"
-        return self._query_post(Query(database=dbname, command=query_string, retention_policy=retention_policy))
+        query_string = drop_retention_policy_command(dbname, retention_policy)
+        with invalidating_metadata(self.metadata_cache, dbname):
+            return self._query_post(Query(database=dbname, command=query_string, retention_policy=retention_policy))
 
     def _show_query_result(self, database, command: str) -> QueryResult:
-        if not database:
-            raise ValueError("empty database name")
-        if not command:
-            raise ValueError("empty query command")
-        return self.query(query=Query(database=database, command=command, retention_policy=''))
+        check_show_command(database, command)
+        return self._metadata_query(database, command)
 
     def _show_with_result_any(self, database, command: str) -> List[ValuesResult]:
-        values_results = []
-        query_results = self._show_query_result(database, command)
-        if len(query_results.results) == 0:
-            return values_results
-        for res in query_results.results[0].series:
-            values_result = ValuesResult(measurement=res.name, values=[])
-            for values in res.values:
-                for value in values:
-                    values_result.values.append(value)
-            values_results.append(values_result)
-        return values_results
+        return resolve_values_any(self._show_query_result(database, command))
 
     def _show_with_result_key_value(self, database, command: str) -> List[ValuesResult]:
-        values_results = []
-        query_results = self._show_query_result(database, command)
-        if len(query_results.results) == 0:
-            return values_results
-        for res in query_results.results[0].series:
-            values_result = ValuesResult(measurement=res.name, values=[])
-            for values in res.values:
-                if len(values) < 2:
-                    continue
-                values_result.values.append(KeyValue(name=values[0], value=values[1]))
-            values_results.append(values_result)
-        return values_results
+        return resolve_values_key_value(self._show_query_result(database, command))
 
     def create_measurement(self, measurement: Measurement):
-        if measurement is None:
-            raise ValueError("empty measurement")
-        measurement.check()
-        command = measurement.to_string()
-        return self._query_post(Query(database=measurement.database, command=command, retention_policy=''))
+        command = create_measurement_command(measurement)
+        with invalidating_metadata(self.metadata_cache, measurement.database):
+            return self._query_post(Query(database=measurement.database, command=command, retention_policy=''))
 
     def show_measurements(self, condition: MeasurementCondition) -> List[str]:
-        if condition is None:
-            raise ValueError("empty measurement condition")
-        condition.check()
-        command = condition.to_string()
-        result = self.query(Query(database=condition.database, command=command, retention_policy=''))
-        if result.error is not None:
-            raise HTTPError(f"show_measurements error result, error: {result.error}")
-        measurements = []
-        if len(result.results) == 0 or len(result.results[0].series) == 0:
-            return measurements
-        if result.results[0].error is not None:
-            raise HTTPError(f"show_measurements error result, error: {result.results[0].error}")
-        for v in result.results[0].series[0].values:
-            if isinstance(v[0], str):
-                measurements.append(str(v[0]))
-        return measurements
+        command = show_measurements_command(condition)
+        return resolve_measurements(self._metadata_query(condition.database, command))
 
     def drop_measurement(self, database: str, retention_policy: str, measurement: str):
-        if not database:
-            raise ValueError("empty database name")
-        if not measurement:
-            raise ValueError("empty measurement name")
-        command = f"DROP MEASUREMENT {measurement}"
-        return self._query_post(Query(database=database, command=command, retention_policy=retention_policy))
+        command = drop_measurement_command(database, measurement)
+        with invalidating_metadata(self.metadata_cache, database):
+            return self._query_post(Query(database=database, command=command, retention_policy=retention_policy))
 
     def show_tag_keys(self, database, command: str) -> List[ValuesResult]:
         return self._show_with_result_any(database, command)
@@ -397,11 +915,4 @@ class OpenGeminiDBClient(Client, ABC):
         return self._show_with_result_key_value(database, command)
 
     def show_series(self, database, command: str) -> List[str]:
-        values_result = self._show_with_result_any(database, command)
-        series = []
-        if len(values_result) == 0:
-            return series
-        for value in values_result[0].values:
-            if isinstance(value, str):
-                series.append(value)
-        return series
+        return resolve_series(self._show_with_result_any(database, command))
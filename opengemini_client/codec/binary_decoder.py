@@ -14,54 +14,60 @@
 
 import struct
 from dataclasses import dataclass
-from typing import List
+from typing import List, Union
 import numpy
 from opengemini_client.codec.size import size_of_int64, size_of_uint16, size_of_uint32
 
+Buffer = Union[bytes, memoryview]
+
+_Int64 = struct.Struct('>Q')
+_Uint16 = struct.Struct('>H')
+_Uint32 = struct.Struct('>I')
+
 
 @dataclass
 class BinaryDecoder:
-    buf: 'bytes' = b''
+    # bytes slices are copied, memoryview slices share the underlying buffer
+    buf: Buffer = b''
     offset: int = 0
 
     def int64(self) -> int:
-        u = self.buf[self.offset:self.offset + size_of_int64()]
-        v = u[7] | u[6] << 8 | u[5] << 16 | u[4] << 24 | u[3] << 32 | u[2] << 40 | u[1] << 48 | u[0] << 56
-        v = (numpy.int64(v) >> 1) ^ ((numpy.int64(v) << 63) >> 63)
+        (v,) = _Int64.unpack_from(self.buf, self.offset)
         self.offset += size_of_int64()
-        return int(v)
+        return (v >> 1) ^ -(v & 1)
 
     def uint16(self) -> int:
-        u = self.buf[self.offset:self.offset + size_of_uint16()]
-        v = u[1] | u[0] << 8
+        (v,) = _Uint16.unpack_from(self.buf, self.offset)
         self.offset += size_of_uint16()
-        return int(v)
+        return v
 
     def uint32(self) -> int:
-        u = self.buf[self.offset:self.offset + size_of_uint32()]
-        v = u[3] | u[2] << 8 | u[1] << 16 | u[0] << 24
+        (v,) = _Uint32.unpack_from(self.buf, self.offset)
         self.offset += size_of_uint32()
-        return int(v)
+        return v
 
     def string(self) -> str:
         length = self.uint16()
-        v = self.buf[self.offset:self.offset + length].decode("utf-8")
+        v = str(self.buf[self.offset:self.offset + length], "utf-8")
         self.offset += length
         return v
 
-    def bytes(self) -> bytes:
+    def bytes(self) -> Buffer:
         length = self.uint32()
         if length == 0:
-            return b''
+            return self.buf[0:0]
         v = self.buf[self.offset:self.offset + length]
         self.offset += length
         return v
 
-    def uint32_list(self) -> List[int]:
+    def uint32_array(self) -> numpy.ndarray:
+        """
+        read a uint32 list as a little-endian array that shares memory with buf
+        """
         length = self.uint32()
-        if length == 0:
-            return []
-        length1 = length * size_of_uint32()
-        v = struct.unpack('<' + 'I ' * length, self.buf[self.offset:self.offset + length1])
-        self.offset += length1
-        return [int(i) for i in v]
+        v = numpy.frombuffer(self.buf, dtype='<u4', count=length, offset=self.offset)
+        self.offset += length * size_of_uint32()
+        return v
+
+    def uint32_list(self) -> List[int]:
+        return self.uint32_array().tolist()
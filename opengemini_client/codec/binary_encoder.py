@@ -16,30 +16,31 @@ import struct
 from typing import List
 import numpy
 
+_Int64 = struct.Struct('>Q')
+_Uint16 = struct.Struct('>H')
+_Uint32 = struct.Struct('>I')
+
+
+def _zigzag(v: int) -> int:
+    return ((v << 1) ^ (v >> 63)) & 0xFFFFFFFFFFFFFFFF
+
 
 def append_int64(b: bytes, v: int) -> bytes:
-    v = (numpy.int64(v) << 1) ^ (v >> 63)
-    v = numpy.uint64(v)
-    u = [numpy.uint8(v >> 56), numpy.uint8(v >> 48), numpy.uint8(v >> 40), numpy.uint8(v >> 32), numpy.uint8(v >> 24),
-         numpy.uint8(v >> 16), numpy.uint8(v >> 8), numpy.uint8(v)]
-    return b + bytes(u)
+    return b + _Int64.pack(_zigzag(int(v)))
 
 
 def append_uint16(b: bytes, v: int) -> bytes:
-    v = numpy.uint16(v)
-    u = [numpy.uint8(v >> 8), numpy.uint8(v)]
-    return b + bytes(u)
+    return b + _Uint16.pack(v & 0xFFFF)
 
 
 def append_uint32(b: bytes, v: int) -> bytes:
-    v = numpy.uint32(v)
-    u = [numpy.uint8(v >> 24), numpy.uint8(v >> 16), numpy.uint8(v >> 8), numpy.uint8(v)]
-    return b + bytes(u)
+    return b + _Uint32.pack(v & 0xFFFFFFFF)
 
 
 def append_string(b: bytes, v: str) -> bytes:
-    b = append_uint16(b, len(v))
-    return b + v.encode("utf-8")
+    data = v.encode("utf-8")
+    b = append_uint16(b, len(data))
+    return b + data
 
 
 def append_bytes(b: bytes, v: bytes) -> bytes:
@@ -51,5 +52,47 @@ def append_uint32_list(b: bytes, v: List[int]) -> bytes:
     b = append_uint32(b, len(v))
     if len(v) == 0:
         return b
-    byte_data = struct.pack('<' + 'I ' * len(v), *v)
-    return b + byte_data
+    return b + numpy.asarray(v, dtype='<u4').tobytes()
+
+
+# the put_* functions write into a preallocated buffer at offset and return the offset after the written value
+
+
+def put_int64(buf: bytearray, offset: int, v: int) -> int:
+    _Int64.pack_into(buf, offset, _zigzag(int(v)))
+    return offset + 8
+
+
+def put_uint16(buf: bytearray, offset: int, v: int) -> int:
+    _Uint16.pack_into(buf, offset, v & 0xFFFF)
+    return offset + 2
+
+
+def put_uint32(buf: bytearray, offset: int, v: int) -> int:
+    _Uint32.pack_into(buf, offset, v & 0xFFFFFFFF)
+    return offset + 4
+
+
+def put_raw(buf: bytearray, offset: int, v: bytes) -> int:
+    end = offset + len(v)
+    buf[offset:end] = v
+    return end
+
+
+def put_string(buf: bytearray, offset: int, v: str) -> int:
+    data = v.encode("utf-8")
+    offset = put_uint16(buf, offset, len(data))
+    return put_raw(buf, offset, data)
+
+
+def put_bytes(buf: bytearray, offset: int, v: bytes) -> int:
+    offset = put_uint32(buf, offset, len(v))
+    return put_raw(buf, offset, v)
+
+
+def put_uint32_list(buf: bytearray, offset: int, v: List[int]) -> int:
+    offset = put_uint32(buf, offset, len(v))
+    if len(v) == 0:
+        return offset
+    numpy.frombuffer(buf, dtype='<u4', count=len(v), offset=offset)[:] = v
+    return offset + 4 * len(v)
@@ -0,0 +1,86 @@
+# Copyright 2025 openGemini Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+record block compression, every codec is an optional dependency detected at import time:
+LZ4_FAST needs lz4, ZSTD_FAST needs zstandard and SNAPPY needs python-snappy
+"""
+from typing import List
+
+from opengemini_client.models import CompressMethod
+
+try:
+    import lz4.frame as _lz4
+except ImportError:
+    _lz4 = None
+
+try:
+    import zstandard as _zstd
+except ImportError:
+    _zstd = None
+
+try:
+    import snappy as _snappy
+except ImportError:
+    _snappy = None
+
+_modules = {
+    CompressMethod.LZ4_FAST: (_lz4, 'lz4'),
+    CompressMethod.ZSTD_FAST: (_zstd, 'zstandard'),
+    CompressMethod.SNAPPY: (_snappy, 'python-snappy'),
+}
+
+# fastest levels, record blocks are compressed on the write path
+_Lz4Level = 0
+_ZstdLevel = 1
+
+
+def is_available(method: CompressMethod) -> bool:
+    if method == CompressMethod.UNCOMPRESSED:
+        return True
+    return _modules[method][0] is not None
+
+
+def available_methods() -> List[CompressMethod]:
+    return [method for method in CompressMethod if is_available(method)]
+
+
+def check_available(method: CompressMethod):
+    if not is_available(method):
+        raise ValueError(f"compress method {method.name} requires the {_modules[method][1]} package")
+
+
+def compress_block(method: CompressMethod, data: bytes) -> bytes:
+    """
+    compress a marshaled record block, LZ4 and ZSTD produce self-describing frames and SNAPPY a raw block
+    """
+    if method == CompressMethod.UNCOMPRESSED:
+        return data
+    check_available(method)
+    if method == CompressMethod.LZ4_FAST:
+        return _lz4.compress(data, compression_level=_Lz4Level)
+    if method == CompressMethod.ZSTD_FAST:
+        return _zstd.ZstdCompressor(level=_ZstdLevel).compress(data)
+    return _snappy.compress(data)
+
+
+def decompress_block(method: CompressMethod, data: bytes) -> bytes:
+    if method == CompressMethod.UNCOMPRESSED:
+        return data
+    check_available(method)
+    if method == CompressMethod.LZ4_FAST:
+        return _lz4.decompress(data)
+    if method == CompressMethod.ZSTD_FAST:
+        return _zstd.ZstdDecompressor().decompress(data)
+    return _snappy.decompress(data)
@@ -0,0 +1,50 @@
+# Copyright 2025 openGemini Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import numpy
+
+from opengemini_client.codec import compress
+from opengemini_client.columns import columns_to_record
+from opengemini_client.models import CompressMethod
+
+
+class CompressTest(unittest.TestCase):
+
+    def setUp(self):
+        record, _, _ = columns_to_record('cpu', {'host': 'server01'},
+                                         {'usage': numpy.linspace(0, 100, 1000), 'count': numpy.arange(1000)},
+                                         numpy.arange(1000) * 10 ** 9)
+        self.block = record.marshal(b'')
+
+    def test_round_trip(self):
+        for method in compress.available_methods():
+            with self.subTest(method=method):
+                compressed = compress.compress_block(method, self.block)
+                self.assertEqual(self.block, compress.decompress_block(method, compressed))
+                if method != CompressMethod.UNCOMPRESSED:
+                    self.assertLess(len(compressed), len(self.block))
+
+    def test_unavailable_method(self):
+        for method in CompressMethod:
+            if compress.is_available(method):
+                continue
+            with self.subTest(method=method):
+                with self.assertRaises(ValueError):
+                    compress.compress_block(method, self.block)
+
+    def test_uncompressed_always_available(self):
+        self.assertIn(CompressMethod.UNCOMPRESSED, compress.available_methods())
+        self.assertIs(self.block, compress.compress_block(CompressMethod.UNCOMPRESSED, self.block))
@@ -0,0 +1,49 @@
+# Copyright 2025 openGemini Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+json decoding of query responses, orjson or ujson are used when installed and the standard library otherwise
+"""
+import json
+from typing import Any, Callable, Dict, Union
+
+try:
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
+try:
+    import ujson as _ujson
+except ImportError:
+    _ujson = None
+
+# takes a whole response body or one line of a chunked response, raises ValueError on invalid documents
+JsonDecoder = Callable[[Union[bytes, str]], Any]
+
+
+def available_decoders() -> Dict[str, JsonDecoder]:
+    """
+    the installed decoders by package name, fastest first
+    """
+    decoders = {}
+    if _orjson is not None:
+        decoders['orjson'] = _orjson.loads  # pylint: disable=no-member
+    if _ujson is not None:
+        decoders['ujson'] = _ujson.loads
+    decoders['json'] = json.loads
+    return decoders
+
+
+def default_decoder() -> JsonDecoder:
+    return next(iter(available_decoders().values()))
@@ -0,0 +1,61 @@
+# Copyright 2025 openGemini Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import unittest
+from http import HTTPStatus
+
+from opengemini_client import client_impl, models, test_utils
+from opengemini_client.codec import json_decode
+from opengemini_client.measurement import MeasurementCondition
+
+_body = json.dumps({'results': [{'statement_id': 0, 'series': [
+    {'name': 'measurements', 'columns': ['name'], 'values': [['cpu'], ['mem']]}]}]}).encode()
+
+
+class JsonDecodeTest(unittest.TestCase):
+
+    def test_decoders_agree(self):
+        doc = {'results': [{'statement_id': 0, 'series': [
+            {'name': 'cpu', 'tags': {'host': 'hé"1'}, 'columns': ['time', 'value', 'ok'],
+             'values': [[1700000000000000000, 0.1, True], [-(2 ** 63), None, False]]}]}]}
+        encoded = json.dumps(doc).encode()
+        decoders = json_decode.available_decoders()
+        self.assertIn('json', decoders)
+        for name, decoder in decoders.items():
+            with self.subTest(decoder=name):
+                self.assertEqual(doc, decoder(encoded))
+                self.assertEqual(doc, decoder(encoded.decode()))
+                with self.assertRaises(ValueError):
+                    decoder(b'{"results": [')
+
+    def test_default_decoder(self):
+        self.assertIs(next(iter(json_decode.available_decoders().values())), json_decode.default_decoder())
+        cfg = models.Config(address=[models.Address(host='127.0.0.1', port=8086)])
+        client_impl.check_config(cfg)
+        self.assertIs(json_decode.default_decoder(), cfg.json_decoder)
+
+    def test_config_decoder_is_used(self):
+        decoded = []
+
+        def decoder(data):
+            decoded.append(data)
+            return json.loads(data)
+
+        with test_utils.StubServer(lambda _: test_utils.StubResponse(status=HTTPStatus.OK, body=_body)) as server:
+            with client_impl.OpenGeminiDBClient(models.Config(address=[server.address], json_decoder=decoder)) as cli:
+                self.assertEqual(['cpu', 'mem'], cli.show_measurements(MeasurementCondition(database='db0')))
+                qr = cli.query(models.Query(database='db0', command='show measurements', retention_policy=''))
+        self.assertEqual([['cpu'], ['mem']], qr.results[0].series[0].values)
+        self.assertEqual([_body, _body], decoded)
@@ -0,0 +1,131 @@
+# Copyright 2025 openGemini Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+decoding of the query response formats into the document shape of the json response, the msgpack format
+needs the msgpack package
+"""
+import csv
+import io
+import re
+from typing import Any, Callable, Dict, List, Optional
+
+from opengemini_client.models import Config, ResponseFormat
+
+try:
+    import msgpack as _msgpack
+except ImportError:
+    _msgpack = None
+
+_int_value = re.compile(r'-?\d+')
+_float_value = re.compile(r'-?(\d+\.\d*|\.\d+|\d+)([eE][-+]?\d+)?')
+# spellings of the non-finite floats, decoded to float like the json and msgpack formats do
+_special_floats = {'NaN': float('nan'), 'Inf': float('inf'), '+Inf': float('inf'), '-Inf': float('-inf')}
+
+
+def is_available(response_format: ResponseFormat) -> bool:
+    return response_format != ResponseFormat.MSGPACK or _msgpack is not None
+
+
+def check_available(response_format: ResponseFormat):
+    if not is_available(response_format):
+        raise ValueError(f"response format {response_format.name} requires the msgpack package")
+
+
+def body_decoder(config: Config, response_format: ResponseFormat) -> Callable[[bytes], dict]:
+    check_available(response_format)
+    if response_format == ResponseFormat.MSGPACK:
+        return decode_msgpack
+    if response_format == ResponseFormat.CSV:
+        return decode_csv
+    return config.json_decoder
+
+
+def decode_msgpack(body: bytes) -> dict:
+    return _msgpack.unpackb(body, raw=False, strict_map_key=False)
+
+
+def _csv_value(value: str) -> Any:
+    # the csv format drops types: empty cells are nulls and a string that looks like a number reads as one
+    if value == '':
+        return None
+    if value == 'true':
+        return True
+    if value == 'false':
+        return False
+    if _int_value.fullmatch(value):
+        return int(value)
+    if _float_value.fullmatch(value):
+        return float(value)
+    return _special_floats.get(value, value)
+
+
+def _csv_tags(value: str) -> Dict[str, str]:
+    """
+    parse the series key form of the tags column, k1=v1,k2=v2 with ',', '=' and ' ' escaped by a backslash
+    """
+    tags = {}
+    key, current, escaped = None, [], False
+    for char in value:
+        if escaped:
+            if char not in ',= ':
+                current.append('\\')
+            current.append(char)
+            escaped = False
+        elif char == '\\':
+            escaped = True
+        elif char == '=' and key is None:
+            key, current = ''.join(current), []
+        elif char == ',':
+            tags[key] = ''.join(current)
+            key, current = None, []
+        else:
+            current.append(char)
+    if key is not None:
+        tags[key] = ''.join(current)
+    return tags
+
+
+def decode_csv(body: bytes) -> dict:
+    """
+    a header row of name, tags and the columns starts every statement result, an error row is followed by
+    the message; statements without series are not part of the csv response
+    """
+    results = []
+    columns: Optional[List[str]] = None
+    values: List[list] = []
+    series_key = None
+    error_next = False
+    for row in csv.reader(io.StringIO(body.decode())):
+        if len(row) == 0:
+            continue
+        if error_next:
+            results.append({'error': row[0]})
+            error_next = False
+        elif row == ['error']:
+            error_next = True
+        elif row[:2] == ['name', 'tags']:
+            columns = row[2:]
+            results.append({'series': []})
+            series_key = None
+        elif columns is not None:
+            if series_key != (row[0], row[1]):
+                series_key = (row[0], row[1])
+                values = []
+                series = {'name': row[0], 'columns': columns, 'values': values}
+                if row[1] != '':
+                    series['tags'] = _csv_tags(row[1])
+                results[-1]['series'].append(series)
+            values.append([_csv_value(value) for value in row[2:]])
+    return {'results': results}
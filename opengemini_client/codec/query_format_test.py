@@ -0,0 +1,133 @@
+# Copyright 2025 openGemini Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import math
+import unittest
+from http import HTTPStatus
+
+from opengemini_client import client_impl, models, test_utils
+from opengemini_client.async_client import AsyncOpenGeminiDBClient
+from opengemini_client.codec import query_format
+from opengemini_client.models import ResponseFormat
+
+# responses recorded for: select * from cpu group by *; select * from mem
+_fixtures = {
+    ResponseFormat.JSON: (
+        b'{"results":[{"statement_id":0,"series":[{"name":"cpu","tags":{"host":"web 1","region":"us-west"},'
+        b'"columns":["time","usage","count","label","ok"],"values":[[1700000000,0.5,10,"a,\\"b\\"",true],'
+        b'[1700000010,2,null,"c",false]]},{"name":"cpu","tags":{"host":"web2","region":"us-west"},'
+        b'"columns":["time","usage","count","label","ok"],"values":[[1700000000,-1.25,-3,"d",true],'
+        b'[1700000010,1e+20,2,"e",false]]}]},{"statement_id":1,"series":[{"name":"mem","columns":["time","free"],'
+        b'"values":[[1700000000,123456789012],[1700000010,1.5e-07]]}]}]}'
+    ),
+    ResponseFormat.CSV: (
+        b'name,tags,time,usage,count,label,ok\n'
+        b'cpu,"host=web\\ 1,region=us-west",1700000000,0.5,10,"a,""b""",true\n'
+        b'cpu,"host=web\\ 1,region=us-west",1700000010,2,,c,false\n'
+        b'cpu,"host=web2,region=us-west",1700000000,-1.25,-3,d,true\n'
+        b'cpu,"host=web2,region=us-west",1700000010,1e+20,2,e,false\n'
+        b'\n'
+        b'name,tags,time,free\n'
+        b'mem,,1700000000,123456789012\n'
+        b'mem,,1700000010,1.5e-07\n'
+    ),
+    ResponseFormat.MSGPACK: bytes.fromhex(
+        '81a7726573756c74739282ac73746174656d656e745f696400a67365726965739284a46e616d65a3637075a47461677382a4686f'
+        '7374a57765622031a6726567696f6ea775732d77657374a7636f6c756d6e7395a474696d65a57573616765a5636f756e74a56c61'
+        '62656ca26f6ba676616c7565739295ce6553f100cb3fe00000000000000aa5612c226222c395ce6553f10a02c0a163c284a46e61'
+        '6d65a3637075a47461677382a4686f7374a477656232a6726567696f6ea775732d77657374a7636f6c756d6e7395a474696d65a5'
+        '7573616765a5636f756e74a56c6162656ca26f6ba676616c7565739295ce6553f100cbbff4000000000000fda164c395ce6553f1'
+        '0acb4415af1d78b58c4002a165c282ac73746174656d656e745f696401a67365726965739183a46e616d65a36d656da7636f6c75'
+        '6d6e7392a474696d65a466726565a676616c7565739292ce6553f100cf0000001cbe991a1492ce6553f10acb3e8421f5f40d8376'
+    ),
+}
+
+_expected = models.QueryResult(results=[
+    models.SeriesResult(series=[
+        models.Series(name='cpu', tags={'host': 'web 1', 'region': 'us-west'},
+                      columns=['time', 'usage', 'count', 'label', 'ok'],
+                      values=[[1700000000, 0.5, 10, 'a,"b"', True], [1700000010, 2, None, 'c', False]]),
+        models.Series(name='cpu', tags={'host': 'web2', 'region': 'us-west'},
+                      columns=['time', 'usage', 'count', 'label', 'ok'],
+                      values=[[1700000000, -1.25, -3, 'd', True], [1700000010, 1e+20, 2, 'e', False]]),
+    ]),
+    models.SeriesResult(series=[models.Series(name='mem', columns=['time', 'free'],
+                                              values=[[1700000000, 123456789012], [1700000010, 1.5e-07]])]),
+])
+
+
+def fixture_handler(request: test_utils.StubRequest) -> test_utils.StubResponse:
+    response_format = ResponseFormat(request.headers.get('Accept'))
+    return test_utils.StubResponse(status=HTTPStatus.OK, body=_fixtures[response_format],
+                                   headers={'Content-Type': response_format.value})
+
+
+def available_formats():
+    return [response_format for response_format in ResponseFormat if query_format.is_available(response_format)]
+
+
+class QueryFormatTest(unittest.TestCase):
+
+    def test_fixtures_decode_identically(self):
+        cfg = models.Config(address=[models.Address(host='127.0.0.1', port=8086)])
+        client_impl.check_config(cfg)
+        for response_format in available_formats():
+            with self.subTest(response_format=response_format):
+                decode = query_format.body_decoder(cfg, response_format)
+                self.assertEqual(_expected, client_impl.resolve_query_result(decode(_fixtures[response_format])))
+
+    def test_csv_values(self):
+        doc = query_format.decode_csv(b'name,tags,time,v\nm,"a\\,b=c\\=d,e=f\\\\g",1,1.5e3\nm,,2,-0.0\n')
+        series = doc['results'][0]['series']
+        self.assertEqual({'a,b': 'c=d', 'e': 'f\\\\g'}, series[0]['tags'])
+        self.assertEqual([[1, 1500.0]], series[0]['values'])
+        self.assertEqual([[2, -0.0]], series[1]['values'])
+        cells = (b'2.', b'.5', b'-1E-3', b'Inf', b'-Inf', b'NaN', b'1e', b'e5', b'1.2.3')
+        values = [query_format.decode_csv(b'name,tags,time,v\nm,,1,' + cell + b'\n')
+                  ['results'][0]['series'][0]['values'][0][1] for cell in cells]
+        self.assertEqual([2.0, 0.5, -0.001, math.inf, -math.inf], values[:5])
+        self.assertTrue(math.isnan(values[5]))
+        self.assertEqual(['1e', 'e5', '1.2.3'], values[6:])
+
+    def test_csv_error(self):
+        doc = query_format.decode_csv(b'error\n"measurement not found"\n')
+        self.assertEqual({'results': [{'error': 'measurement not found'}]}, doc)
+        self.assertEqual('measurement not found', client_impl.resolve_query_result(doc).results[0].error)
+
+    def test_query_sends_accept(self):
+        with test_utils.StubServer(fixture_handler) as server:
+            with client_impl.OpenGeminiDBClient(models.Config(address=[server.address])) as cli:
+                for response_format in available_formats():
+                    with self.subTest(response_format=response_format):
+                        query = models.Query(database='db0', command='select * from cpu group by *; select * from mem',
+                                             retention_policy='', precision=models.Precision.PrecisionSecond,
+                                             response_format=response_format)
+                        qr = cli.query(query)
+                        self.assertEqual(_expected.results, qr.results)
+                        self.assertEqual(response_format.value, server.requests[-1].headers['Accept'])
+                with self.assertRaises(ValueError):
+                    next(cli.query_iter(models.Query(database='db0', command='select * from cpu', retention_policy='',
+                                                     response_format=ResponseFormat.CSV)))
+
+
+class AsyncQueryFormatTest(unittest.IsolatedAsyncioTestCase):
+
+    async def test_query_sends_accept(self):
+        with test_utils.StubServer(fixture_handler) as server:
+            async with AsyncOpenGeminiDBClient(models.Config(address=[server.address])) as cli:
+                for response_format in available_formats():
+                    query = models.Query(database='db0', command='select * from cpu', retention_policy='',
+                                         response_format=response_format)
+                    self.assertEqual(_expected.results, (await cli.query(query)).results)
+                    self.assertEqual(response_format.value, server.requests[-1].headers['Accept'])
@@ -70,7 +70,7 @@ def size_of_bool():
 
 
 def size_of_string(s: str) -> int:
-    return len(s) + size_of_uint16()
+    return len(s.encode("utf-8")) + size_of_uint16()
 
 
 def size_of_bytes(b: bytes) -> int:
@@ -0,0 +1,112 @@
+# Copyright 2025 openGemini Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+columnar views of query results, one typed NumPy array per column with nulls masked
+"""
+import dataclasses
+from dataclasses import dataclass
+from typing import Any, Dict, List, Sequence
+
+import numpy
+
+TIME_COLUMN = 'time'
+
+
+@dataclass
+class ColumnarSeries:
+    name: str = ''
+    tags: Dict[str, str] = dataclasses.field(default_factory=dict)
+    # int64, float64 or bool arrays, object arrays for strings and datetime64[ns] for time; a column
+    # holding nulls is a numpy.ma.MaskedArray with the null rows masked
+    columns: Dict[str, numpy.ndarray] = dataclasses.field(default_factory=dict)
+
+    def __getitem__(self, name: str) -> numpy.ndarray:
+        return self.columns[name]
+
+    def __len__(self) -> int:
+        for column in self.columns.values():
+            return len(column)
+        return 0
+
+
+def _object_array(values: Sequence[Any]) -> numpy.ndarray:
+    # assigning into an object array keeps the decoded values, numpy.array would try to nest lists
+    array = numpy.empty(len(values), dtype=object)
+    array[:] = values
+    return array
+
+
+def _infer_dtype(present: numpy.ndarray):
+    types = set(map(type, present))
+    if types == {bool}:
+        return numpy.bool_
+    if types == {int}:
+        return numpy.int64
+    if types and types <= {int, float}:
+        return numpy.float64
+    if not types:
+        return numpy.float64
+    return object
+
+
+def _typed(present: numpy.ndarray) -> numpy.ndarray:
+    dtype = _infer_dtype(present)
+    if dtype is object:
+        return present
+    try:
+        return present.astype(dtype)
+    except OverflowError:
+        return present
+
+
+def _time_array(typed: numpy.ndarray, time_unit_ns: int) -> numpy.ndarray:
+    if typed.dtype == numpy.int64:
+        return (typed * time_unit_ns).view('datetime64[ns]')
+    if typed.dtype == numpy.float64:
+        return (typed * time_unit_ns).astype(numpy.int64).view('datetime64[ns]')
+    # rfc3339 strings, returned when no epoch was requested
+    return numpy.array([numpy.datetime64(str(v).rstrip('Z'), 'ns') for v in typed], dtype='datetime64[ns]')
+
+
+def column_array(values: Sequence[Any], is_time: bool = False, time_unit_ns: int = 1) -> numpy.ndarray:
+    """
+    convert the values of one column into a typed array, masked when some values are None
+    """
+    raw = _object_array(values)
+    mask = numpy.equal(raw, None)
+    has_null = bool(mask.any())
+    typed = _typed(raw[~mask] if has_null else raw)
+    if is_time:
+        typed = _time_array(typed, time_unit_ns)
+    if not has_null:
+        return typed
+    if typed.dtype == object:
+        data = raw
+    else:
+        data = numpy.zeros(len(raw), dtype=typed.dtype)
+        data[~mask] = typed
+    return numpy.ma.MaskedArray(data, mask=mask)
+
+
+def to_columns(columns: List[str], values: List[List[Any]], time_unit_ns: int = 1) -> Dict[str, numpy.ndarray]:
+    """
+    transpose the rows of a series into one array per column, time_unit_ns is the length in nanoseconds
+    of one unit of the integer timestamps in the time column
+    """
+    transposed = list(zip(*values)) if values else [()] * len(columns)
+    return {
+        name: column_array(column, name == TIME_COLUMN, time_unit_ns)
+        for name, column in zip(columns, transposed)
+    }
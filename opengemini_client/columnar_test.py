@@ -0,0 +1,98 @@
+# Copyright 2025 openGemini Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import unittest
+from http import HTTPStatus
+
+import numpy
+
+from opengemini_client import client_impl, models, test_utils
+from opengemini_client.columnar import column_array
+
+
+class ColumnArrayTest(unittest.TestCase):
+
+    def test_dtypes(self):
+        self.assertEqual(numpy.int64, column_array([1, 2, 3]).dtype)
+        self.assertEqual(numpy.float64, column_array([1.5, 2.0]).dtype)
+        self.assertEqual(numpy.float64, column_array([1, 2.5]).dtype)
+        self.assertEqual(numpy.bool_, column_array([True, False]).dtype)
+        strings = column_array(['a', 'b'])
+        self.assertEqual(object, strings.dtype)
+        self.assertEqual(['a', 'b'], strings.tolist())
+        # integers beyond int64 keep their exact value
+        self.assertEqual([2 ** 70, 1], column_array([2 ** 70, 1]).tolist())
+        # a column of lists stays one element per row
+        self.assertEqual((2,), column_array([[1, 2], [3, 4]]).shape)
+
+    def test_nulls_are_masked(self):
+        ints = column_array([1, None, 3])
+        self.assertIsInstance(ints, numpy.ma.MaskedArray)
+        self.assertEqual(numpy.int64, ints.dtype)
+        self.assertEqual([False, True, False], ints.mask.tolist())
+        self.assertEqual([1, None, 3], ints.tolist())
+        strings = column_array([None, 'x'])
+        self.assertEqual([True, False], strings.mask.tolist())
+        self.assertEqual('x', strings[1])
+        empty = column_array([None, None])
+        self.assertTrue(empty.mask.all())
+        self.assertNotIsInstance(column_array([1, 2]), numpy.ma.MaskedArray)
+
+    def test_time(self):
+        seconds = column_array([1700000000, 1700000001], is_time=True,
+                               time_unit_ns=models.Precision.PrecisionSecond.nanoseconds())
+        self.assertEqual(numpy.dtype('datetime64[ns]'), seconds.dtype)
+        self.assertEqual(numpy.datetime64('2023-11-14T22:13:21', 'ns'), seconds[1])
+        nanoseconds = column_array([1700000000123456789], is_time=True)
+        self.assertEqual(1700000000123456789, nanoseconds.view(numpy.int64)[0])
+        rfc3339 = column_array(['2023-11-14T22:13:20.5Z', None], is_time=True)
+        self.assertEqual(numpy.datetime64('2023-11-14T22:13:20.500', 'ns'), rfc3339[0])
+        self.assertTrue(rfc3339.mask[1])
+
+
+class ToColumnarTest(unittest.TestCase):
+
+    def test_series(self):
+        series = models.Series(name='cpu', tags={'host': 'h1'}, columns=['time', 'value', 'label', 'ok'],
+                               values=[[1, 0.5, 'a', True], [2, None, 'b', False]])
+        columnar = series.to_columnar(models.Precision.PrecisionMillisecond)
+        self.assertEqual('cpu', columnar.name)
+        self.assertEqual({'host': 'h1'}, columnar.tags)
+        self.assertEqual(2, len(columnar))
+        self.assertEqual([1000000, 2000000], columnar['time'].view(numpy.int64).tolist())
+        self.assertEqual([0.5, None], columnar['value'].tolist())
+        self.assertEqual(['a', 'b'], columnar['label'].tolist())
+        self.assertEqual([True, False], columnar['ok'].tolist())
+
+    def test_empty_series(self):
+        columnar = models.Series(name='cpu', columns=['time', 'value']).to_columnar()
+        self.assertEqual(0, len(columnar))
+        self.assertEqual(['time', 'value'], list(columnar.columns))
+
+    def test_query_result(self):
+        body = json.dumps({'results': [{'statement_id': 0, 'series': [
+            {'name': 'cpu', 'columns': ['time', 'value'], 'values': [[1700000000, 1], [1700000060, 2]]},
+            {'name': 'mem', 'columns': ['time', 'value'], 'values': [[1700000000, 3.5]]}]}]}).encode()
+        query = models.Query(database='db0', command='select * from cpu, mem', retention_policy='',
+                             precision=models.Precision.PrecisionSecond)
+        with test_utils.StubServer(lambda _: test_utils.StubResponse(status=HTTPStatus.OK, body=body)) as server:
+            with client_impl.OpenGeminiDBClient(models.Config(address=[server.address])) as cli:
+                qr = cli.query(query)
+        self.assertEqual('s', server.requests[0].params['epoch'])
+        columnar = qr.to_columnar()
+        self.assertEqual(['cpu', 'mem'], [c.name for c in columnar])
+        self.assertEqual(numpy.datetime64('2023-11-14T22:14:20', 'ns'), columnar[0]['time'][1])
+        self.assertEqual(numpy.int64, columnar[0]['value'].dtype)
+        self.assertEqual(numpy.float64, columnar[1]['value'].dtype)
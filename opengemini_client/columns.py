@@ -0,0 +1,255 @@
+# Copyright 2025 openGemini Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+columnar write support, builds line protocol and records straight from column arrays without Point objects
+"""
+import itertools
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy
+
+from opengemini_client.line_protocol import escape_measurement, escape_tag, escape_string_field
+from opengemini_client.models import Precision, timestamps_to_ns
+from opengemini_client.record.colval import ColVal
+from opengemini_client.record.colval_builder import ColValBuilder
+from opengemini_client.record.field import Field, Field_Type_Unknown, Field_Type_Int, Field_Type_Float, \
+    Field_Type_Boolean, Field_Type_String, Field_Type_Tag
+from opengemini_client.record.record import Record, TimeField
+
+ColumnValues = Union[numpy.ndarray, Sequence[Any]]
+
+ErrEmptyMeasurement = "empty measurement"
+ErrEmptyFields = "empty fields"
+ErrEmptyTimestamps = "empty timestamps"
+ErrNoFieldValues = "no row has a field value"
+
+
+@dataclass
+class _Column:
+    name: str
+    type: int
+    # python values, None marks a null; None for a NumPy column until the line protocol needs them
+    values: Optional[List[Any]] = None
+    # NumPy numeric or boolean column and the rows holding a value, valid is None when every row does
+    data: Optional[numpy.ndarray] = None
+    valid: Optional[numpy.ndarray] = None
+
+    def python_values(self) -> List[Any]:
+        if self.values is None:
+            self.values = self.data.tolist()
+            if self.valid is not None:
+                for i in numpy.flatnonzero(~self.valid).tolist():
+                    self.values[i] = None
+        return self.values
+
+    def valid_rows(self) -> numpy.ndarray:
+        if self.data is None:
+            return numpy.fromiter((v is not None for v in self.values), dtype=numpy.bool_, count=len(self.values))
+        if self.valid is None:
+            return numpy.ones(len(self.data), dtype=numpy.bool_)
+        return self.valid
+
+    def take(self, rows: numpy.ndarray):
+        if self.data is None:
+            self.values = list(itertools.compress(self.values, rows.tolist()))
+            return
+        self.data = self.data[rows]
+        if self.valid is not None:
+            self.valid = self.valid[rows]
+        self.values = None
+
+
+def _infer_type(name: str, values: List[Any]) -> int:
+    types = {type(v) for v in values if v is not None}
+    # all values of the column are null, the column is left out
+    if len(types) == 0:
+        return Field_Type_Unknown
+    if types <= {int}:
+        return Field_Type_Int
+    if types <= {int, float}:
+        return Field_Type_Float
+    if types <= {bool}:
+        return Field_Type_Boolean
+    if types <= {str}:
+        return Field_Type_String
+    raise ValueError(f"invalid value types {sorted(t.__name__ for t in types)} of column {name}")
+
+
+def _resolve_column(name: str, values: ColumnValues, row_count: int) -> _Column:
+    if len(values) != row_count:
+        raise ValueError(f"column {name} has {len(values)} values, expect {row_count}")
+    if not isinstance(values, numpy.ndarray):
+        lst = list(values)
+        column = _Column(name=name, type=_infer_type(name, lst), values=lst)
+        if column.type == Field_Type_Float:
+            column.values = [None if v is None else float(v) for v in lst]
+        return column
+
+    data = numpy.ma.getdata(values)
+    mask = numpy.ma.getmaskarray(values) if isinstance(values, numpy.ma.MaskedArray) else None
+    kind = data.dtype.kind
+    if kind == 'b':
+        t = Field_Type_Boolean
+    elif kind in 'iu':
+        t = Field_Type_Int
+    elif kind == 'f':
+        t = Field_Type_Float
+        nan = numpy.isnan(data)
+        mask = nan if mask is None else mask | nan
+    else:
+        lst = data.tolist()
+        if mask is not None:
+            for i in numpy.flatnonzero(mask).tolist():
+                lst[i] = None
+        return _Column(name=name, type=_infer_type(name, lst), values=lst)
+    valid = None
+    if mask is not None and mask.any():
+        valid = ~mask
+        # all values of the column are null, the column is left out
+        if not valid.any():
+            t = Field_Type_Unknown
+    return _Column(name=name, type=t, data=data, valid=valid)
+
+
+def _resolve(measurement: str, tags: Dict[str, Union[str, ColumnValues]], fields: Dict[str, ColumnValues],
+             timestamps: ColumnValues, precision: Precision):
+    if not measurement:
+        raise ValueError(ErrEmptyMeasurement)
+    if not fields:
+        raise ValueError(ErrEmptyFields)
+    if timestamps is None or len(timestamps) == 0:
+        raise ValueError(ErrEmptyTimestamps)
+    ts = timestamps_to_ns(timestamps, precision)
+    row_count = len(ts)
+    const_tags = []
+    tag_columns = []
+    for name, values in (tags or {}).items():
+        if isinstance(values, str):
+            const_tags.append((name, values))
+            continue
+        column = _resolve_column(name, values, row_count)
+        if column.type not in (Field_Type_String, Field_Type_Unknown):
+            raise ValueError(f"tag {name} must be string values")
+        if column.type == Field_Type_String:
+            column.type = Field_Type_Tag
+            tag_columns.append(column)
+    field_columns = []
+    for name, values in fields.items():
+        column = _resolve_column(name, values, row_count)
+        if column.type != Field_Type_Unknown:
+            field_columns.append(column)
+    return ts, const_tags, tag_columns, field_columns
+
+
+def _format_values(column: _Column) -> List[Any]:
+    values = column.python_values()
+    if column.type == Field_Type_Int:
+        return [None if v is None else f"{v}i" for v in values]
+    if column.type == Field_Type_Float:
+        return [None if v is None else f"{v}" for v in values]
+    if column.type == Field_Type_Boolean:
+        return [None if v is None else ('T' if v else 'F') for v in values]
+    return [None if v is None else '"' + escape_string_field(v) + '"' for v in values]
+
+
+def _encode_rows(prefix: str, tag_values, field_values, ts: numpy.ndarray) -> bytes:
+    lines = []
+    for row, t in enumerate(ts.tolist()):
+        line = [prefix]
+        for key, values in tag_values:
+            v = values[row]
+            if v is not None:
+                line.append(key)
+                line.append(v)
+        sep = ' '
+        for key, values in field_values:
+            v = values[row]
+            if v is None:
+                continue
+            line.append(sep)
+            line.append(key)
+            line.append(v)
+            sep = ','
+        if sep == ' ':
+            continue
+        line.append(f" {t}\n")
+        lines.append(''.join(line))
+    if not lines:
+        raise ValueError(ErrNoFieldValues)
+    return ''.join(lines).encode()
+
+
+def encode_columns(measurement: str, tags: Dict[str, Union[str, ColumnValues]], fields: Dict[str, ColumnValues],
+                   timestamps: ColumnValues, precision: Precision = Precision.PrecisionNanoSecond) -> bytes:
+    """
+    serialize columns into a newline separated line protocol body, rows without any field value are skipped and
+    ValueError is raised when no row is left
+    :param measurement: measurement name
+    :param tags: tag name to a string shared by all rows or to one string (or None) per row
+    :param fields: field name to one value (or None/NaN) per row
+    :param timestamps: integer epochs in precision, or a datetime64 array
+    :param precision: precision of integer timestamps, datetime64 timestamps are rounded to it
+    """
+    ts, const_tags, tag_columns, field_columns = _resolve(measurement, tags, fields, timestamps, precision)
+    prefix = escape_measurement(measurement) + ''.join(f",{escape_tag(k)}={escape_tag(v)}" for k, v in const_tags)
+    tag_values = [(',' + escape_tag(c.name) + '=', [None if v is None else escape_tag(v) for v in c.values])
+                  for c in tag_columns]
+    field_values = [(escape_tag(c.name) + '=', _format_values(c)) for c in field_columns]
+    return _encode_rows(prefix, tag_values, field_values, ts)
+
+
+def _build_colval(column: _Column) -> ColVal:
+    builder = ColValBuilder()
+    if column.type in (Field_Type_String, Field_Type_Tag):
+        append_many = builder.append_string_many
+    elif column.type == Field_Type_Int:
+        append_many = builder.append_integer_many
+    elif column.type == Field_Type_Float:
+        append_many = builder.append_float_many
+    else:
+        append_many = builder.append_boolean_many
+    if column.data is not None:
+        append_many(column.data, column.valid)
+    else:
+        append_many(column.values)
+    return builder.build()
+
+
+def columns_to_record(measurement: str, tags: Dict[str, Union[str, ColumnValues]], fields: Dict[str, ColumnValues],
+                      timestamps: ColumnValues, precision: Precision = Precision.PrecisionNanoSecond) \
+        -> Tuple[Record, int, int]:
+    """
+    build a record from columns, same arguments as encode_columns; rows without any field value are skipped
+    like in encode_columns, NumPy numeric and boolean columns go to the record without Python objects per row
+    :return: the record and the min and max timestamp
+    """
+    ts, const_tags, tag_columns, field_columns = _resolve(measurement, tags, fields, timestamps, precision)
+    rows = numpy.logical_or.reduce([c.valid_rows() for c in field_columns]) if field_columns else None
+    if rows is None or not rows.any():
+        raise ValueError(ErrNoFieldValues)
+    if not rows.all():
+        ts = ts[rows]
+        for column in tag_columns + field_columns:
+            column.take(rows)
+    row_count = len(ts)
+    tag_columns = [_Column(name=k, type=Field_Type_Tag, values=[v] * row_count) for k, v in const_tags] + tag_columns
+    time_column = _Column(name=TimeField, type=Field_Type_Int, data=ts)
+    columns = field_columns + tag_columns + [time_column]
+    record = Record(
+        Fields=[Field(Name=c.name, Type=c.type) for c in columns],
+        ColVals=[_build_colval(c) for c in columns],
+    )
+    return record, int(ts.min()), int(ts.max())
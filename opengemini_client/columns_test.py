@@ -0,0 +1,109 @@
+# Copyright 2025 openGemini Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+from datetime import datetime
+
+import numpy
+
+from opengemini_client import client_impl, models, test_utils
+from opengemini_client.columns import ErrNoFieldValues, encode_columns, columns_to_record
+from opengemini_client.line_protocol import encode_batch_points
+from opengemini_client.record_transform import RecordTransform
+
+
+class ColumnsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.seconds = [1700000000 + i for i in range(20)]
+        self.fields = {
+            'usage': [i * 1.5 if i % 3 != 1 else None for i in range(20)],
+            'count': numpy.arange(20, dtype=numpy.int64),
+            'state': ['ok, "fine"' if i % 2 else 'bad=1' for i in range(20)],
+        }
+        self.tags = {'host': 'server 01', 'region': ['us,west' if i % 4 != 1 else None for i in range(20)]}
+        self.points = []
+        for i, sec in enumerate(self.seconds):
+            fields = {k: (v[i].item() if isinstance(v, numpy.ndarray) else v[i]) for k, v in self.fields.items()}
+            tags = {'host': 'server 01', 'region': self.tags['region'][i]}
+            self.points.append(models.Point(
+                measurement='cpu load',
+                precision=models.Precision.PrecisionSecond,
+                fields={k: v for k, v in fields.items() if v is not None},
+                tags={k: v for k, v in tags.items() if v is not None},
+                timestamp=datetime.fromtimestamp(sec),
+            ))
+
+    def test_encode_columns_matches_points(self):
+        expected = encode_batch_points(models.BatchPoints(points=self.points))
+        body = encode_columns('cpu load', self.tags, self.fields, self.seconds, models.Precision.PrecisionSecond)
+        self.assertEqual(expected, body)
+
+    def test_encode_columns_skips_null_rows_and_nan(self):
+        body = encode_columns('m', {}, {'v': numpy.array([1.0, numpy.nan, 2.5]), 'b': [True, None, False]},
+                              numpy.array([1, 2, 3], dtype='datetime64[ms]'))
+        self.assertEqual(b'm v=1.0,b=T 1000000\nm v=2.5,b=F 3000000\n', body)
+
+    def test_columns_to_record_matches_record_transform(self):
+        rt = RecordTransform()
+        for point in self.points:
+            rt.add_point(point)
+        record, min_time, max_time = columns_to_record('cpu load', self.tags, self.fields, self.seconds,
+                                                       models.Precision.PrecisionSecond)
+        self.assertEqual(rt.convert_to_record().marshal(b''), record.marshal(b''))
+        self.assertEqual(self.seconds[0] * 10 ** 9, min_time)
+        self.assertEqual(self.seconds[-1] * 10 ** 9, max_time)
+
+    def test_numpy_columns_match_lists(self):
+        data = {'v': numpy.array([1.0, numpy.nan, 2.5, numpy.nan]),
+                'n': numpy.ma.array([1, 2, 3, 4], mask=[0, 0, 1, 1]), 'b': numpy.array([True, False, True, False])}
+        lists = {'v': [1.0, None, 2.5, None], 'n': [1, 2, None, None], 'b': [True, False, True, False]}
+        for tags in ({}, {'host': ['a', None, 'c', 'd']}):
+            self.assertEqual(columns_to_record('m', tags, lists, [1, 2, 3, 4])[0].marshal(b''),
+                             columns_to_record('m', tags, data, [1, 2, 3, 4])[0].marshal(b''))
+
+    def test_columns_to_record_skips_null_rows(self):
+        fields = {'v': numpy.array([1.0, numpy.nan, 2.5]), 'b': [True, None, False]}
+        tags = {'host': ['a', 'b', 'c']}
+        record, min_time, max_time = columns_to_record('m', tags, fields, [1, 2, 3])
+        expected, _, _ = columns_to_record('m', {'host': ['a', 'c']},
+                                           {'v': [1.0, 2.5], 'b': [True, False]}, [1, 3])
+        self.assertEqual(expected.marshal(b''), record.marshal(b''))
+        self.assertEqual((1, 3), (min_time, max_time))
+        self.assertEqual(b'm,host=a v=1.0,b=T 1\nm,host=c v=2.5,b=F 3\n', encode_columns('m', tags, fields, [1, 2, 3]))
+        with self.assertRaises(ValueError):
+            columns_to_record('m', {}, {'v': numpy.array([numpy.nan])}, [1])
+
+    def test_write_columns_rejects_all_null_fields(self):
+        with test_utils.StubServer() as server:
+            cfg = models.Config(address=[server.address],
+                                grpc_config=models.GrpcConfig(address=[models.Address(host='127.0.0.1', port=8305)]))
+            with client_impl.OpenGeminiDBClient(cfg) as cli:
+                with self.assertRaisesRegex(ValueError, ErrNoFieldValues):
+                    cli.write_columns('db0', 'm', {}, {'v': [None, None]}, [1, 2])
+                with self.assertRaisesRegex(ValueError, ErrNoFieldValues):
+                    cli.write_columns_by_grpc('db0', 'm', {}, {'v': [None, None]}, [1, 2])
+        self.assertEqual([], [request for request in server.requests if request.path == '/write'])
+
+    def test_invalid_columns(self):
+        with self.assertRaises(ValueError):
+            encode_columns('m', {}, {'v': [1, 2]}, [1, 2, 3])
+        with self.assertRaises(ValueError):
+            encode_columns('m', {}, {'v': [1, 'x', 3]}, [1, 2, 3])
+        with self.assertRaises(ValueError):
+            encode_columns('m', {'t': [1, 2, 3]}, {'v': [1, 2, 3]}, [1, 2, 3])
+        with self.assertRaises(ValueError):
+            encode_columns('', {}, {'v': [1]}, [1])
+        with self.assertRaises(ValueError):
+            encode_columns('m', {}, {}, [1])
@@ -12,15 +12,130 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os.path
+import threading
+from typing import Dict, List, Union
+
+import grpc
+import grpc.aio
 from requests import HTTPError
 
-from opengemini_client.models import BatchPoints
+from opengemini_client.codec.compress import compress_block
+from opengemini_client.columns import ColumnValues, columns_to_record
+from opengemini_client.models import BatchPoints, CompressMethod, GrpcConfig, Precision, TlsConfig
+from opengemini_client.record.record import Record
 from opengemini_client.proto import write_pb2, write_pb2_grpc
 from opengemini_client.record_transform import RecordTransform
 
 
-def write(channel, database: str, batch_points: BatchPoints, rp: str = '', username: str = '', password: str = '',
-          timeout: int = 0):
+def _read_file(path: str):
+    if not os.path.exists(path):
+        return None
+    with open(path, 'rb') as fd:
+        return fd.read()
+
+
+def load_credentials(tls_config: TlsConfig) -> grpc.ChannelCredentials:
+    return grpc.ssl_channel_credentials(
+        root_certificates=_read_file(tls_config.ca_file),
+        private_key=_read_file(tls_config.key_file),
+        certificate_chain=_read_file(tls_config.cert_file),
+    )
+
+
+class ChannelPool:
+    """
+    one long-lived channel and WriteServiceStub per endpoint, tls credentials are loaded once
+    """
+
+    def __init__(self, grpc_config: GrpcConfig):
+        self.grpc_config = grpc_config
+        self._credentials = None
+        self._channels: Dict[str, grpc.Channel] = {}
+        self._stubs: Dict[str, write_pb2_grpc.WriteServiceStub] = {}
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _new_channel(self, endpoint: str) -> grpc.Channel:
+        if self.grpc_config.tls_enable is False:
+            return grpc.insecure_channel(endpoint)
+        if self._credentials is None:
+            self._credentials = load_credentials(self.grpc_config.tls_config)
+        return grpc.secure_channel(target=endpoint, credentials=self._credentials)
+
+    def stub(self, endpoint: str) -> write_pb2_grpc.WriteServiceStub:
+        stub = self._stubs.get(endpoint)
+        if stub is not None:
+            return stub
+        with self._lock:
+            if self._closed:
+                raise ValueError("grpc channel pool is closed")
+            stub = self._stubs.get(endpoint)
+            if stub is None:
+                channel = self._new_channel(endpoint)
+                stub = write_pb2_grpc.WriteServiceStub(channel)
+                self._channels[endpoint] = channel
+                self._stubs[endpoint] = stub
+            return stub
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            channels = list(self._channels.values())
+            self._channels.clear()
+            self._stubs.clear()
+        for channel in channels:
+            channel.close()
+
+
+class AioChannelPool:
+    """
+    grpc.aio counterpart of ChannelPool, must be used from a single event loop
+    """
+
+    def __init__(self, grpc_config: GrpcConfig):
+        self.grpc_config = grpc_config
+        self._credentials = None
+        self._channels: Dict[str, grpc.aio.Channel] = {}
+        self._stubs: Dict[str, write_pb2_grpc.WriteServiceStub] = {}
+
+    def _new_channel(self, endpoint: str) -> grpc.aio.Channel:
+        if self.grpc_config.tls_enable is False:
+            return grpc.aio.insecure_channel(endpoint)
+        if self._credentials is None:
+            self._credentials = load_credentials(self.grpc_config.tls_config)
+        return grpc.aio.secure_channel(target=endpoint, credentials=self._credentials)
+
+    def stub(self, endpoint: str) -> write_pb2_grpc.WriteServiceStub:
+        stub = self._stubs.get(endpoint)
+        if stub is None:
+            channel = self._new_channel(endpoint)
+            stub = write_pb2_grpc.WriteServiceStub(channel)
+            self._channels[endpoint] = channel
+            self._stubs[endpoint] = stub
+        return stub
+
+    async def close(self):
+        channels = list(self._channels.values())
+        self._channels.clear()
+        self._stubs.clear()
+        for channel in channels:
+            await channel.close()
+
+
+def new_record(measurement: str, min_time: int, max_time: int, record: Record,
+               compress_method: CompressMethod = CompressMethod.UNCOMPRESSED) -> write_pb2.Record:
+    return write_pb2.Record(
+        measurement=measurement,
+        min_time=min_time,
+        max_time=max_time,
+        compress_method=compress_method.value,
+        block=compress_block(compress_method, record.marshal(b'')),
+    )
+
+
+def points_to_records(batch_points: BatchPoints,
+                      compress_method: CompressMethod = CompressMethod.UNCOMPRESSED) -> List[write_pb2.Record]:
     # generate grpc request records
     record_transforms = {}
     for point in batch_points.points:
@@ -31,25 +146,58 @@ def write(channel, database: str, batch_points: BatchPoints, rp: str = '', usern
         record_transforms[point.measurement] = rt
     records = []
     for measurement, rt in record_transforms.items():
-        record = write_pb2.Record(
-            measurement=measurement,
-            min_time=rt.min_time,
-            max_time=rt.max_time,
-            block=rt.convert_to_record().marshal(b''),
-        )
-        records.append(record)
+        records.append(new_record(measurement, rt.min_time, rt.max_time, rt.convert_to_record(), compress_method))
+    return records
 
-    # send grpc request
-    response = write_pb2_grpc.WriteServiceStub(channel).Write(
-        write_pb2.WriteRequest(
-            database=database,
-            retention_policy=rp,
-            username=username,
-            password=password,
-            records=records,
-        ),
-        timeout=timeout
+
+def columns_to_records(measurement: str, tags: Dict[str, Union[str, ColumnValues]], fields: Dict[str, ColumnValues],
+                       timestamps: ColumnValues, precision: Precision = Precision.PrecisionNanoSecond,
+                       compress_method: CompressMethod = CompressMethod.UNCOMPRESSED) -> List[write_pb2.Record]:
+    record, min_time, max_time = columns_to_record(measurement, tags, fields, timestamps, precision)
+    return [new_record(measurement, min_time, max_time, record, compress_method)]
+
+
+def new_write_request(database: str, records: List[write_pb2.Record], rp: str = '', username: str = '',
+                      password: str = '') -> write_pb2.WriteRequest:
+    return write_pb2.WriteRequest(
+        database=database,
+        retention_policy=rp,
+        username=username,
+        password=password,
+        records=records,
     )
+
+
+def marshal_records(records: List[write_pb2.Record]) -> bytes:
+    return write_pb2.WriteRequest(records=records).SerializeToString()
+
+
+def unmarshal_records(data: bytes) -> List[write_pb2.Record]:
+    return list(write_pb2.WriteRequest.FromString(data).records)
+
+
+def check_write_response(response: write_pb2.WriteResponse):
     if response.code == 0:
         return
     raise HTTPError(f"write_by_grpc error resp, code: {response.code}")
+
+
+def ping(stub, timeout: int = 0) -> bool:
+    try:
+        return stub.Ping(write_pb2.PingRequest(), timeout=timeout).status == write_pb2.Up
+    except grpc.RpcError:
+        return False
+
+
+async def aio_ping(stub, timeout: int = 0) -> bool:
+    try:
+        return (await stub.Ping(write_pb2.PingRequest(), timeout=timeout)).status == write_pb2.Up
+    except grpc.RpcError:
+        return False
+
+
+def write_records(stub, database: str, records: List[write_pb2.Record], rp: str = '', username: str = '',
+                  password: str = '', timeout: int = 0):
+    # send grpc request
+    response = stub.Write(new_write_request(database, records, rp, username, password), timeout=timeout)
+    check_write_response(response)
@@ -12,12 +12,15 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+# pylint: disable=no-member
 import time
 import unittest
 from datetime import datetime
 
-from opengemini_client import models
+from opengemini_client import client_impl, grpc_client, models
 from opengemini_client import test_utils
+from opengemini_client.codec import compress
+from opengemini_client.record.record_view import RecordView
 
 
 class GrpcClientTest(unittest.TestCase):
@@ -53,3 +56,57 @@ class GrpcClientTest(unittest.TestCase):
             print(qr)
             self.assertNotEqual(len(qr.results), 0)
             cli.drop_database('grpc_write_test')
+
+
+class ChannelPoolTest(unittest.TestCase):
+
+    def setUp(self):
+        self.grpc_server = test_utils.StubGrpcServer()
+        self.grpc_server.start()
+        self.service = self.grpc_server.service
+        self.port = self.grpc_server.port
+
+    def tearDown(self):
+        self.grpc_server.stop()
+
+    def test_stub_reused_per_endpoint(self):
+        pool = grpc_client.ChannelPool(models.GrpcConfig(address=[]))
+        stub = pool.stub(f'127.0.0.1:{self.port}')
+        self.assertIs(stub, pool.stub(f'127.0.0.1:{self.port}'))
+        self.assertIsNot(stub, pool.stub(f'localhost:{self.port}'))
+        pool.close()
+        with self.assertRaises(ValueError):
+            pool.stub(f'127.0.0.1:{self.port}')
+
+    def test_ping(self):
+        pool = grpc_client.ChannelPool(models.GrpcConfig(address=[]))
+        self.assertTrue(grpc_client.ping(pool.stub(f'127.0.0.1:{self.port}'), timeout=5))
+        self.grpc_server.stop()
+        self.assertFalse(grpc_client.ping(pool.stub(f'127.0.0.1:{self.port}'), timeout=1))
+        pool.close()
+
+    def test_write_by_grpc_reuses_connection(self):
+        cfg = models.Config(address=[models.Address(host='127.0.0.1', port=8086)],
+                            grpc_config=models.GrpcConfig(address=[models.Address(host='127.0.0.1', port=self.port)]))
+        with client_impl.OpenGeminiDBClient(cfg) as cli:
+            for i in range(3):
+                point = models.Point(measurement='pool_mm', precision=models.Precision.PrecisionSecond,
+                                     fields={'x': float(i)}, timestamp=datetime.now())
+                cli.write_by_grpc('pool_db', models.BatchPoints(points=[point]))
+        self.assertEqual(3, len(self.service.requests))
+        self.assertEqual(1, len(self.service.peers))
+        self.assertEqual('pool_mm', self.service.requests[0].records[0].measurement)
+
+    def test_write_compressed_records(self):
+        for method in compress.available_methods():
+            with self.subTest(method=method):
+                self.service.requests.clear()
+                grpc_config = models.GrpcConfig(address=[models.Address(host='127.0.0.1', port=self.port)],
+                                                compress_method=method)
+                cfg = models.Config(address=[models.Address(host='127.0.0.1', port=8086)], grpc_config=grpc_config)
+                with client_impl.OpenGeminiDBClient(cfg) as cli:
+                    cli.write_columns_by_grpc('pool_db', 'pool_mm', {'host': 'h1'}, {'x': [1.5, 2.5]}, [1, 2])
+                record = self.service.requests[0].records[0]
+                self.assertEqual(method.value, record.compress_method)
+                view = RecordView.decode(compress.decompress_block(method, record.block))
+                self.assertEqual([1.5, 2.5], view.column('x').values().tolist())
@@ -0,0 +1,299 @@
+# Copyright 2025 openGemini Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+line protocol serializer, produces the same output as Point.to_string without walking strings per character
+"""
+import re
+import sys
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Hashable, Iterator, List, Optional, Tuple, Union
+
+from opengemini_client.models import BatchPoints, CompactPoint, Point, SeriesKeyCacheConfig
+
+
+def _compile_escaper(escape_str: str):
+    # same rule as models.chars_to_escape: escape every char of escape_str, and a backslash
+    # when it is followed by another backslash or by a char of escape_str
+    table = str.maketrans({c: '\\' + c for c in escape_str})
+    chars = tuple(escape_str)
+    pattern = re.compile('[' + re.escape(escape_str) + ']|\\\\(?=[\\\\' + re.escape(escape_str) + '])')
+
+    def escape(s: str) -> str:
+        if '\\' in s:
+            return pattern.sub(r'\\\g<0>', s)
+        for c in chars:
+            if c in s:
+                return s.translate(table)
+        return s
+
+    return escape
+
+
+escape_measurement = _compile_escaper(', ')
+escape_tag = _compile_escaper(', =')
+escape_string_field = _compile_escaper('"')
+
+
+def _write_field_value(parts: List[str], v):
+    if isinstance(v, int):
+        parts.append(f"{v}i")
+    elif isinstance(v, str):
+        parts.append('"')
+        parts.append(escape_string_field(v))
+        parts.append('"')
+    elif isinstance(v, float):
+        parts.append(f"{v}")
+
+
+def series_key(point: Union[Point, CompactPoint]) -> str:
+    """
+    the escaped measurement and tags of point, the line protocol up to the fields
+    """
+    parts = [escape_measurement(point.measurement)]
+    for k, v in point.tag_items():
+        parts.append(',')
+        parts.append(escape_tag(k))
+        parts.append('=')
+        parts.append(escape_tag(v))
+    return ''.join(parts)
+
+
+@dataclass
+class SeriesKeyCacheStats:
+    hits: int = 0
+    misses: int = 0
+    # lookups escaped without the cache while it was bypassed for a low hit rate
+    bypassed: int = 0
+    # entries dropped to stay within the entry or size bound
+    evictions: int = 0
+    entries: int = 0
+    # estimated memory of the cached entries in bytes
+    size: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+def check_series_key_cache_config(series_key_cache_config: SeriesKeyCacheConfig):
+    if series_key_cache_config is None:
+        return
+    if series_key_cache_config.max_entries < 1:
+        raise ValueError("series key cache max entries must be at least 1")
+    if series_key_cache_config.max_bytes < 0:
+        raise ValueError("series key cache max bytes must not be negative")
+    if not 0 <= series_key_cache_config.min_hit_rate <= 1:
+        raise ValueError("series key cache min hit rate must be between 0 and 1")
+
+
+# memory of an OrderedDict entry besides its key and value, and of each (key, value) tuple of a Point key
+_EntryOverhead = 100
+_TagItemOverhead = sys.getsizeof(('', ''))
+
+
+class SeriesKeyCache:
+    """
+    a thread safe least recently used cache of series_key, keyed on the measurement and the tag items of the
+    point. The hit rate is sampled over sample_size lookups, after a sample below min_hit_rate the cache is
+    left alone for bypass_samples samples and then sampled again, so a workload that never repeats its
+    series pays for the sampling only
+    """
+    sample_size = 1024
+    bypass_samples = 63
+
+    def __init__(self, config: SeriesKeyCacheConfig):
+        self.config = config
+        self._entries: "OrderedDict[Hashable, str]" = OrderedDict()
+        self._stats = SeriesKeyCacheStats()
+        self._lock = threading.Lock()
+        # lookups left in the current sample and the hits among them, or bypassed lookups left when negative
+        self._sample_left = self.sample_size
+        self._sample_hits = 0
+
+    def get(self, point: Union[Point, CompactPoint]) -> Optional[str]:
+        """
+        the series_key of point, None while the cache is bypassed
+        """
+        if isinstance(point, CompactPoint):
+            key = (point.measurement, point.tag_keys, point.tag_values)
+        else:
+            key = (point.measurement, tuple(point.tags.items()) if point.tags else ())
+        with self._lock:
+            if self._sample_left < 0:
+                self._bypass(1)
+                return None
+            self._sample_left -= 1
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self._stats.hits += 1
+                self._sample_hits += 1
+            else:
+                self._stats.misses += 1
+                value = series_key(point)
+                self._put(key, value)
+            if self._sample_left == 0:
+                self._end_sample()
+            return value
+
+    def bypassing(self, lookups: int) -> bool:
+        """
+        whether the next lookups points are escaped without the cache, they are counted as bypassed then;
+        lets a serializer skip the per point lookups of a whole batch
+        """
+        with self._lock:
+            if self._sample_left >= 0:
+                return False
+            self._bypass(lookups)
+            return True
+
+    def _bypass(self, lookups: int):
+        self._stats.bypassed += lookups
+        self._sample_left += lookups
+        if self._sample_left >= 0:
+            self._sample_left = self.sample_size
+
+    def _put(self, key: tuple, value: str):
+        size = self._entry_size(key, value)
+        if 0 < self.config.max_bytes < size:
+            return
+        self._entries[key] = value
+        self._stats.size += size
+        while len(self._entries) > self.config.max_entries or 0 < self.config.max_bytes < self._stats.size:
+            self._stats.size -= self._entry_size(*self._entries.popitem(last=False))
+            self._stats.evictions += 1
+
+    @staticmethod
+    def _entry_size(key: tuple, value: str) -> int:
+        # a Point key owns its tuple of tag items, a CompactPoint key shares the tuples of the point
+        size = sys.getsizeof(key) + sys.getsizeof(value) + _EntryOverhead
+        if len(key) == 2:
+            size += sys.getsizeof(key[1]) + _TagItemOverhead * len(key[1])
+        return size
+
+    def _end_sample(self):
+        if self._sample_hits < self.config.min_hit_rate * self.sample_size:
+            self._sample_left = -self.sample_size * self.bypass_samples
+        else:
+            self._sample_left = self.sample_size
+        self._sample_hits = 0
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._stats.size = 0
+
+    def stats(self) -> SeriesKeyCacheStats:
+        with self._lock:
+            return SeriesKeyCacheStats(**{**vars(self._stats), 'entries': len(self._entries)})
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def new_series_key_cache(series_key_cache_config: Optional[SeriesKeyCacheConfig]) -> Optional[SeriesKeyCache]:
+    return None if series_key_cache_config is None else SeriesKeyCache(series_key_cache_config)
+
+
+def write_point(parts: List[str], point: Union[Point, CompactPoint], series_keys: Optional[SeriesKeyCache] = None):
+    """
+    append the line protocol of point to parts, without the trailing newline, taking the escaped measurement
+    and tags from series_keys when given
+    """
+    fields = point.field_keys if isinstance(point, CompactPoint) else point.fields
+    if len(point.measurement) == 0 or len(fields) == 0:
+        return
+    key = None if series_keys is None else series_keys.get(point)
+    if key is not None:
+        parts.append(key)
+    else:
+        parts.append(escape_measurement(point.measurement))
+        for k, v in point.tag_items():
+            parts.append(',')
+            parts.append(escape_tag(k))
+            parts.append('=')
+            parts.append(escape_tag(v))
+    sep = ' '
+    for k, v in point.field_items():
+        parts.append(sep)
+        sep = ','
+        parts.append(escape_tag(k))
+        parts.append('=')
+        _write_field_value(parts, v)
+    if point.timestamp is not None:
+        parts.append(' ')
+        parts.append(str(point.generate_timestamp()))
+
+
+def point_to_string(point: Union[Point, CompactPoint]) -> str:
+    parts = []
+    write_point(parts, point)
+    return ''.join(parts)
+
+
+def _spans(points: List[Optional[Union[Point, CompactPoint]]], series_keys: Optional[SeriesKeyCache]) \
+        -> Iterator[Tuple[List[Optional[Union[Point, CompactPoint]]], Optional[SeriesKeyCache]]]:
+    # split points into runs written with series_keys and the rest, which the cache bypasses as a whole
+    # instead of being asked for every point
+    start = 0
+    while series_keys is not None and start < len(points):
+        if series_keys.bypassing(len(points) - start):
+            break
+        end = start + series_keys.sample_size
+        yield points[start:end], series_keys
+        start = end
+    if start < len(points):
+        yield points if start == 0 else points[start:], None
+
+
+def encode_batch_points(batch_points: BatchPoints, series_keys: Optional[SeriesKeyCache] = None) -> bytes:
+    """
+    serialize all points of batch_points into one newline separated line protocol body
+    """
+    parts = []
+    for points, keys in _spans(batch_points.points, series_keys):
+        for point in points:
+            if point is None:
+                continue
+            write_point(parts, point, keys)
+            parts.append('\n')
+    return ''.join(parts).encode()
+
+
+def iter_batch_points(batch_points: BatchPoints, chunk_size: int = 64 * 1024,
+                      series_keys: Optional[SeriesKeyCache] = None) -> Iterator[bytes]:
+    """
+    serialize batch_points into encoded chunks of about chunk_size characters, so the whole body
+    never has to exist at once
+    """
+    parts = []
+    size = 0
+    for points, keys in _spans(batch_points.points, series_keys):
+        for point in points:
+            if point is None:
+                continue
+            start = len(parts)
+            write_point(parts, point, keys)
+            parts.append('\n')
+            size += sum(len(part) for part in parts[start:])
+            if size >= chunk_size:
+                yield ''.join(parts).encode()
+                parts = []
+                size = 0
+    if parts:
+        yield ''.join(parts).encode()
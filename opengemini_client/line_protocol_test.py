@@ -0,0 +1,143 @@
+# Copyright 2025 openGemini Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import io
+import random
+import unittest
+from datetime import datetime
+
+from opengemini_client import line_protocol
+from opengemini_client import models
+
+_alphabet = 'ab, =",\\\\xyzé中'
+
+
+def random_string(rnd: random.Random) -> str:
+    return ''.join(rnd.choice(_alphabet) for _ in range(rnd.randint(0, 8)))
+
+
+def random_point(rnd: random.Random) -> models.Point:
+    fields = {}
+    for _ in range(rnd.randint(0, 4)):
+        kind = rnd.randint(0, 4)
+        if kind == 0:
+            value = rnd.randint(-2 ** 63, 2 ** 63 - 1)
+        elif kind == 1:
+            value = rnd.uniform(-1e10, 1e10)
+        elif kind == 2:
+            value = rnd.random() < 0.5
+        elif kind == 3:
+            value = random_string(rnd)
+        else:
+            value = None
+        fields[random_string(rnd)] = value
+    tags = {random_string(rnd): random_string(rnd) for _ in range(rnd.randint(0, 3))}
+    timestamp = None
+    if rnd.random() < 0.8:
+        timestamp = datetime.fromtimestamp(rnd.randint(0, 2 ** 31) + rnd.random())
+    return models.Point(measurement=random_string(rnd), precision=rnd.choice(list(models.Precision)),
+                        fields=fields, tags=tags, timestamp=timestamp)
+
+
+class LineProtocolTest(unittest.TestCase):
+
+    def test_escape_matches_chars_to_escape(self):
+        rnd = random.Random(1)
+        for _ in range(5000):
+            s = random_string(rnd)
+            for escape_str, escape in ((', ', line_protocol.escape_measurement),
+                                       (', =', line_protocol.escape_tag),
+                                       ('"', line_protocol.escape_string_field)):
+                with io.StringIO() as writer:
+                    models.chars_to_escape(writer, s, escape_str)
+                    self.assertEqual(writer.getvalue(), escape(s), repr(s))
+
+    def test_escape_returns_same_string_without_special_chars(self):
+        s = 'cpu_usage'
+        self.assertIs(s, line_protocol.escape_tag(s))
+
+    def test_point_to_string_matches_point(self):
+        rnd = random.Random(2)
+        for _ in range(5000):
+            point = random_point(rnd)
+            self.assertEqual(point.to_string(), line_protocol.point_to_string(point))
+
+    def test_encode_batch_points_matches_point(self):
+        rnd = random.Random(3)
+        points = [random_point(rnd) for _ in range(1000)]
+        points.insert(10, None)
+        expected = ''.join(point.to_string() + '\n' for point in points if point is not None).encode()
+        self.assertEqual(expected, line_protocol.encode_batch_points(models.BatchPoints(points=points)))
+
+
+class SmallSampleCache(line_protocol.SeriesKeyCache):
+    sample_size = 4
+    bypass_samples = 2
+
+
+def series_points(hosts: range) -> models.BatchPoints:
+    return models.BatchPoints(points=[
+        models.Point(measurement='cpu load', precision=models.Precision.PrecisionSecond, fields={'v': 1},
+                     tags={'host': f'h {i}', 'region': 'eu,west'}, timestamp=1700000000) for i in hosts])
+
+
+class SeriesKeyCacheTest(unittest.TestCase):
+
+    def test_encodes_like_point(self):
+        rnd = random.Random(6)
+        batch = models.BatchPoints(points=[random_point(rnd) for _ in range(3000)] + [None])
+        cache = line_protocol.SeriesKeyCache(models.SeriesKeyCacheConfig(min_hit_rate=0))
+        expected = line_protocol.encode_batch_points(batch)
+        for _ in range(2):
+            self.assertEqual(expected, line_protocol.encode_batch_points(batch, cache))
+            self.assertEqual(expected, line_protocol.encode_batch_points(batch.compact(), cache))
+            self.assertEqual(expected, b''.join(line_protocol.iter_batch_points(batch, 100, cache)))
+        self.assertGreater(cache.stats().hits, 0)
+
+    def test_lru_bounds(self):
+        cache = line_protocol.SeriesKeyCache(models.SeriesKeyCacheConfig(max_entries=2))
+        line_protocol.encode_batch_points(series_points(range(3)), cache)
+        line_protocol.encode_batch_points(series_points(range(1, 3)), cache)
+        stats = cache.stats()
+        self.assertEqual((2, 3, 1, 2), (stats.hits, stats.misses, stats.evictions, stats.entries))
+        self.assertAlmostEqual(0.4, stats.hit_rate)
+        self.assertGreater(stats.size, 0)
+        cache.clear()
+        self.assertEqual((0, 0), (len(cache), cache.stats().size))
+
+        size = stats.size // 2
+        cache = line_protocol.SeriesKeyCache(models.SeriesKeyCacheConfig(max_bytes=size + 1))
+        line_protocol.encode_batch_points(series_points(range(3)), cache)
+        self.assertEqual(1, len(cache))
+        self.assertLessEqual(cache.stats().size, size + 1)
+
+    def test_bypass_low_hit_rate(self):
+        cache = SmallSampleCache(models.SeriesKeyCacheConfig())
+        batch = series_points(range(8))
+        self.assertEqual(line_protocol.encode_batch_points(batch), line_protocol.encode_batch_points(batch, cache))
+        self.assertEqual((0, 4, 4), (cache.stats().hits, cache.stats().misses, cache.stats().bypassed))
+        self.assertTrue(cache.bypassing(4))
+        self.assertFalse(cache.bypassing(1))
+        for _ in range(3):
+            line_protocol.encode_batch_points(series_points(range(4)), cache)
+        self.assertEqual(12, cache.stats().hits)
+        self.assertEqual(8, cache.stats().bypassed)
+
+    def test_check_config(self):
+        line_protocol.check_series_key_cache_config(None)
+        line_protocol.check_series_key_cache_config(models.SeriesKeyCacheConfig())
+        for config in [models.SeriesKeyCacheConfig(max_entries=0), models.SeriesKeyCacheConfig(max_bytes=-1),
+                       models.SeriesKeyCacheConfig(min_hit_rate=1.5)]:
+            with self.assertRaises(ValueError):
+                line_protocol.check_series_key_cache_config(config)
@@ -13,10 +13,16 @@
 # limitations under the License.
 
 import io
+import numbers
 from dataclasses import field, dataclass
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from enum import Enum
-from typing import Dict, Union, Optional, List, Any
+from typing import Dict, Union, Optional, List, Any, Iterable, Sequence, Set, Tuple, Type
+
+import numpy
+
+from opengemini_client.codec.json_decode import JsonDecoder
+from opengemini_client.columnar import ColumnarSeries, to_columns
 
 
 @dataclass
@@ -45,10 +51,144 @@ class TlsConfig:
     ca_file: str = ''
 
 
+class OverflowPolicy(Enum):
+    # wait up to block_timeout for queued points to be sent, then raise
+    BLOCK = 0
+    # drop the points queued the longest to make room
+    DROP_OLDEST = 1
+    # drop the points being written
+    DROP_NEWEST = 2
+    # raise without waiting
+    RAISE = 3
+
+
 @dataclass
 class BatchConfig:
+    # batch time interval that triggers batch processing (unit: ms)
     batch_interval: int
+    # batch size that triggers batch processing
     batch_size: int
+    # bound on the points queued over all databases and retention policies, 0 means unbounded
+    max_queued_points: int = 0
+    # bound on the estimated memory of the queued points, 0 means unbounded
+    max_queued_bytes: int = 0
+    # what a write does when the queue is full
+    overflow_policy: OverflowPolicy = OverflowPolicy.BLOCK
+    # longest time a write waits for room with OverflowPolicy.BLOCK
+    block_timeout: timedelta = timedelta(seconds=10)
+
+
+@dataclass
+class ParallelWriteConfig:
+    # number of points in every sub-batch of write_batch_points_parallel
+    sub_batch_size: int = 5000
+    # size of the thread pool that sends sub-batches, 0 means one thread per address
+    max_workers: int = 0
+
+
+class BalanceStrategy(Enum):
+    ROUND_ROBIN = 0
+    # the endpoint with the fewest requests in flight
+    LEAST_OUTSTANDING = 1
+    # the endpoint with the lowest latency average weighted by its requests in flight
+    EWMA = 2
+
+
+@dataclass
+class BalancerConfig:
+    strategy: BalanceStrategy = BalanceStrategy.ROUND_ROBIN
+    # consecutive failures after which an endpoint stops receiving requests, 0 never ejects
+    max_failures: int = 3
+    # how long an ejected endpoint is left alone before it is probed
+    eject_duration: timedelta = timedelta(seconds=10)
+    # weight of the newest latency sample in the moving average of the EWMA strategy
+    ewma_alpha: float = 0.3
+    # check ejected endpoints with ping (http) or Ping (grpc) before sending requests again
+    probe_enabled: bool = True
+
+
+@dataclass
+class RetryConfig:
+    # attempts of a request including the first one
+    max_attempts: int = 3
+    # the wait before retry n is random between 0 and min(max_backoff, initial_backoff * multiplier ** (n - 1))
+    initial_backoff: timedelta = timedelta(milliseconds=100)
+    max_backoff: timedelta = timedelta(seconds=5)
+    multiplier: float = 2.0
+    # http status codes of responses that are retried
+    retryable_status_codes: Set[int] = field(default_factory=lambda: {429, 500, 502, 503, 504})
+    # exception types that are retried, None retries connection errors and timeouts of the transport
+    retryable_exceptions: Optional[Tuple[Type[BaseException], ...]] = None
+    # send retries to the next endpoint picked by the balancer instead of the one that failed
+    failover: bool = True
+
+
+@dataclass
+class HedgeConfig:
+    # a query not answered after this percentile of recent query latencies is sent to a second endpoint
+    percentile: float = 0.95
+    # number of recent query latencies the percentile is computed from
+    window: int = 1000
+    # below min_samples latencies initial_delay is used instead of the percentile
+    min_samples: int = 20
+    initial_delay: timedelta = timedelta(milliseconds=100)
+    # lower bound of the hedge delay
+    min_delay: timedelta = timedelta(milliseconds=5)
+    # threads of the sync client running hedged queries
+    max_workers: int = 16
+
+
+@dataclass
+class QueryCacheConfig:
+    # results of the most recently used queries kept
+    max_entries: int = 1000
+    # bound on the summed response body size of the cached results in bytes, 0 leaves it unbounded
+    max_bytes: int = 0
+    # time a result is served from the cache after it was received
+    ttl: timedelta = timedelta(seconds=10)
+    # drop the cached results of queries reading a measurement whenever this client writes to it
+    invalidate_on_write: bool = True
+
+
+@dataclass
+class MetadataCacheConfig:
+    # results of the most recently used show queries kept
+    max_entries: int = 1000
+    # time a show result is served from the cache after it was received
+    ttl: timedelta = timedelta(seconds=30)
+
+
+@dataclass
+class SeriesKeyCacheConfig:
+    # escaped measurement and tag prefixes of the most recently written series kept
+    max_entries: int = 10000
+    # bound on the estimated memory of the cached prefixes in bytes, 0 leaves it unbounded
+    max_bytes: int = 0
+    # the cache is bypassed for a while when fewer lookups than this hit it, so high cardinality writes
+    # escape their tags directly instead of churning the cache
+    min_hit_rate: float = 0.5
+
+
+@dataclass
+class SpoolConfig:
+    # directory of the segment files, created when missing
+    directory: str
+    # a segment file is closed and the next one started once it would grow beyond segment_size bytes
+    segment_size: int = 64 * 1024 * 1024
+    # bound on the summed size of the segment files, a write that does not fit raises its error
+    max_bytes: int = 1024 * 1024 * 1024
+    # fsync every appended batch, otherwise it reaches the disk when the operating system writes it back
+    fsync: bool = False
+    # pause between the pings that check whether spooled batches can be replayed
+    replay_interval: timedelta = timedelta(seconds=5)
+
+
+class CompressMethod(Enum):
+    # values match the CompressMethod enum of write.proto
+    UNCOMPRESSED = 0
+    LZ4_FAST = 1
+    ZSTD_FAST = 2
+    SNAPPY = 3
 
 
 @dataclass
@@ -57,6 +197,8 @@ class GrpcConfig:
     auth_config: AuthConfig = None
     tls_enable: bool = False
     tls_config: TlsConfig = None
+    # compress every record block, the codec package must be installed
+    compress_method: CompressMethod = CompressMethod.UNCOMPRESSED
 
 
 @dataclass
@@ -70,6 +212,31 @@ class Config:
     auth_config: AuthConfig = None
     tls_config: TlsConfig = None
     grpc_config: GrpcConfig = None
+    # gzip compression level of request bodies, from 1 (fastest) to 9 (smallest)
+    gzip_level: int = 9
+    # request bodies smaller than gzip_min_size bytes are sent uncompressed
+    gzip_min_size: int = 0
+    # serialize and compress write bodies incrementally and send them with chunked transfer encoding
+    gzip_streaming: bool = False
+    # split write_batch_points_parallel batches and send them concurrently to every address
+    parallel_write_config: ParallelWriteConfig = None
+    # endpoint selection and health tracking of both http and grpc addresses, round robin by default
+    balancer_config: BalancerConfig = None
+    # retry failed requests, None sends every request once
+    retry_config: RetryConfig = None
+    # send a slow query a second time to another endpoint and use the first answer, None disables hedging
+    hedge_config: HedgeConfig = None
+    # cache the results of select queries on the client, None sends every query to the server
+    query_cache_config: QueryCacheConfig = None
+    # cache the results of the show_* schema lookups, None sends every lookup to the server
+    metadata_cache_config: MetadataCacheConfig = None
+    # keep batches that fail because the cluster is unreachable on disk and replay them once it answers again,
+    # while batches are spooled new ones are appended behind them
+    spool_config: SpoolConfig = None
+    # reuse the escaped measurement and tags of series written again, None escapes them for every point
+    series_key_cache_config: SeriesKeyCacheConfig = None
+    # decode query response bodies, None picks orjson or ujson when installed and the json module otherwise
+    json_decoder: JsonDecoder = None
 
 
 @dataclass
@@ -117,20 +284,67 @@ class Precision(Enum):
             unit = ''
         return unit
 
-
-def round_datetime(dt: datetime, round_to: timedelta):
-    if round_to.seconds == 0:
-        microseconds = int(dt.timestamp() * 1000 * 1000)
-        rounding = round(microseconds / round_to.microseconds) * round_to.microseconds
-        rd = rounding * 1000
-    elif round_to.seconds == 1:
-        rd = round(dt.timestamp()) * 1000 * 1000 * 1000
-    else:
-        seconds = (dt - dt.min).seconds
-        rounding = round(seconds / round_to.seconds) * round_to.seconds
-        dt = datetime(dt.year, dt.month, dt.day) + timedelta(seconds=rounding)
-        rd = int(dt.timestamp()) * 1000 * 1000 * 1000
-    return rd
+    def nanoseconds(self) -> int:
+        """
+        number of nanoseconds in one unit of this precision
+        """
+        return _precision_nanoseconds[self]
+
+
+_precision_nanoseconds = {
+    Precision.PrecisionNanoSecond: 1,
+    Precision.PrecisionMicrosecond: 1000,
+    Precision.PrecisionMillisecond: 1000 * 1000,
+    Precision.PrecisionSecond: 1000 * 1000 * 1000,
+    Precision.PrecisionMinute: 60 * 1000 * 1000 * 1000,
+    Precision.PrecisionHour: 60 * 60 * 1000 * 1000 * 1000,
+}
+
+
+_Epoch = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_Microsecond = timedelta(microseconds=1)
+
+# a datetime, an integer epoch in the precision of the point, or a NumPy datetime64
+Timestamp = Union[datetime, int, numpy.datetime64]
+
+
+def round_nanoseconds(ns: int, unit: int) -> int:
+    """
+    round ns to a multiple of unit, halves to even like round
+    """
+    quotient, remainder = divmod(ns, unit)
+    if remainder * 2 > unit or (remainder * 2 == unit and quotient % 2 == 1):
+        quotient += 1
+    return quotient * unit
+
+
+def datetime_to_ns(dt: datetime) -> int:
+    """
+    exact integer nanoseconds since the epoch, a naive datetime is local time like in datetime.timestamp
+    """
+    if dt.tzinfo is None:
+        dt = dt.astimezone()
+    return (dt - _Epoch) // _Microsecond * 1000
+
+
+def timestamps_to_ns(timestamps: Union[numpy.ndarray, Sequence[Any]],
+                     precision: 'Precision' = None) -> numpy.ndarray:
+    """
+    int64 nanosecond epochs of a whole column of timestamps, integer epochs in precision or datetime64 values
+    rounded to precision, nanoseconds by default
+    """
+    unit = 1 if precision is None else precision.nanoseconds()
+    values = numpy.asarray(timestamps)
+    if values.dtype.kind in 'iu':
+        return values.astype(numpy.int64) * unit
+    if values.dtype.kind != 'M':
+        raise ValueError(f"timestamps must be integer epochs or datetime64 values, got {values.dtype}")
+    ns = values.astype('datetime64[ns]').view(numpy.int64)
+    if unit == 1:
+        return ns
+    quotient, remainder = numpy.divmod(ns, unit)
+    quotient += (remainder * 2 > unit) | ((remainder * 2 == unit) & (quotient % 2 == 1))
+    return quotient * unit
 
 
 def chars_to_escape(writer: io.StringIO, s: str, escape_str: str):
@@ -145,13 +359,58 @@ def chars_to_escape(writer: io.StringIO, s: str, escape_str: str):
         writer.write(s[i])
 
 
+# rough memory of a point beyond its strings: the object and its attribute, tags and fields dicts
+_PointOverhead = 300
+# rough memory of a tag or field beyond its strings: the dict slot and the key and value objects
+_PointItemOverhead = 70
+# the same for CompactPoint: the slotted object and its two value tuples, a tuple slot and the value object;
+# the key tuples are shared between points and not counted
+_CompactPointOverhead = 160
+_CompactPointItemOverhead = 40
+
+FieldValue = Union[str, int, float, bool]
+
+
+def estimate_point_size(point: Union['Point', 'CompactPoint']) -> int:
+    """
+    approximate bytes of memory held by point, cheap enough to account every queued point
+    """
+    if isinstance(point, CompactPoint):
+        size = _CompactPointOverhead + len(point.measurement)
+        for value in point.tag_values:
+            size += _CompactPointItemOverhead + len(value)
+        for value in point.field_values:
+            size += _CompactPointItemOverhead + (len(value) if isinstance(value, str) else 0)
+        return size
+    size = _PointOverhead + len(point.measurement)
+    for key, value in point.tags.items():
+        size += _PointItemOverhead + len(key) + len(value)
+    for key, value in point.fields.items():
+        size += _PointItemOverhead + len(key) + (len(value) if isinstance(value, str) else 0)
+    return size
+
+
+def timestamp_to_ns(ts: Optional[Timestamp], precision: Precision) -> int:
+    """
+    the timestamp in integer nanoseconds, 0 for None: an integer epoch is read in precision, a datetime or
+    datetime64 is rounded to precision
+    """
+    if ts is None:
+        return 0
+    if isinstance(ts, numbers.Integral):
+        return int(ts) * precision.nanoseconds()
+    if isinstance(ts, numpy.datetime64):
+        return round_nanoseconds(int(ts.astype('datetime64[ns]').astype(numpy.int64)), precision.nanoseconds())
+    return round_nanoseconds(datetime_to_ns(ts), precision.nanoseconds())
+
+
 @dataclass
 class Point:
     measurement: str
     precision: Precision
     fields: Dict[str, Union[str, int, float, bool]]
     tags: Dict[str, str] = field(default_factory=dict)
-    timestamp: Optional[datetime] = None
+    timestamp: Optional[Timestamp] = None
 
     def add_tag(self, key: str, value: str):
         self.tags[key] = value
@@ -159,7 +418,7 @@ class Point:
     def add_field(self, key: str, value: Union[str, int, float, bool]):
         self.fields[key] = value
 
-    def set_time(self, time: datetime):
+    def set_time(self, time: Timestamp):
         self.timestamp = time
 
     def set_measurement(self, name: str):
@@ -209,23 +468,12 @@ class Point:
                 else:
                     writer.write('F')
 
-    def generate_timestamp(self):
-        ts = 0
-        if self.timestamp is None:
-            return ts
-        if self.precision == Precision.PrecisionMicrosecond:
-            ts = round_datetime(self.timestamp, timedelta(microseconds=1))
-        elif self.precision == Precision.PrecisionMillisecond:
-            ts = round_datetime(self.timestamp, timedelta(milliseconds=1))
-        elif self.precision == Precision.PrecisionSecond:
-            ts = round_datetime(self.timestamp, timedelta(seconds=1))
-        elif self.precision == Precision.PrecisionMinute:
-            ts = round_datetime(self.timestamp, timedelta(minutes=1))
-        elif self.precision == Precision.PrecisionHour:
-            ts = round_datetime(self.timestamp, timedelta(hours=1))
-        else:
-            ts = self.timestamp.timestamp() * 1000 * 1000 * 1000
-        return ts
+    def generate_timestamp(self) -> int:
+        """
+        the timestamp in integer nanoseconds: an integer epoch is read in precision, a datetime or datetime64
+        is rounded to precision
+        """
+        return timestamp_to_ns(self.timestamp, self.precision)
 
     def write_timestamp(self, writer: io.StringIO):
         if self.timestamp is None:
@@ -233,10 +481,141 @@ class Point:
         writer.write(' ')
         writer.write(str(self.generate_timestamp()))
 
+    def tag_items(self) -> Iterable[Tuple[str, str]]:
+        return () if self.tags is None else self.tags.items()
+
+    def field_items(self) -> Iterable[Tuple[str, FieldValue]]:
+        return self.fields.items()
+
+
+class CompactPoint:
+    """
+    memory lean point for large batches, accepted by every write path alongside Point: the instance has no
+    __dict__ and keeps tags and fields as tuples of keys and values, the key tuples are meant to be shared
+    by the points of a series, see from_point
+    """
+    __slots__ = ('measurement', 'precision', 'tag_keys', 'tag_values', 'field_keys', 'field_values', 'timestamp')
+
+    def __init__(self, measurement: str, precision: Precision, field_keys: Tuple[str, ...],
+                 field_values: Tuple[FieldValue, ...], tag_keys: Tuple[str, ...] = (),
+                 tag_values: Tuple[str, ...] = (), timestamp: Optional[Timestamp] = None):
+        if len(field_keys) != len(field_values) or len(tag_keys) != len(tag_values):
+            raise ValueError("compact point keys and values must have the same length")
+        self.measurement = measurement
+        self.precision = precision
+        self.tag_keys = tag_keys
+        self.tag_values = tag_values
+        self.field_keys = field_keys
+        self.field_values = field_values
+        self.timestamp = timestamp
+
+    @classmethod
+    def from_point(cls, point: Point, keys: Optional[Dict[Tuple[str, ...], Tuple[str, ...]]] = None) \
+            -> 'CompactPoint':
+        """
+        the compact form of point, key tuples equal to one in keys are replaced by it and new ones added
+        """
+        tag_keys, field_keys = tuple(point.tags or ()), tuple(point.fields)
+        if keys is not None:
+            tag_keys = keys.setdefault(tag_keys, tag_keys)
+            field_keys = keys.setdefault(field_keys, field_keys)
+        return cls(point.measurement, point.precision, field_keys, tuple(point.fields.values()), tag_keys,
+                   tuple((point.tags or {}).values()), point.timestamp)
+
+    @property
+    def tags(self) -> Dict[str, str]:
+        return dict(zip(self.tag_keys, self.tag_values))
+
+    @property
+    def fields(self) -> Dict[str, FieldValue]:
+        return dict(zip(self.field_keys, self.field_values))
+
+    def tag_items(self) -> Iterable[Tuple[str, str]]:
+        return zip(self.tag_keys, self.tag_values)
+
+    def field_items(self) -> Iterable[Tuple[str, FieldValue]]:
+        return zip(self.field_keys, self.field_values)
+
+    def generate_timestamp(self) -> int:
+        return timestamp_to_ns(self.timestamp, self.precision)
+
+    def to_point(self) -> Point:
+        return Point(measurement=self.measurement, precision=self.precision, fields=self.fields, tags=self.tags,
+                     timestamp=self.timestamp)
+
+    def to_string(self) -> str:
+        return self.to_point().to_string()
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, CompactPoint):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return (f"CompactPoint(measurement={self.measurement!r}, precision={self.precision}, "
+                f"tags={self.tags!r}, fields={self.fields!r}, timestamp={self.timestamp!r})")
+
 
 @dataclass
 class BatchPoints:
-    points: List[Point] = field(default_factory=list)
+    points: List[Union[Point, CompactPoint]] = field(default_factory=list)
+    # bound on the estimated memory of the points that add_point keeps to, 0 means unbounded
+    max_bytes: int = 0
+    # running estimate of the points, counted by estimated_size and kept up by add_point
+    _size: Optional[int] = field(default=None, init=False, repr=False, compare=False)
+
+    def estimated_size(self) -> int:
+        """
+        approximate bytes of memory held by the points, see estimate_point_size
+        """
+        self._size = sum(estimate_point_size(point) for point in self.points if point is not None)
+        return self._size
+
+    def add_point(self, point: Union[Point, CompactPoint]) -> bool:
+        """
+        append point unless that takes the estimated memory beyond max_bytes, returns whether it was appended;
+        points appended to points directly are counted by the next estimated_size
+        """
+        if self._size is None:
+            self.estimated_size()
+        size = estimate_point_size(point)
+        if 0 < self.max_bytes < self._size + size:
+            return False
+        self.points.append(point)
+        self._size += size
+        return True
+
+    def compact(self) -> 'BatchPoints':
+        """
+        the same batch with every Point replaced by a CompactPoint, points with the same keys share them
+        """
+        keys = {}
+        points = [CompactPoint.from_point(point, keys) if isinstance(point, Point) else point
+                  for point in self.points if point is not None]
+        return BatchPoints(points=points, max_bytes=self.max_bytes)
+
+
+@dataclass
+class SubBatchResult:
+    index: int
+    endpoint: str
+    batch_points: BatchPoints
+    error: Optional[Exception] = None
+
+
+@dataclass
+class ParallelWriteResult:
+    sub_batches: List[SubBatchResult] = field(default_factory=list)
+
+    @property
+    def failed(self) -> List[SubBatchResult]:
+        return [sub for sub in self.sub_batches if sub.error is not None]
+
+    @property
+    def success(self) -> bool:
+        return all(sub.error is None for sub in self.sub_batches)
 
 
 @dataclass
@@ -246,6 +625,23 @@ class Series:
     columns: List[str] = field(default_factory=list)
     values: List[List[Any]] = field(default_factory=list)
 
+    def to_columnar(self, precision: 'Precision' = None) -> ColumnarSeries:
+        """
+        one typed NumPy array per column, integer timestamps are read in precision, nanoseconds by default
+        """
+        unit = Precision.PrecisionNanoSecond if precision is None else precision
+        return ColumnarSeries(name=self.name, tags=self.tags,
+                              columns=to_columns(self.columns, self.values, unit.nanoseconds()))
+
+
+class ResponseFormat(Enum):
+    """
+    encoding of query responses, sent as the Accept header; MSGPACK needs the msgpack package
+    """
+    JSON = 'application/json'
+    MSGPACK = 'application/x-msgpack'
+    CSV = 'text/csv'
+
 
 @dataclass
 class Query:
@@ -253,6 +649,7 @@ class Query:
     command: str
     retention_policy: str
     precision: Precision = Precision.PrecisionNanoSecond
+    response_format: ResponseFormat = ResponseFormat.JSON
 
 
 @dataclass
@@ -265,6 +662,14 @@ class SeriesResult:
 class QueryResult:
     results: List[SeriesResult] = field(default_factory=list)
     error: str = None
+    # precision of the integer timestamps in the results, set by the client from Query.precision
+    precision: Precision = Precision.PrecisionNanoSecond
+
+    def to_columnar(self) -> List[ColumnarSeries]:
+        """
+        the series of all statements in columnar form, see Series.to_columnar
+        """
+        return [series.to_columnar(self.precision) for res in self.results for series in res.series]
 
     def _has_error(self) -> str:
         if self.error is not None:
@@ -0,0 +1,121 @@
+# Copyright 2025 openGemini Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import random
+import unittest
+from datetime import datetime, timedelta, timezone
+
+import numpy
+
+from opengemini_client import grpc_client, line_protocol, models
+from opengemini_client.line_protocol_test import random_point
+
+
+class PointTimestampTest(unittest.TestCase):
+
+    def point(self, timestamp, precision: models.Precision = models.Precision.PrecisionNanoSecond) -> models.Point:
+        return models.Point(measurement='m', precision=precision, fields={'v': 1}, timestamp=timestamp)
+
+    def test_integer_epoch_in_precision(self):
+        self.assertEqual(1700000000123456789, self.point(1700000000123456789).generate_timestamp())
+        self.assertEqual(1700000000000000000,
+                         self.point(1700000000, models.Precision.PrecisionSecond).generate_timestamp())
+        self.assertEqual(1700000000123000000,
+                         self.point(numpy.int64(1700000000123), models.Precision.PrecisionMillisecond)
+                         .generate_timestamp())
+        self.assertEqual('m v=1i 1700000000123456789', self.point(1700000000123456789).to_string())
+
+    def test_datetime_is_exact(self):
+        dt = datetime(2023, 11, 14, 22, 13, 20, 123457, tzinfo=timezone.utc)
+        ts = self.point(dt).generate_timestamp()
+        self.assertIsInstance(ts, int)
+        self.assertEqual(1700000000123457000, ts)
+        self.assertEqual(1700000000123000000,
+                         self.point(dt, models.Precision.PrecisionMillisecond).generate_timestamp())
+        # naive datetimes are local time
+        self.assertEqual(1700000000500000000, self.point(datetime.fromtimestamp(1700000000.5)).generate_timestamp())
+
+    def test_minute_and_hour_rounding(self):
+        # rounded on the epoch for every precision, aware and naive datetimes alike
+        dt = datetime(2023, 11, 14, 22, 43, 30, tzinfo=timezone.utc)
+        self.assertEqual(1700001840000000000, self.point(dt, models.Precision.PrecisionMinute).generate_timestamp())
+        self.assertEqual(1700002800000000000, self.point(dt, models.Precision.PrecisionHour).generate_timestamp())
+        self.assertEqual(1700002800000000000, self.point(dt.astimezone(timezone(timedelta(hours=5, minutes=30))),
+                                                         models.Precision.PrecisionHour).generate_timestamp())
+        self.assertEqual(1700002800000000000, self.point(datetime.fromtimestamp(dt.timestamp()),
+                                                         models.Precision.PrecisionHour).generate_timestamp())
+
+    def test_datetime64_rounded_to_precision(self):
+        ts = numpy.datetime64('2023-11-14T22:13:20.123456789', 'ns')
+        self.assertEqual(1700000000123456789, self.point(ts).generate_timestamp())
+        self.assertEqual(1700000000123457000,
+                         self.point(ts, models.Precision.PrecisionMicrosecond).generate_timestamp())
+        self.assertEqual(1700000000000000000, self.point(numpy.datetime64('2023-11-14T22:13:20.5'),
+                                                         models.Precision.PrecisionSecond).generate_timestamp())
+
+    def test_timestamps_to_ns_matches_point(self):
+        rnd = random.Random(4)
+        for precision in models.Precision:
+            ints = [rnd.randint(0, 2 ** 62 // precision.nanoseconds()) for _ in range(100)]
+            dts = numpy.array([rnd.randint(0, 2 ** 62) for _ in range(100)], dtype='datetime64[ns]')
+            for column in (ints, dts):
+                expected = [self.point(ts, precision).generate_timestamp() for ts in column]
+                self.assertEqual(expected, models.timestamps_to_ns(column, precision).tolist())
+
+    def test_timestamps_to_ns_rejects_floats(self):
+        with self.assertRaises(ValueError):
+            models.timestamps_to_ns(numpy.array([1700000000.5]), models.Precision.PrecisionSecond)
+        with self.assertRaises(ValueError):
+            models.timestamps_to_ns([1700000000.0, 1700000001.0])
+
+
+class CompactPointTest(unittest.TestCase):
+
+    def test_encodes_like_point(self):
+        rnd = random.Random(5)
+        points = [random_point(rnd) for _ in range(1000)]
+        compact = models.BatchPoints(points=points).compact()
+        self.assertEqual(line_protocol.encode_batch_points(models.BatchPoints(points=points)),
+                         line_protocol.encode_batch_points(compact))
+        for point, compact_point in zip(points, compact.points):
+            self.assertEqual(point.to_string(), compact_point.to_string())
+
+    def test_records_like_point(self):
+        points = [models.Point(measurement='cpu', precision=models.Precision.PrecisionSecond,
+                               fields={'v': float(i), 'n': i}, tags={'host': f'h{i % 2}'}, timestamp=1700000000 + i)
+                  for i in range(10)]
+        self.assertEqual(grpc_client.points_to_records(models.BatchPoints(points=points)),
+                         grpc_client.points_to_records(models.BatchPoints(points=points).compact()))
+
+    def test_compact_shares_keys(self):
+        points = [models.Point(measurement='cpu', precision=models.Precision.PrecisionSecond, fields={'v': i},
+                               tags={'host': 'a'}) for i in range(3)]
+        compact = models.BatchPoints(points=points).compact().points
+        self.assertIs(compact[0].tag_keys, compact[2].tag_keys)
+        self.assertIs(compact[0].field_keys, compact[1].field_keys)
+        self.assertEqual(points[1], compact[1].to_point())
+        self.assertFalse(hasattr(compact[0], '__dict__'))
+        with self.assertRaises(ValueError):
+            models.CompactPoint('cpu', models.Precision.PrecisionSecond, ('a', 'b'), (1,))
+
+    def test_batch_memory_cap(self):
+        point = models.Point(measurement='cpu', precision=models.Precision.PrecisionSecond, fields={'v': 1})
+        compact = models.CompactPoint.from_point(point)
+        self.assertLess(models.estimate_point_size(compact), models.estimate_point_size(point))
+        batch = models.BatchPoints(max_bytes=2 * models.estimate_point_size(point))
+        self.assertTrue(batch.add_point(point))
+        self.assertTrue(batch.add_point(point))
+        self.assertFalse(batch.add_point(point))
+        self.assertEqual(2, len(batch.points))
+        self.assertEqual(batch.max_bytes, batch.estimated_size())
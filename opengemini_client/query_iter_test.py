@@ -0,0 +1,118 @@
+# Copyright 2025 openGemini Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import random
+import unittest
+from http import HTTPStatus
+
+from requests import HTTPError
+
+from opengemini_client import client_impl, models, test_utils
+from opengemini_client.async_client import AsyncOpenGeminiDBClient
+
+
+def chunked_body(rows: int, chunk_size: int) -> bytes:
+    """
+    a chunked response of two series of rows rows each, in the shape openGemini streams it
+    """
+    docs = []
+    for host in ('h1', 'h2'):
+        for start in range(0, rows, chunk_size):
+            end = min(rows, start + chunk_size)
+            series = {'name': 'cpu', 'tags': {'host': host}, 'columns': ['time', 'value', 'label'],
+                      'values': [[i, i * 0.5, f'v"{i}'] for i in range(start, end)]}
+            if end < rows:
+                series['partial'] = True
+            docs.append({'results': [{'statement_id': 0, 'series': [series], 'partial': host == 'h1' or end < rows}]})
+    return b''.join(json.dumps(doc).encode() + b'\n' for doc in docs)
+
+
+def chunked_handler(rows: int):
+    def handle(request: test_utils.StubRequest) -> test_utils.StubResponse:
+        if request.params.get('chunked') != 'true':
+            return test_utils.StubResponse(status=HTTPStatus.BAD_REQUEST)
+        return test_utils.StubResponse(status=HTTPStatus.OK,
+                                       body=chunked_body(rows, int(request.params['chunk_size'])))
+
+    return handle
+
+
+class JsonLineSplitterTest(unittest.TestCase):
+
+    def test_random_splits(self):
+        body = chunked_body(100, 7)
+        expected = [line for line in body.split(b'\n') if line]
+        rnd = random.Random(1)
+        for _ in range(50):
+            splitter = client_impl.JsonLineSplitter()
+            lines = []
+            pos = 0
+            while pos < len(body):
+                size = rnd.randint(1, 300)
+                lines.extend(splitter.feed(body[pos:pos + size]))
+                pos += size
+            lines.extend(splitter.close())
+            self.assertEqual(expected, lines)
+
+    def test_missing_trailing_newline(self):
+        splitter = client_impl.JsonLineSplitter()
+        self.assertEqual([b'{"a":1}'], splitter.feed(b'{"a":1}\n{"b"'))
+        self.assertEqual([], splitter.feed(b':2}'))
+        self.assertEqual([b'{"b":2}'], splitter.close())
+
+
+class QueryIterTest(unittest.TestCase):
+
+    def test_fragments(self):
+        query = models.Query(database='db0', command='select * from cpu group by host', retention_policy='')
+        with test_utils.StubServer(chunked_handler(25)) as server:
+            with client_impl.OpenGeminiDBClient(models.Config(address=[server.address])) as cli:
+                fragments = list(cli.query_iter(query, chunk_size=10))
+        self.assertEqual('10', server.requests[0].params['chunk_size'])
+        self.assertEqual(['h1'] * 3 + ['h2'] * 3, [f.tags['host'] for f in fragments])
+        self.assertEqual([10, 10, 5] * 2, [len(f.values) for f in fragments])
+        self.assertEqual([[i, i * 0.5, f'v"{i}'] for i in range(25)],
+                         [row for f in fragments[:3] for row in f.values])
+        self.assertEqual(['time', 'value', 'label'], fragments[0].columns)
+
+    def test_lazy_and_errors(self):
+        def handle(_request):
+            body = json.dumps({'results': [{'statement_id': 0, 'series': [
+                {'name': 'cpu', 'columns': ['time'], 'values': [[1]]}]}]}) + '\n'
+            body += json.dumps({'results': [{'statement_id': 0, 'error': 'shard not found'}]}) + '\n'
+            return test_utils.StubResponse(status=HTTPStatus.OK, body=body.encode())
+
+        query = models.Query(database='db0', command='select * from cpu', retention_policy='')
+        with test_utils.StubServer(handle) as server:
+            with client_impl.OpenGeminiDBClient(models.Config(address=[server.address])) as cli:
+                it = cli.query_iter(query)
+                self.assertEqual(0, len(server.requests))
+                self.assertEqual([[1]], next(it).values)
+                with self.assertRaises(HTTPError):
+                    next(it)
+                with self.assertRaises(ValueError):
+                    next(cli.query_iter(query, chunk_size=0))
+
+
+class AsyncQueryIterTest(unittest.IsolatedAsyncioTestCase):
+
+    async def test_fragments(self):
+        query = models.Query(database='db0', command='select * from cpu group by host', retention_policy='')
+        with test_utils.StubServer(chunked_handler(2500)) as server:
+            async with AsyncOpenGeminiDBClient(models.Config(address=[server.address])) as cli:
+                fragments = [f async for f in cli.query_iter(query, chunk_size=1000)]
+        self.assertEqual([1000, 1000, 500] * 2, [len(f.values) for f in fragments])
+        self.assertEqual([[i, i * 0.5, f'v"{i}'] for i in range(2500)],
+                         [row for f in fragments[3:] for row in f.values])
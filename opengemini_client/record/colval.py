@@ -15,7 +15,8 @@
 import struct
 from dataclasses import dataclass, field
 from typing import List
-from opengemini_client.codec.binary_encoder import (append_int64, append_bytes, append_uint32_list)
+from opengemini_client.codec.binary_encoder import (append_int64, append_bytes, append_uint32_list, put_int64,
+                                                    put_bytes, put_uint32_list)
 from opengemini_client.codec.binary_decoder import BinaryDecoder
 from opengemini_client.codec.size import size_of_int64, size_of_bytes, size_of_uint32_list
 
@@ -43,7 +44,7 @@ class ColVal:
 
     def _reset_bitmap(self, index: int):
         if (self.Len + self.BitmapOffset) >> 3 >= len(self.Bitmap):
-            self.Bitmap = struct.pack('<B', 0)
+            self.Bitmap += struct.pack('<B', 0)
             return
         index += self.BitmapOffset
         index1 = index >> 3
@@ -118,6 +119,14 @@ class ColVal:
         buf = append_uint32_list(buf, self.Offset)
         return buf
 
+    def marshal_into(self, buf: bytearray, offset: int) -> int:
+        offset = put_int64(buf, offset, self.Len)
+        offset = put_int64(buf, offset, self.NilCount)
+        offset = put_int64(buf, offset, self.BitmapOffset)
+        offset = put_bytes(buf, offset, self.Val)
+        offset = put_bytes(buf, offset, self.Bitmap)
+        return put_uint32_list(buf, offset, self.Offset)
+
     def unmarshal(self, buf: bytes):
         if len(buf) == 0:
             return
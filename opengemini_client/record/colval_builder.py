@@ -0,0 +1,153 @@
+# Copyright 2025 openGemini Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import struct
+from array import array
+from typing import Any, Optional, Sequence, Tuple
+
+import numpy
+
+from opengemini_client.record.colval import ColVal
+
+_BitMask = [1, 2, 4, 8, 16, 32, 64, 128]
+
+_pack_int64 = struct.Struct('<q').pack
+_pack_float64 = struct.Struct('<d').pack
+
+
+def _dense(values: Sequence[Any], valid: Optional[Sequence[bool]], dtype) \
+        -> Tuple[numpy.ndarray, Optional[numpy.ndarray]]:
+    """
+    split per-row values into the non-null values and a validity mask, the mask is None when no row is null
+    """
+    if valid is None and not isinstance(values, numpy.ndarray):
+        mask = numpy.fromiter((v is not None for v in values), dtype=numpy.bool_, count=len(values))
+        if mask.all():
+            return numpy.asarray(values, dtype=dtype), None
+        return numpy.asarray([v for v in values if v is not None], dtype=dtype), mask
+    data = numpy.asarray(values)
+    if valid is None:
+        return data.astype(dtype, copy=False), None
+    mask = numpy.asarray(valid, dtype=numpy.bool_)
+    return data[mask].astype(dtype, copy=False), mask
+
+
+class ColValBuilder:
+    """
+    growable ColVal whose buffers are appended in place, build() returns a ColVal that marshals
+    exactly like one filled through the ColVal append methods
+    """
+
+    def __init__(self):
+        self._val = bytearray()
+        self._offsets = array('I')
+        self._bitmap = bytearray()
+        self._len = 0
+        self._nil_count = 0
+
+    def __len__(self):
+        return self._len
+
+    def _append_bit(self, valid: bool):
+        index = self._len
+        if index & 0x07 == 0:
+            self._bitmap.append(1 if valid else 0)
+        elif valid:
+            self._bitmap[-1] |= _BitMask[index & 0x07]
+        self._len += 1
+        if not valid:
+            self._nil_count += 1
+
+    def _append_bits(self, count: int, mask: Optional[numpy.ndarray]):
+        if mask is None:
+            mask = numpy.ones(count, dtype=numpy.bool_)
+        head = min(count, (8 - (self._len & 0x07)) & 0x07)
+        for valid in mask[:head].tolist():
+            self._append_bit(valid)
+        rest = mask[head:]
+        self._bitmap += numpy.packbits(rest, bitorder='little').tobytes()
+        self._len += len(rest)
+        self._nil_count += len(rest) - int(numpy.count_nonzero(rest))
+
+    def append_integer(self, v: int):
+        self._val += _pack_int64(v)
+        self._append_bit(True)
+
+    def append_float(self, v: float):
+        self._val += _pack_float64(v)
+        self._append_bit(True)
+
+    def append_boolean(self, v: bool):
+        self._val.append(1 if v else 0)
+        self._append_bit(True)
+
+    def append_string(self, v: str):
+        self._offsets.append(len(self._val))
+        self._val += v.encode("utf-8")
+        self._append_bit(True)
+
+    def append_null(self):
+        self._append_bit(False)
+
+    def append_nulls(self, count: int):
+        self._append_bits(count, numpy.zeros(count, dtype=numpy.bool_))
+
+    def append_string_null(self):
+        self._offsets.append(len(self._val))
+        self._append_bit(False)
+
+    def append_string_nulls(self, count: int):
+        self._offsets.extend([len(self._val)] * count)
+        self.append_nulls(count)
+
+    def append_integer_many(self, values: Sequence[Optional[int]], valid: Optional[Sequence[bool]] = None):
+        """
+        append one value per row, rows whose value is None or whose valid flag is False are nulls
+        """
+        data, mask = _dense(values, valid, '<i8')
+        self._val += data.tobytes()
+        self._append_bits(len(values), mask)
+
+    def append_float_many(self, values: Sequence[Optional[float]], valid: Optional[Sequence[bool]] = None):
+        data, mask = _dense(values, valid, '<f8')
+        self._val += data.tobytes()
+        self._append_bits(len(values), mask)
+
+    def append_boolean_many(self, values: Sequence[Optional[bool]], valid: Optional[Sequence[bool]] = None):
+        data, mask = _dense(values, valid, numpy.bool_)
+        self._val += data.view(numpy.uint8).tobytes()
+        self._append_bits(len(values), mask)
+
+    def append_string_many(self, values: Sequence[Optional[str]], valid: Optional[Sequence[bool]] = None):
+        if valid is None:
+            encoded = [b'' if v is None else v.encode("utf-8") for v in values]
+            mask = numpy.fromiter((v is not None for v in values), dtype=numpy.bool_, count=len(values))
+        else:
+            mask = numpy.asarray(valid, dtype=numpy.bool_)
+            encoded = [v.encode("utf-8") if ok else b'' for v, ok in zip(values, mask.tolist())]
+        lengths = numpy.fromiter((len(b) for b in encoded), dtype=numpy.int64, count=len(encoded))
+        starts = numpy.cumsum(lengths) - lengths + len(self._val)
+        self._offsets.frombytes(starts.astype(numpy.uint32).tobytes())
+        self._val += b''.join(encoded)
+        self._append_bits(len(values), None if mask.all() else mask)
+
+    def build(self) -> ColVal:
+        return ColVal(
+            Val=bytes(self._val),
+            Offset=self._offsets.tolist(),
+            Bitmap=bytes(self._bitmap),
+            BitmapOffset=0,
+            Len=self._len,
+            NilCount=self._nil_count,
+        )
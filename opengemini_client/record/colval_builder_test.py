@@ -0,0 +1,88 @@
+# Copyright 2025 openGemini Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import random
+import unittest
+
+import numpy
+
+from opengemini_client.record.colval import ColVal
+from opengemini_client.record.colval_builder import ColValBuilder
+
+_generators = {
+    'integer': lambda rnd: rnd.randint(-2 ** 63, 2 ** 63 - 1),
+    'float': lambda rnd: rnd.uniform(-1e300, 1e300),
+    'boolean': lambda rnd: rnd.random() < 0.5,
+    'string': lambda rnd: ''.join(rnd.choice('ab中é') for _ in range(rnd.randint(0, 5))),
+}
+
+
+def random_values(rnd: random.Random, kind: str, count: int, null_ratio: float):
+    return [None if rnd.random() < null_ratio else _generators[kind](rnd) for _ in range(count)]
+
+
+def reference_colval(kind: str, values) -> ColVal:
+    col = ColVal()
+    for v in values:
+        if v is None:
+            getattr(col, f"append_{kind}_null")()
+        else:
+            getattr(col, f"append_{kind}")(v)
+    return col
+
+
+class ColValBuilderTest(unittest.TestCase):
+
+    def test_append_matches_colval(self):
+        rnd = random.Random(1)
+        for kind in _generators:
+            for _ in range(50):
+                values = random_values(rnd, kind, rnd.randint(0, 40), rnd.choice([0, 0.3, 1]))
+                builder = ColValBuilder()
+                for v in values:
+                    if v is None and kind == 'string':
+                        builder.append_string_null()
+                    elif v is None:
+                        builder.append_null()
+                    else:
+                        getattr(builder, f"append_{kind}")(v)
+                self.assertEqual(reference_colval(kind, values).marshal(b''), builder.build().marshal(b''))
+
+    def test_append_many_matches_colval(self):
+        rnd = random.Random(2)
+        for kind in _generators:
+            for _ in range(50):
+                chunks = [random_values(rnd, kind, rnd.randint(0, 20), rnd.choice([0, 0.3, 1])) for _ in range(3)]
+                builder = ColValBuilder()
+                for chunk in chunks:
+                    getattr(builder, f"append_{kind}_many")(chunk)
+                expected = reference_colval(kind, [v for chunk in chunks for v in chunk])
+                self.assertEqual(expected.marshal(b''), builder.build().marshal(b''))
+
+    def test_append_many_with_valid_mask(self):
+        values = numpy.array([1.5, 2.5, 3.5, 4.5, 5.5, 6.5, 7.5, 8.5, 9.5])
+        valid = values < 5
+        builder = ColValBuilder()
+        builder.append_float(0.5)
+        builder.append_float_many(values, valid)
+        expected = reference_colval('float', [0.5] + [v if ok else None for v, ok in zip(values.tolist(), valid)])
+        self.assertEqual(expected, builder.build())
+
+    def test_append_nulls(self):
+        builder = ColValBuilder()
+        builder.append_string('x')
+        builder.append_string_nulls(10)
+        builder.append_string('y')
+        self.assertEqual(reference_colval('string', ['x'] + [None] * 10 + ['y']), builder.build())
+        self.assertEqual(12, len(builder))
@@ -14,7 +14,7 @@
 
 from dataclasses import dataclass
 from opengemini_client.codec.size import size_of_string, size_of_int64
-from opengemini_client.codec.binary_encoder import append_string, append_int64
+from opengemini_client.codec.binary_encoder import append_string, append_int64, put_string, put_int64
 from opengemini_client.codec.binary_decoder import BinaryDecoder
 
 Field_Type_Unknown = 0
@@ -37,6 +37,10 @@ class Field:
         buf = append_int64(buf, self.Type)
         return buf
 
+    def marshal_into(self, buf: bytearray, offset: int) -> int:
+        offset = put_string(buf, offset, self.Name)
+        return put_int64(buf, offset, self.Type)
+
     def unmarshal(self, buf: bytes):
         if len(buf) == 0:
             return
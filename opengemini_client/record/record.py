@@ -18,7 +18,7 @@ from typing import List
 from opengemini_client.record.colval import ColVal
 from opengemini_client.record.field import Field
 from opengemini_client.codec.size import size_of_uint32
-from opengemini_client.codec.binary_encoder import append_uint32
+from opengemini_client.codec.binary_encoder import put_uint32
 from opengemini_client.codec.binary_decoder import BinaryDecoder
 
 TimeField = "time"
@@ -30,18 +30,30 @@ class Record:
     Fields: List[Field] = field(default_factory=list)
 
     def marshal(self, buf: bytes) -> bytes:
+        out = bytearray(len(buf) + self.code_size())
+        out[:len(buf)] = buf
+        self.marshal_into(out, len(buf))
+        return bytes(out)
+
+    def marshal_into(self, buf: bytearray, offset: int) -> int:
+        """
+        write the record into buf at offset, buf must have at least code_size() bytes left
+        :return: the offset after the record
+        """
         # Fields
-        buf = append_uint32(buf, len(self.Fields))
+        offset = put_uint32(buf, offset, len(self.Fields))
         for f in self.Fields:
-            buf = append_uint32(buf, f.codec_size())
-            buf = f.marshal(buf)
+            start = offset + size_of_uint32()
+            offset = f.marshal_into(buf, start)
+            put_uint32(buf, start - size_of_uint32(), offset - start)
 
         # ColVals
-        buf = append_uint32(buf, len(self.ColVals))
+        offset = put_uint32(buf, offset, len(self.ColVals))
         for col in self.ColVals:
-            buf = append_uint32(buf, col.codec_size())
-            buf = col.marshal(buf)
-        return buf
+            start = offset + size_of_uint32()
+            offset = col.marshal_into(buf, start)
+            put_uint32(buf, start - size_of_uint32(), offset - start)
+        return offset
 
     def unmarshal(self, buf: bytes):
         if len(buf) == 0:
@@ -0,0 +1,113 @@
+# Copyright 2025 openGemini Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import random
+import struct
+import unittest
+
+import numpy
+
+from opengemini_client.record.colval_builder import ColValBuilder
+from opengemini_client.record.field import Field, Field_Type_Int, Field_Type_Float, Field_Type_Boolean, \
+    Field_Type_String, Field_Type_Tag
+from opengemini_client.record.record import Record
+
+
+# reference encoding, as done before marshal wrote into a preallocated buffer
+def legacy_int64(v: int) -> bytes:
+    v = (numpy.int64(v) << 1) ^ (v >> 63)
+    v = numpy.uint64(v)
+    return bytes([numpy.uint8(v >> s) for s in (56, 48, 40, 32, 24, 16, 8, 0)])
+
+
+def legacy_uint32(v: int) -> bytes:
+    v = numpy.uint32(v)
+    return bytes([numpy.uint8(v >> s) for s in (24, 16, 8, 0)])
+
+
+def legacy_colval(col) -> bytes:
+    buf = legacy_int64(col.Len) + legacy_int64(col.NilCount) + legacy_int64(col.BitmapOffset)
+    buf += legacy_uint32(len(col.Val)) + col.Val
+    buf += legacy_uint32(len(col.Bitmap)) + col.Bitmap
+    buf += legacy_uint32(len(col.Offset))
+    if len(col.Offset) != 0:
+        buf += struct.pack('<' + 'I ' * len(col.Offset), *col.Offset)
+    return buf
+
+
+def legacy_record(record: Record) -> bytes:
+    buf = legacy_uint32(len(record.Fields))
+    for f in record.Fields:
+        encoded = struct.pack('>H', len(f.Name)) + f.Name.encode() + legacy_int64(f.Type)
+        buf += legacy_uint32(len(encoded)) + encoded
+    buf += legacy_uint32(len(record.ColVals))
+    for col in record.ColVals:
+        encoded = legacy_colval(col)
+        buf += legacy_uint32(len(encoded)) + encoded
+    return buf
+
+
+def random_record(rnd: random.Random, rows: int) -> Record:
+    record = Record()
+    types = [Field_Type_Int, Field_Type_Float, Field_Type_Boolean, Field_Type_String, Field_Type_Tag]
+    for i in range(rnd.randint(1, 6)):
+        t = rnd.choice(types)
+        builder = ColValBuilder()
+        for _ in range(rows):
+            if rnd.random() < 0.2:
+                if t in (Field_Type_String, Field_Type_Tag):
+                    builder.append_string_null()
+                else:
+                    builder.append_null()
+            elif t == Field_Type_Int:
+                builder.append_integer(rnd.randint(-2 ** 63, 2 ** 63 - 1))
+            elif t == Field_Type_Float:
+                builder.append_float(rnd.uniform(-1e10, 1e10))
+            elif t == Field_Type_Boolean:
+                builder.append_boolean(rnd.random() < 0.5)
+            else:
+                builder.append_string(''.join(rnd.choice('abc') for _ in range(rnd.randint(0, 6))))
+        record.Fields.append(Field(Type=t, Name=f"field_{i}"))
+        record.ColVals.append(builder.build())
+    return record
+
+
+class RecordTest(unittest.TestCase):
+
+    def test_marshal_matches_legacy_encoding(self):
+        rnd = random.Random(1)
+        for _ in range(100):
+            record = random_record(rnd, rnd.randint(0, 30))
+            self.assertEqual(legacy_record(record), record.marshal(b''))
+
+    def test_marshal_keeps_prefix(self):
+        record = random_record(random.Random(2), 10)
+        self.assertEqual(b'head' + record.marshal(b''), record.marshal(b'head'))
+        self.assertEqual(len(record.marshal(b'')), record.code_size())
+
+    def test_marshal_unmarshal_round_trip(self):
+        rnd = random.Random(3)
+        for _ in range(100):
+            record = random_record(rnd, rnd.randint(0, 30))
+            decoded = Record()
+            decoded.unmarshal(record.marshal(b''))
+            self.assertEqual(record, decoded)
+
+    def test_non_ascii_field_name_round_trip(self):
+        builder = ColValBuilder()
+        builder.append_float(1.5)
+        record = Record(Fields=[Field(Type=Field_Type_Float, Name='温度')], ColVals=[builder.build()])
+        decoded = Record()
+        decoded.unmarshal(record.marshal(b''))
+        self.assertEqual(record, decoded)
@@ -0,0 +1,140 @@
+# Copyright 2025 openGemini Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+zero-copy decoding of marshaled records, column values are exposed as NumPy views over the input buffer
+"""
+import dataclasses
+from dataclasses import dataclass
+from typing import Any, List, Optional, Union
+
+import numpy
+
+from opengemini_client.codec.binary_decoder import BinaryDecoder
+from opengemini_client.record.field import Field, Field_Type_Int, Field_Type_Float, Field_Type_Boolean, \
+    Field_Type_String, Field_Type_Tag
+
+_dtypes = {
+    Field_Type_Int: numpy.dtype('<i8'),
+    Field_Type_Float: numpy.dtype('<f8'),
+    Field_Type_Boolean: numpy.dtype(numpy.bool_),
+}
+
+
+@dataclass
+class ColValView:
+    field: Field
+    length: int = 0
+    nil_count: int = 0
+    bitmap_offset: int = 0
+    val: memoryview = memoryview(b'')
+    bitmap: memoryview = memoryview(b'')
+    # start of every row in val for string and tag columns
+    offsets: numpy.ndarray = dataclasses.field(default_factory=lambda: numpy.empty(0, dtype='<u4'))
+
+    @staticmethod
+    def decode(f: Field, buf: memoryview) -> 'ColValView':
+        dec = BinaryDecoder(buf=buf, offset=0)
+        view = ColValView(field=f)
+        if len(buf) == 0:
+            return view
+        view.length = dec.int64()
+        view.nil_count = dec.int64()
+        view.bitmap_offset = dec.int64()
+        view.val = dec.bytes()
+        view.bitmap = dec.bytes()
+        view.offsets = dec.uint32_array()
+        return view
+
+    def is_string(self) -> bool:
+        return self.field.Type in (Field_Type_String, Field_Type_Tag)
+
+    def validity(self) -> numpy.ndarray:
+        """
+        one bool per row, False where the row is null
+        """
+        bits = numpy.unpackbits(numpy.frombuffer(self.bitmap, dtype=numpy.uint8), bitorder='little')
+        return bits[self.bitmap_offset:self.bitmap_offset + self.length].view(numpy.bool_)
+
+    def values(self) -> numpy.ndarray:
+        """
+        the value buffer of a numeric or boolean column as a typed view, nulls take no slot unless
+        the writer reserved one per row
+        """
+        dtype = _dtypes.get(self.field.Type)
+        if dtype is None:
+            raise ValueError(f"column {self.field.Name} of type {self.field.Type} has no fixed width values")
+        return numpy.frombuffer(self.val, dtype=dtype)
+
+    def row_values(self, fill: Any = 0) -> numpy.ndarray:
+        """
+        one value per row with fill at null rows, a view when no row is null
+        """
+        values = self.values()
+        if len(values) == self.length and self.nil_count == 0:
+            return values
+        valid = self.validity()
+        if len(values) == self.length:
+            return numpy.where(valid, values, fill)
+        rows = numpy.full(self.length, fill, dtype=values.dtype)
+        rows[valid] = values
+        return rows
+
+    def string_bounds(self) -> numpy.ndarray:
+        """
+        start offsets of every row followed by the end of the value buffer, row i spans bounds[i]:bounds[i+1]
+        """
+        if not self.is_string():
+            raise ValueError(f"column {self.field.Name} of type {self.field.Type} is not a string column")
+        return numpy.append(self.offsets, numpy.uint32(len(self.val)))
+
+    def strings(self) -> List[Optional[str]]:
+        bounds = self.string_bounds().tolist()
+        valid = self.validity().tolist()
+        val = self.val
+        return [str(val[bounds[i]:bounds[i + 1]], "utf-8") if valid[i] else None for i in range(self.length)]
+
+
+@dataclass
+class RecordView:
+    fields: List[Field] = dataclasses.field(default_factory=list)
+    columns: List[ColValView] = dataclasses.field(default_factory=list)
+
+    @staticmethod
+    def decode(buf: Union[bytes, bytearray, memoryview]) -> 'RecordView':
+        """
+        decode a marshaled record without copying column buffers, the views stay valid while buf is alive
+        """
+        view = RecordView()
+        buf = memoryview(buf).cast('B')
+        if len(buf) == 0:
+            return view
+        dec = BinaryDecoder(buf=buf, offset=0)
+        for _ in range(dec.uint32()):
+            fd = Field()
+            fd.unmarshal(dec.bytes())
+            view.fields.append(fd)
+        for i in range(dec.uint32()):
+            f = view.fields[i] if i < len(view.fields) else Field()
+            view.columns.append(ColValView.decode(f, dec.bytes()))
+        return view
+
+    def column(self, name: str) -> ColValView:
+        for col in self.columns:
+            if col.field.Name == name:
+                return col
+        raise KeyError(name)
+
+    def row_count(self) -> int:
+        return self.columns[0].length if self.columns else 0
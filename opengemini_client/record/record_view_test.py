@@ -0,0 +1,83 @@
+# Copyright 2025 openGemini Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import numpy
+
+from opengemini_client.record.colval_builder import ColValBuilder
+from opengemini_client.record.field import Field, Field_Type_Int, Field_Type_Float, Field_Type_Boolean, \
+    Field_Type_String, Field_Type_Tag
+from opengemini_client.record.record import Record
+from opengemini_client.record.record_view import RecordView
+
+
+def build_record() -> Record:
+    ints = ColValBuilder()
+    ints.append_integer_many([1, None, -3, 4, None, 6, 7, 8, 9, None])
+    floats = ColValBuilder()
+    floats.append_float_many(numpy.linspace(0, 1, 10))
+    bools = ColValBuilder()
+    bools.append_boolean_many([True, False, None, True, True, False, None, None, True, False])
+    strings = ColValBuilder()
+    strings.append_string_many(['a', None, '', 'ddd', '中文', None, 'g', 'h', 'i', 'j'])
+    tags = ColValBuilder()
+    tags.append_string_many(['host'] * 10)
+    return Record(
+        Fields=[Field(Type=Field_Type_Int, Name='i'), Field(Type=Field_Type_Float, Name='f'),
+                Field(Type=Field_Type_Boolean, Name='b'), Field(Type=Field_Type_String, Name='s'),
+                Field(Type=Field_Type_Tag, Name='t')],
+        ColVals=[ints.build(), floats.build(), bools.build(), strings.build(), tags.build()],
+    )
+
+
+class RecordViewTest(unittest.TestCase):
+
+    def setUp(self):
+        self.buf = build_record().marshal(b'')
+        self.view = RecordView.decode(self.buf)
+
+    def test_fields(self):
+        self.assertEqual(['i', 'f', 'b', 's', 't'], [f.Name for f in self.view.fields])
+        self.assertEqual(10, self.view.row_count())
+
+    def test_numeric_values(self):
+        col = self.view.column('i')
+        self.assertEqual([1, -3, 4, 6, 7, 8, 9], col.values().tolist())
+        self.assertEqual([True, False, True, True, False, True, True, True, True, False], col.validity().tolist())
+        self.assertEqual([1, 0, -3, 4, 0, 6, 7, 8, 9, 0], col.row_values().tolist())
+        numpy.testing.assert_array_equal(numpy.linspace(0, 1, 10), self.view.column('f').row_values())
+        self.assertEqual([1, 0, 0, 1, 1, 0, 0, 0, 1, 0], self.view.column('b').row_values(False).astype(int).tolist())
+
+    def test_values_share_buffer(self):
+        values = self.view.column('f').values()
+        self.assertFalse(values.flags.owndata)
+        self.assertIs(self.buf, values.base.obj if isinstance(values.base, memoryview) else values.base)
+
+    def test_strings(self):
+        col = self.view.column('s')
+        self.assertEqual(['a', None, '', 'ddd', '中文', None, 'g', 'h', 'i', 'j'], col.strings())
+        self.assertEqual(len(col.val), int(col.string_bounds()[-1]))
+        self.assertEqual(['host'] * 10, self.view.column('t').strings())
+        with self.assertRaises(ValueError):
+            self.view.column('i').string_bounds()
+
+    def test_matches_unmarshal(self):
+        record = Record()
+        record.unmarshal(self.buf)
+        for col, view in zip(record.ColVals, self.view.columns):
+            self.assertEqual(col.Len, view.length)
+            self.assertEqual(col.NilCount, view.nil_count)
+            self.assertEqual(col.Val, bytes(view.val))
+            self.assertEqual(col.Offset, view.offsets.tolist())
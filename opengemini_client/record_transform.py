@@ -16,7 +16,7 @@ from dataclasses import dataclass, field
 from typing import Dict, Union
 
 from opengemini_client.models import Point
-from opengemini_client.record.colval import ColVal
+from opengemini_client.record.colval_builder import ColValBuilder
 from opengemini_client.record.field import Field, Field_Type_Int, Field_Type_Float, Field_Type_Boolean, \
     Field_Type_String, Field_Type_Tag
 from opengemini_client.record.record import TimeField, Record
@@ -42,17 +42,13 @@ def get_field_type(v):
 @dataclass
 class Column:
     field: Field
-    col: ColVal
+    col: ColValBuilder
 
     def add_nulls(self, row_count):
         if self.field.Type in (Field_Type_String, Field_Type_Tag):
             self.col.append_string_nulls(row_count)
-        elif self.field.Type == Field_Type_Int:
-            self.col.append_integer_nulls(row_count)
-        elif self.field.Type == Field_Type_Float:
-            self.col.append_float_nulls(row_count)
-        elif self.field.Type == Field_Type_Boolean:
-            self.col.append_boolean_nulls(row_count)
+        elif self.field.Type in (Field_Type_Int, Field_Type_Float, Field_Type_Boolean):
+            self.col.append_nulls(row_count)
         else:
             raise err_invalid_field_value
 
@@ -83,7 +79,7 @@ class RecordTransform:
             if column is None:
                 column = Column(
                     field=Field(Name=name, Type=Field_Type_Tag),
-                    col=ColVal(),
+                    col=ColValBuilder(),
                 )
                 column.add_nulls(self.row_count)
             column.add_value(value)
@@ -96,7 +92,7 @@ class RecordTransform:
             if column is None:
                 column = Column(
                     field=Field(Name=name, Type=get_field_type(value)),
-                    col=ColVal(),
+                    col=ColValBuilder(),
                 )
                 column.add_nulls(self.row_count)
             column.add_value(value)
@@ -108,7 +104,7 @@ class RecordTransform:
         if column is None:
             column = Column(
                 field=Field(Name=TimeField, Type=Field_Type_Int),
-                col=ColVal(),
+                col=ColValBuilder(),
             )
             column.add_nulls(self.row_count)
         column.add_value(timestamp)
@@ -124,7 +120,7 @@ class RecordTransform:
             column = self.columns[name]
             if column is None:
                 continue
-            count = self.row_count - column.col.Len
+            count = self.row_count - len(column.col)
             if count <= 0:
                 continue
             column.add_nulls(count)
@@ -151,14 +147,14 @@ class RecordTransform:
         for column in self.columns.values():
             if column.field.Name == TimeField:
                 timestamps_field.append(column.field)
-                timestamps_col.append(column.col)
+                timestamps_col.append(column.col.build())
                 continue
             if column.field.Type == Field_Type_Tag:
                 tags_field.append(column.field)
-                tags_col.append(column.col)
+                tags_col.append(column.col.build())
                 continue
             fields_field.append(column.field)
-            fields_col.append(column.col)
+            fields_col.append(column.col.build())
         fields = fields_field + tags_field + timestamps_field
         cols = fields_col + tags_col + timestamps_col
         return Record(Fields=fields, ColVals=cols)
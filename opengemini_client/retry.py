@@ -0,0 +1,101 @@
+# Copyright 2025 openGemini Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+retry backoff and hedge delay computation, shared by both clients
+"""
+import bisect
+import random
+import threading
+from collections import deque
+from typing import Callable, Optional
+
+from opengemini_client.models import HedgeConfig, RetryConfig
+
+
+def check_retry_config(retry_config: RetryConfig):
+    if retry_config is None:
+        return
+    if retry_config.max_attempts < 1:
+        raise ValueError("retry max attempts must be at least 1")
+    if retry_config.multiplier < 1:
+        raise ValueError("retry multiplier must be at least 1")
+    if retry_config.initial_backoff > retry_config.max_backoff:
+        raise ValueError("retry initial backoff must not exceed max backoff")
+
+
+def check_hedge_config(hedge_config: HedgeConfig):
+    if hedge_config is None:
+        return
+    if not 0 < hedge_config.percentile <= 1:
+        raise ValueError("hedge percentile must be in (0, 1]")
+    if hedge_config.window < 1 or hedge_config.min_samples < 1:
+        raise ValueError("hedge window and min samples must be at least 1")
+    if hedge_config.max_workers < 2:
+        raise ValueError("hedge max workers must be at least 2")
+
+
+def backoff_delay(retry_config: RetryConfig, attempt: int, rnd: Callable[[], float] = random.random) -> float:
+    """
+    seconds to wait after the failed attempt (counted from 1), full jitter over the exponential backoff
+    """
+    cap = retry_config.initial_backoff.total_seconds() * retry_config.multiplier ** (attempt - 1)
+    return rnd() * min(retry_config.max_backoff.total_seconds(), cap)
+
+
+def can_retry(retry_config: Optional[RetryConfig], attempt: int) -> bool:
+    return retry_config is not None and attempt < retry_config.max_attempts
+
+
+def is_retryable_status(retry_config: Optional[RetryConfig], status: int) -> bool:
+    return retry_config is not None and status in retry_config.retryable_status_codes
+
+
+class LatencyTracker:
+    """
+    latencies of the last window requests, in seconds, with a sorted copy for percentile lookups
+    """
+
+    def __init__(self, window: int):
+        self._samples = deque(maxlen=window)
+        self._sorted = []
+        self._lock = threading.Lock()
+
+    def record(self, latency: float):
+        with self._lock:
+            if len(self._samples) == self._samples.maxlen:
+                oldest = self._samples[0]
+                del self._sorted[bisect.bisect_left(self._sorted, oldest)]
+            self._samples.append(latency)
+            bisect.insort(self._sorted, latency)
+
+    def percentile(self, p: float) -> Optional[float]:
+        with self._lock:
+            if len(self._sorted) == 0:
+                return None
+            return self._sorted[min(len(self._sorted) - 1, int(p * len(self._sorted)))]
+
+    def __len__(self):
+        return len(self._samples)
+
+
+def hedge_delay(hedge_config: HedgeConfig, tracker: LatencyTracker) -> float:
+    """
+    seconds to wait for the first answer of a query before sending it to a second endpoint
+    """
+    if len(tracker) < hedge_config.min_samples:
+        delay = hedge_config.initial_delay.total_seconds()
+    else:
+        delay = tracker.percentile(hedge_config.percentile)
+    return max(delay, hedge_config.min_delay.total_seconds())
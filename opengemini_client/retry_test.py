@@ -0,0 +1,197 @@
+# Copyright 2025 openGemini Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import gzip
+import json
+import random
+import time
+import unittest
+from datetime import datetime, timedelta
+from http import HTTPStatus
+
+from requests import HTTPError
+
+from opengemini_client import client_impl, line_protocol, models, test_utils
+from opengemini_client.balancer_test import closed_port
+from opengemini_client.retry import LatencyTracker, backoff_delay, hedge_delay
+
+_query_body = json.dumps({'results': [{'statement_id': 0, 'series': [
+    {'name': 'cpu', 'columns': ['time', 'value'], 'values': [[1, 1.5]]}]}]}).encode()
+
+fast_retry = models.RetryConfig(initial_backoff=timedelta(milliseconds=1), max_backoff=timedelta(milliseconds=5))
+
+
+def failing(statuses):
+    """
+    answer with the given statuses in turn, then with 204
+    """
+    statuses = list(statuses)
+
+    def handle(_request: test_utils.StubRequest) -> test_utils.StubResponse:
+        if statuses:
+            return test_utils.StubResponse(status=statuses.pop(0))
+        return test_utils.StubResponse()
+
+    return handle
+
+
+def delayed_query(delay: float):
+    def handle(_request: test_utils.StubRequest) -> test_utils.StubResponse:
+        time.sleep(delay)
+        return test_utils.StubResponse(status=HTTPStatus.OK, body=_query_body)
+
+    return handle
+
+
+class RetryPolicyTest(unittest.TestCase):
+
+    def test_backoff_delay(self):
+        retry_config = models.RetryConfig(initial_backoff=timedelta(milliseconds=100), max_backoff=timedelta(seconds=1))
+        self.assertEqual([0.1, 0.2, 0.4, 0.8, 1.0, 1.0],
+                         [round(backoff_delay(retry_config, attempt, lambda: 1.0), 6) for attempt in range(1, 7)])
+        self.assertEqual(0.05, backoff_delay(retry_config, 1, lambda: 0.5))
+        self.assertEqual(0, backoff_delay(retry_config, 3, lambda: 0.0))
+
+    def test_latency_tracker_percentile(self):
+        rnd = random.Random(1)
+        tracker = LatencyTracker(window=50)
+        samples = []
+        for _ in range(500):
+            latency = rnd.random()
+            samples.append(latency)
+            tracker.record(latency)
+            window = sorted(samples[-50:])
+            for p in (0.5, 0.95, 1.0):
+                self.assertEqual(window[min(len(window) - 1, int(p * len(window)))], tracker.percentile(p))
+        self.assertEqual(50, len(tracker))
+
+    def test_hedge_delay(self):
+        hedge_config = models.HedgeConfig(min_samples=10, initial_delay=timedelta(milliseconds=30),
+                                          min_delay=timedelta(milliseconds=2))
+        tracker = LatencyTracker(window=100)
+        self.assertEqual(0.03, hedge_delay(hedge_config, tracker))
+        for i in range(100):
+            tracker.record(i / 1000)
+        self.assertEqual(0.095, hedge_delay(hedge_config, tracker))
+        tracker = LatencyTracker(window=100)
+        for _ in range(100):
+            tracker.record(0.0001)
+        self.assertEqual(0.002, hedge_delay(hedge_config, tracker))
+
+    def test_invalid_config(self):
+        address = [models.Address(host='127.0.0.1', port=8086)]
+        for kwargs in ({'retry_config': models.RetryConfig(max_attempts=0)},
+                       {'retry_config': models.RetryConfig(multiplier=0.5)},
+                       {'hedge_config': models.HedgeConfig(percentile=0)},
+                       {'hedge_config': models.HedgeConfig(max_workers=1)}):
+            with self.subTest(kwargs=kwargs), self.assertRaises(ValueError):
+                client_impl.OpenGeminiDBClient(models.Config(address=address, **kwargs))
+
+
+class RetryClientTest(unittest.TestCase):
+
+    def setUp(self):
+        self.points = [models.Point(measurement='retry_mm', precision=models.Precision.PrecisionSecond,
+                                    fields={'x': float(i)}, timestamp=datetime.fromtimestamp(1700000000 + i))
+                       for i in range(2000)]
+
+    def write(self, server: test_utils.StubServer, **kwargs):
+        with client_impl.OpenGeminiDBClient(models.Config(address=[server.address], **kwargs)) as cli:
+            cli.write_batch_points('retry_db', models.BatchPoints(points=self.points))
+
+    def test_retry_until_success(self):
+        with test_utils.StubServer(failing([503, 502])) as server:
+            self.write(server, retry_config=fast_retry)
+        self.assertEqual(3, len(server.requests))
+
+    def test_retry_exhausted(self):
+        with test_utils.StubServer(failing([503, 503, 503])) as server:
+            with self.assertRaises(HTTPError) as ctx:
+                self.write(server, retry_config=fast_retry)
+        self.assertEqual(3, len(server.requests))
+        self.assertEqual(503, ctx.exception.response.status_code)
+
+    def test_no_retry(self):
+        for kwargs in ({}, {'retry_config': fast_retry}):
+            with self.subTest(kwargs=kwargs):
+                # 400 is not retryable, and without retry_config nothing is
+                statuses = [400] if kwargs else [503]
+                with test_utils.StubServer(failing(statuses)) as server:
+                    with self.assertRaises(HTTPError):
+                        self.write(server, **kwargs)
+                self.assertEqual(1, len(server.requests))
+
+    def test_streamed_body_is_replayed(self):
+        with test_utils.StubServer(failing([503])) as server:
+            self.write(server, retry_config=fast_retry, gzip_enabled=True, gzip_streaming=True)
+        expected = line_protocol.encode_batch_points(models.BatchPoints(points=self.points))
+        self.assertEqual([expected, expected], [gzip.decompress(r.body) for r in server.requests])
+
+    def test_failover_to_next_endpoint(self):
+        dead = models.Address(host='127.0.0.1', port=closed_port())
+        with test_utils.StubServer() as server:
+            cfg = models.Config(address=[dead, server.address], retry_config=fast_retry)
+            with client_impl.OpenGeminiDBClient(cfg) as cli:
+                for _ in range(4):
+                    cli.write_batch_points('retry_db', models.BatchPoints(points=self.points[:1]))
+        self.assertEqual(4, len(server.requests))
+
+    def test_ping_does_not_fail_over(self):
+        dead = models.Address(host='127.0.0.1', port=closed_port())
+        with test_utils.StubServer() as server:
+            cfg = models.Config(address=[dead, server.address], retry_config=fast_retry)
+            with client_impl.OpenGeminiDBClient(cfg) as cli:
+                with self.assertRaises(Exception):
+                    cli.ping(0)
+        self.assertEqual(0, len(server.requests))
+
+
+class HedgedQueryTest(unittest.TestCase):
+
+    def test_hedge_slow_endpoint(self):
+        hedge_config = models.HedgeConfig(initial_delay=timedelta(milliseconds=50))
+        with test_utils.StubServer(delayed_query(1)) as slow, test_utils.StubServer(delayed_query(0)) as fast:
+            cfg = models.Config(address=[slow.address, fast.address], hedge_config=hedge_config)
+            with client_impl.OpenGeminiDBClient(cfg) as cli:
+                start = time.monotonic()
+                qr = cli.query(models.Query(database='db0', command='select * from cpu', retention_policy=''))
+                elapsed = time.monotonic() - start
+                self.assertEqual([[1, 1.5]], qr.results[0].series[0].values)
+                self.assertLess(elapsed, 0.5)
+                self.assertEqual(1, len(slow.requests))
+                self.assertEqual(1, len(fast.requests))
+
+    def test_no_hedge_before_delay(self):
+        hedge_config = models.HedgeConfig(initial_delay=timedelta(milliseconds=500))
+        with test_utils.StubServer(delayed_query(0)) as server1, test_utils.StubServer(delayed_query(0)) as server2:
+            cfg = models.Config(address=[server1.address, server2.address], hedge_config=hedge_config)
+            with client_impl.OpenGeminiDBClient(cfg) as cli:
+                for _ in range(4):
+                    cli.query(models.Query(database='db0', command='select * from cpu', retention_policy=''))
+                self.assertEqual(4, len(cli.query_latency))
+        self.assertEqual(2, len(server1.requests))
+        self.assertEqual(2, len(server2.requests))
+
+    def test_hedge_after_failure(self):
+        hedge_config = models.HedgeConfig(initial_delay=timedelta(milliseconds=20))
+
+        def broken_after_delay(_request):
+            time.sleep(0.1)
+            return test_utils.StubResponse(status=HTTPStatus.BAD_REQUEST)
+
+        with test_utils.StubServer(broken_after_delay) as broken, test_utils.StubServer(delayed_query(0.3)) as slow:
+            cfg = models.Config(address=[broken.address, slow.address], hedge_config=hedge_config)
+            with client_impl.OpenGeminiDBClient(cfg) as cli:
+                qr = cli.query(models.Query(database='db0', command='select * from cpu', retention_policy=''))
+        self.assertEqual([[1, 1.5]], qr.results[0].series[0].values)
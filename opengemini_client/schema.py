@@ -0,0 +1,223 @@
+# Copyright 2025 openGemini Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+writers compiled from a measurement schema, they serialize rows of values in schema order with the
+escaping, field order and value checks worked out once per schema instead of once per point
+"""
+import numbers
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy
+
+from opengemini_client import grpc_client
+from opengemini_client.line_protocol import escape_measurement, escape_string_field, escape_tag
+from opengemini_client.measurement import ErrEmptyMeasurement, FieldType, Measurement
+from opengemini_client.models import CompressMethod, Precision, timestamp_to_ns
+from opengemini_client.record.colval_builder import ColValBuilder
+from opengemini_client.record.field import Field, Field_Type_Boolean, Field_Type_Float, Field_Type_Int, \
+    Field_Type_String, Field_Type_Tag
+from opengemini_client.record.record import Record, TimeField
+
+# tag values in Measurement.tags order, field values in Measurement.fields order, then the timestamp;
+# None leaves a tag or field out, a row without any field is skipped
+SchemaRow = Sequence[Any]
+
+ErrSchemaNoFields = "schema has no fields"
+ErrRowLength = "row length does not match the schema"
+
+
+def _invalid(key: str, field_type: FieldType, value: Any) -> ValueError:
+    return ValueError(f"field {key} expects {field_type.value}, got {type(value).__name__}")
+
+
+def _int_checker(key: str) -> Callable[[Any], int]:
+    def check(value: Any) -> int:
+        if type(value) is int:  # pylint: disable=unidiomatic-typecheck
+            return value
+        if isinstance(value, numbers.Integral) and not isinstance(value, (bool, numpy.bool_)):
+            return int(value)
+        raise _invalid(key, FieldType.FieldTypeInt64, value)
+    return check
+
+
+def _float_checker(key: str) -> Callable[[Any], float]:
+    def check(value: Any) -> float:
+        if type(value) is float:  # pylint: disable=unidiomatic-typecheck
+            return value
+        if isinstance(value, numbers.Real) and not isinstance(value, (bool, numpy.bool_)):
+            return float(value)
+        raise _invalid(key, FieldType.FieldTypeFloat64, value)
+    return check
+
+
+def _string_checker(key: str) -> Callable[[Any], str]:
+    def check(value: Any) -> str:
+        if isinstance(value, str):
+            return value
+        raise _invalid(key, FieldType.FieldTypeString, value)
+    return check
+
+
+def _bool_checker(key: str) -> Callable[[Any], bool]:
+    def check(value: Any) -> bool:
+        if isinstance(value, (bool, numpy.bool_)):
+            return bool(value)
+        raise _invalid(key, FieldType.FieldTypeBool, value)
+    return check
+
+
+def _format_string(value: str) -> str:
+    return '"' + escape_string_field(value) + '"'
+
+
+# per field type: value check, line protocol text of a checked value, record column type and bulk append
+_field_types = {
+    FieldType.FieldTypeInt64: (_int_checker, lambda v: f"{v}i", Field_Type_Int, ColValBuilder.append_integer_many),
+    FieldType.FieldTypeFloat64: (_float_checker, lambda v: f"{v}", Field_Type_Float, ColValBuilder.append_float_many),
+    FieldType.FieldTypeString: (_string_checker, _format_string, Field_Type_String, ColValBuilder.append_string_many),
+    FieldType.FieldTypeBool: (_bool_checker, lambda v: 'T' if v else 'F', Field_Type_Boolean,
+                              ColValBuilder.append_boolean_many),
+}
+
+
+class SchemaWriter:
+    """
+    serializer of one measurement schema, built by the client's register_schema; rows are SchemaRow
+    sequences and integer timestamps are read in precision
+    """
+
+    def __init__(self, measurement: Measurement, precision: Precision = Precision.PrecisionNanoSecond):
+        if len(measurement.measurement) == 0:
+            raise ValueError(ErrEmptyMeasurement)
+        if len(measurement.fields) == 0:
+            raise ValueError(ErrSchemaNoFields)
+        self.measurement = measurement
+        self.precision = precision
+        self._prefix = escape_measurement(measurement.measurement)
+        self._tags = [',' + escape_tag(key) + '=' for key in measurement.tags]
+        self._fields = []
+        for key, field_type in measurement.fields.items():
+            check, fmt, _, _ = _field_types[field_type]
+            self._fields.append((escape_tag(key) + '=', check(key), fmt))
+        self._width = len(self._tags) + len(self._fields) + 1
+
+    def line(self, row: SchemaRow) -> str:
+        """
+        the line protocol of row without the trailing newline, empty when row has no field value
+        """
+        if len(row) != self._width:
+            raise ValueError(ErrRowLength)
+        parts = [self._prefix]
+        for i, key in enumerate(self._tags):
+            value = row[i]
+            if value:
+                parts.append(key)
+                parts.append(escape_tag(value))
+        sep = ' '
+        for i, (key, check, fmt) in enumerate(self._fields, len(self._tags)):
+            value = row[i]
+            if value is not None:
+                parts.append(sep)
+                parts.append(key)
+                parts.append(fmt(check(value)))
+                sep = ','
+        if sep == ' ':
+            return ''
+        if row[-1] is not None:
+            parts.append(' ')
+            parts.append(str(timestamp_to_ns(row[-1], self.precision)))
+        return ''.join(parts)
+
+    def encode(self, rows: Iterable[SchemaRow]) -> bytes:
+        """
+        newline separated line protocol body of rows
+        """
+        parts = []
+        for row in rows:
+            line = self.line(row)
+            if line:
+                parts.append(line)
+                parts.append('\n')
+        return ''.join(parts).encode()
+
+    def to_records(self, rows: Iterable[SchemaRow],
+                   compress_method: CompressMethod = CompressMethod.UNCOMPRESSED) -> list:
+        """
+        one gRPC record of rows, the columns are typed by the schema; rows without a timestamp are not allowed
+        """
+        tag_values, field_values, timestamps = self._columns(rows)
+        if len(timestamps) == 0:
+            return []
+        fields, cols = [], []
+        for (key, field_type), values in zip(self.measurement.fields.items(), field_values):
+            _, _, record_type, append_many = _field_types[field_type]
+            fields.append(Field(Name=key, Type=record_type))
+            cols.append(_build(append_many, values))
+        for key, values in zip(self.measurement.tags, tag_values):
+            fields.append(Field(Name=key, Type=Field_Type_Tag))
+            cols.append(_build(ColValBuilder.append_string_many, values))
+        fields.append(Field(Name=TimeField, Type=Field_Type_Int))
+        cols.append(_build(ColValBuilder.append_integer_many, timestamps))
+        record = Record(Fields=fields, ColVals=cols)
+        return [grpc_client.new_record(self.measurement.measurement, min(timestamps), max(timestamps), record,
+                                       compress_method)]
+
+    def _columns(self, rows: Iterable[SchemaRow]) -> Tuple[List[List[Optional[str]]], List[List[Any]], List[int]]:
+        tag_count = len(self._tags)
+        tag_values: List[List[Optional[str]]] = [[] for _ in self._tags]
+        field_values: List[List[Any]] = [[] for _ in self._fields]
+        timestamps: List[int] = []
+        for row in rows:
+            if len(row) != self._width:
+                raise ValueError(ErrRowLength)
+            if row[-1] is None:
+                raise ValueError("schema row without timestamp")
+            checked = [None if row[i] is None else check(row[i])
+                       for i, (_, check, _) in enumerate(self._fields, tag_count)]
+            if all(value is None for value in checked):
+                continue
+            for values, value in zip(tag_values, row):
+                values.append(value or None)
+            for values, value in zip(field_values, checked):
+                values.append(value)
+            timestamps.append(timestamp_to_ns(row[-1], self.precision))
+        return tag_values, field_values, timestamps
+
+
+def _build(append_many: Callable[[ColValBuilder, Sequence[Any]], None], values: Sequence[Any]):
+    builder = ColValBuilder()
+    append_many(builder, values)
+    return builder.build()
+
+
+class SchemaRegistry:
+    """
+    the schema writers registered with a client, keyed on database, retention policy and measurement
+    """
+
+    def __init__(self):
+        self._writers: Dict[Tuple[str, str, str], SchemaWriter] = {}
+
+    def register(self, measurement: Measurement, precision: Precision = Precision.PrecisionNanoSecond) \
+            -> SchemaWriter:
+        writer = SchemaWriter(measurement, precision)
+        self._writers[(measurement.database, measurement.retention_policy, measurement.measurement)] = writer
+        return writer
+
+    def get(self, database: str, measurement: str, rp: str = '') -> Optional[SchemaWriter]:
+        return self._writers.get((database, rp, measurement))
+
+    def __len__(self):
+        return len(self._writers)
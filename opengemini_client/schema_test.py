@@ -0,0 +1,138 @@
+# Copyright 2025 openGemini Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+from datetime import datetime, timezone
+
+import numpy
+
+from opengemini_client import client_impl, grpc_client, models, test_utils
+from opengemini_client.async_client import AsyncOpenGeminiDBClient
+from opengemini_client.measurement import FieldType, Measurement
+from opengemini_client.schema import SchemaRegistry, SchemaWriter
+
+measurement = Measurement(database='db0', measurement='cpu load', retention_policy='rp0', tags=['host', 'region'],
+                          fields={'count': FieldType.FieldTypeInt64, 'load': FieldType.FieldTypeFloat64,
+                                  'note': FieldType.FieldTypeString, 'up': FieldType.FieldTypeBool})
+
+rows = [
+    ['h,1', 'eu west', 3, 0.5, 'say "hi"', True, 1735689600],
+    ['h2', None, None, 1.25, None, False, 1735689601],
+    [None, 'us', 7, None, 'x', None, datetime(2025, 1, 1, tzinfo=timezone.utc)],
+]
+
+
+def to_point(row: list) -> models.Point:
+    tags = {key: value for key, value in zip(measurement.tags, row) if value is not None}
+    fields = {key: value for key, value in zip(measurement.fields, row[len(measurement.tags):]) if value is not None}
+    return models.Point(measurement=measurement.measurement, precision=models.Precision.PrecisionSecond, tags=tags,
+                        fields=fields, timestamp=row[-1])
+
+
+class SchemaWriterTest(unittest.TestCase):
+
+    def setUp(self):
+        self.writer = SchemaWriter(measurement, models.Precision.PrecisionSecond)
+
+    def test_encode_matches_points(self):
+        # Point writes booleans through its integer branch, so they are compared separately
+        without_bool = [row[:5] + [None] + row[6:] for row in rows]
+        expected = b''.join(to_point(row).to_string().encode() + b'\n' for row in without_bool)
+        self.assertEqual(expected, self.writer.encode(without_bool))
+        self.assertEqual(['up=T', 'up=F'], [line.split(' ')[-2].split(',')[-1]
+                                            for line in self.writer.encode(rows[:2]).decode().splitlines()])
+
+    def test_numpy_values(self):
+        row = ['h1', 'r1', numpy.int64(3), numpy.float32(0.5), 'n', numpy.bool_(True), numpy.int64(1735689600)]
+        self.assertEqual('cpu\\ load,host=h1,region=r1 count=3i,load=0.5,note="n",up=T 1735689600000000000',
+                         self.writer.line(row))
+
+    def test_rows_without_fields(self):
+        self.assertEqual(b'', self.writer.encode([['h1', 'r1', None, None, None, None, 1]]))
+        self.assertEqual([], self.writer.to_records([['h1', 'r1', None, None, None, None, 1]]))
+
+    def test_no_timestamp(self):
+        self.assertEqual('cpu\\ load count=1i', self.writer.line([None, None, 1, None, None, None, None]))
+        with self.assertRaises(ValueError):
+            self.writer.to_records([[None, None, 1, None, None, None, None]])
+
+    def test_invalid_rows(self):
+        for row in [['h1', 'r1', 1, 0.5, 'n', True], ['h1', 'r1', True, 0.5, 'n', True, 1],
+                    ['h1', 'r1', 1, 'x', 'n', True, 1], ['h1', 'r1', 1, 0.5, 2, True, 1],
+                    ['h1', 'r1', 1, 0.5, 'n', 1, 1]]:
+            with self.assertRaises(ValueError):
+                self.writer.line(row)
+            with self.assertRaises(ValueError):
+                self.writer.to_records([row])
+
+    def test_invalid_schema(self):
+        with self.assertRaises(ValueError):
+            SchemaWriter(Measurement(database='db0', measurement='', retention_policy='',
+                                     fields={'v': FieldType.FieldTypeInt64}))
+        with self.assertRaises(ValueError):
+            SchemaWriter(Measurement(database='db0', measurement='cpu', retention_policy='', tags=['host']))
+
+    def test_to_records_matches_columns(self):
+        dense = [['h1', 'r1', 1, 0.5, 'a', True, 1735689600], ['h2', 'r2', 2, 1.5, 'b', False, 1735689601]]
+        columns = list(zip(*dense))
+        expected = grpc_client.columns_to_records(
+            measurement.measurement, dict(zip(measurement.tags, columns[:2])),
+            dict(zip(measurement.fields, columns[2:6])), columns[6], models.Precision.PrecisionSecond)
+        self.assertEqual(expected, self.writer.to_records(dense))
+
+    def test_to_records_compressed(self):
+        (record,) = self.writer.to_records(rows, models.CompressMethod.ZSTD_FAST)
+        self.assertEqual(measurement.measurement, record.measurement)
+        self.assertEqual(1735689600000000000, record.min_time)
+        self.assertEqual(1735689601000000000, record.max_time)
+        self.assertEqual(models.CompressMethod.ZSTD_FAST.value, record.compress_method)
+
+    def test_registry(self):
+        registry = SchemaRegistry()
+        writer = registry.register(measurement)
+        self.assertIs(writer, registry.get('db0', 'cpu load', 'rp0'))
+        self.assertIsNone(registry.get('db0', 'cpu load'))
+        self.assertEqual(1, len(registry))
+
+
+class ClientSchemaTest(unittest.TestCase):
+
+    def test_write_rows(self):
+        with test_utils.StubServer() as server:
+            with client_impl.OpenGeminiDBClient(models.Config(address=[server.address])) as cli:
+                writer = cli.register_schema(measurement, models.Precision.PrecisionSecond)
+                cli.write_rows(writer, rows)
+            (request,) = [request for request in server.requests if request.path == '/write']
+            self.assertEqual(writer.encode(rows), request.body)
+            self.assertEqual('db0', request.params['db'])
+            self.assertEqual('rp0', request.params['rp'])
+
+    def test_empty_database(self):
+        cli = client_impl.OpenGeminiDBClient(models.Config(address=[models.Address(host='127.0.0.1', port=8086)]))
+        writer = cli.register_schema(Measurement(database='', measurement='cpu', retention_policy='',
+                                                 fields={'v': FieldType.FieldTypeInt64}))
+        with self.assertRaises(ValueError):
+            cli.write_rows(writer, [[1, 1]])
+        cli.close()
+
+
+class AsyncClientSchemaTest(unittest.IsolatedAsyncioTestCase):
+
+    async def test_write_rows(self):
+        with test_utils.StubServer() as server:
+            async with AsyncOpenGeminiDBClient(models.Config(address=[server.address])) as cli:
+                writer = cli.register_schema(measurement, models.Precision.PrecisionSecond)
+                await cli.write_rows(writer, rows)
+            (request,) = [request for request in server.requests if request.path == '/write']
+            self.assertEqual(writer.encode(rows), request.body)
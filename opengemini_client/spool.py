@@ -0,0 +1,308 @@
+# Copyright 2025 openGemini Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+durable on-disk spool of serialized write batches, replayed in order once the cluster is reachable again
+"""
+import asyncio
+import logging
+import mmap
+import os
+import struct
+import threading
+import zlib
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Callable, List, Optional
+
+import aiohttp
+import grpc
+import requests
+
+from opengemini_client.grpc_client import marshal_records
+from opengemini_client.models import SpoolConfig
+
+logger = logging.getLogger(__name__)
+
+ErrSpoolFull = "write spool is full"
+
+# transport errors of both clients meaning the request never got an answer; fixed rather than taken from
+# RetryConfig.retryable_exceptions, which may also hold errors of requests the server did answer
+UNREACHABLE_ERRORS = (requests.ConnectionError, requests.Timeout, aiohttp.ClientConnectionError, asyncio.TimeoutError)
+
+_SegmentSuffix = '.spool'
+# length and crc32 of the entry body that follows
+_header = struct.Struct('>II')
+# kind, database and retention policy lengths at the start of the entry body
+_meta = struct.Struct('>BHH')
+
+
+class SpoolKind(IntEnum):
+    # a line protocol body for the http write endpoint
+    LINE_PROTOCOL = 0
+    # marshaled record blocks for the grpc write service
+    RECORDS = 1
+
+
+@dataclass
+class SpoolEntry:
+    kind: SpoolKind
+    database: str
+    rp: str
+    payload: bytes
+    # position of the entry in the spool, set by Spool.peek
+    segment: int = -1
+    end: int = 0
+
+
+def check_spool_config(spool_config: SpoolConfig):
+    if spool_config is None:
+        return
+    if not spool_config.directory:
+        raise ValueError("spool directory must not be empty")
+    if spool_config.segment_size <= 0:
+        raise ValueError("spool segment size must be greater than 0")
+    if spool_config.max_bytes < spool_config.segment_size:
+        raise ValueError("spool max bytes must not be less than the segment size")
+    if spool_config.replay_interval.total_seconds() <= 0:
+        raise ValueError("spool replay interval must be greater than 0")
+
+
+def is_unreachable(err: Exception) -> bool:
+    """
+    whether err means the cluster could not be reached, only such failures are spooled
+    """
+    if isinstance(err, UNREACHABLE_ERRORS):
+        return True
+    code = getattr(err, 'code', None)
+    return isinstance(err, grpc.RpcError) and callable(code) and code() in (grpc.StatusCode.UNAVAILABLE,
+                                                                            grpc.StatusCode.DEADLINE_EXCEEDED)
+
+
+def new_spool(spool_config: Optional[SpoolConfig]) -> Optional['Spool']:
+    return None if spool_config is None else Spool(spool_config)
+
+
+def spools(spool: Optional['Spool'], err: Exception) -> bool:
+    """
+    whether the write that failed with err goes to spool instead of raising
+    """
+    return spool is not None and is_unreachable(err)
+
+
+def append_or_raise(spool: 'Spool', entry: SpoolEntry, err: Optional[Exception]):
+    """
+    append entry, raising err of the write, or ErrSpoolFull without one, when the spool is full
+    """
+    if not spool.append(entry):
+        raise err if err is not None else RuntimeError(ErrSpoolFull)
+
+
+def records_entry(database: str, rp: str, records: list) -> SpoolEntry:
+    return SpoolEntry(SpoolKind.RECORDS, database, rp, marshal_records(records))
+
+
+def encode_entry(entry: SpoolEntry) -> bytes:
+    database, rp = entry.database.encode(), entry.rp.encode()
+    body = _meta.pack(entry.kind, len(database), len(rp)) + database + rp + entry.payload
+    return _header.pack(len(body), zlib.crc32(body)) + body
+
+
+def decode_entry(buf, pos: int) -> Optional[SpoolEntry]:
+    """
+    the entry starting at pos of buf, None at the end of buf or when the rest of buf is torn or corrupt
+    """
+    if pos + _header.size > len(buf):
+        return None
+    length, crc = _header.unpack_from(buf, pos)
+    start, end = pos + _header.size, pos + _header.size + length
+    if end > len(buf) or length < _meta.size or zlib.crc32(buf[start:end]) != crc:
+        return None
+    kind, database_len, rp_len = _meta.unpack_from(buf, start)
+    start += _meta.size
+    database = bytes(buf[start:start + database_len]).decode()
+    start += database_len
+    rp = bytes(buf[start:start + rp_len]).decode()
+    return SpoolEntry(kind=SpoolKind(kind), database=database, rp=rp, payload=bytes(buf[start + rp_len:end]),
+                      end=end)
+
+
+def _fsync_directory(directory: str):
+    # make a new segment file itself durable, not only its content; not supported on every platform
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class Spool:
+    """
+    entries are appended to numbered segment files of up to segment_size bytes and read back through mmap
+    from the oldest segment on; a segment is deleted once its last entry is acknowledged. The read position
+    is kept in memory only, after a restart the remaining segments are replayed from their start, so an
+    entry may be written twice, which overwrites the same points on the server
+    """
+
+    def __init__(self, config: SpoolConfig):
+        self.config = config
+        os.makedirs(config.directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._segments: List[int] = []
+        self._bytes = 0
+        for name in sorted(os.listdir(config.directory)):
+            number = name[:-len(_SegmentSuffix)]
+            if not name.endswith(_SegmentSuffix) or len(number) != 16 or not number.isdigit():
+                continue
+            path = os.path.join(config.directory, name)
+            size = os.path.getsize(path)
+            if size == 0:
+                os.remove(path)
+                continue
+            self._segments.append(int(number))
+            self._bytes += size
+        self._next_segment = self._segments[-1] + 1 if self._segments else 0
+        # segment being appended to, sealed before it is read
+        self._writer = None
+        self._writer_segment = -1
+        self._writer_size = 0
+        self._reader: Optional[mmap.mmap] = None
+        self._reader_segment = -1
+        self._reader_pos = 0
+
+    def _path(self, segment: int) -> str:
+        return os.path.join(self.config.directory, f'{segment:016d}{_SegmentSuffix}')
+
+    @property
+    def size(self) -> int:
+        """
+        bytes held by the segment files
+        """
+        return self._bytes
+
+    def empty(self) -> bool:
+        with self._lock:
+            return len(self._segments) == 0
+
+    def append(self, entry: SpoolEntry) -> bool:
+        """
+        write the entry at the end of the spool, returns False when it would exceed max_bytes
+        """
+        data = encode_entry(entry)
+        with self._lock:
+            if self._bytes + len(data) > self.config.max_bytes:
+                return False
+            if self._writer is not None and self._writer_size + len(data) > self.config.segment_size:
+                self._seal()
+            if self._writer is None:
+                self._open_writer()
+            self._writer.write(data)
+            self._writer.flush()
+            if self.config.fsync:
+                os.fsync(self._writer.fileno())
+            self._writer_size += len(data)
+            self._bytes += len(data)
+            return True
+
+    def peek(self) -> Optional[SpoolEntry]:
+        """
+        the oldest entry not acknowledged yet, None when the spool is empty
+        """
+        with self._lock:
+            while True:
+                if self._reader is None:
+                    if not self._segments:
+                        return None
+                    if self._segments[0] == self._writer_segment:
+                        self._seal()
+                    self._open_reader(self._segments[0])
+                entry = decode_entry(self._reader, self._reader_pos)
+                if entry is not None:
+                    entry.segment = self._reader_segment
+                    return entry
+                if self._reader_pos < len(self._reader):
+                    logger.warning("dropping %d torn bytes at the end of spool segment %s",
+                                   len(self._reader) - self._reader_pos, self._path(self._reader_segment))
+                self._remove_reader()
+
+    def ack(self, entry: SpoolEntry):
+        """
+        mark entry and everything before it as written
+        """
+        with self._lock:
+            if entry.segment != self._reader_segment or entry.end <= self._reader_pos:
+                return
+            self._reader_pos = entry.end
+            if self._reader_pos >= len(self._reader):
+                self._remove_reader()
+
+    def replay(self, send: Callable[[SpoolEntry], None], stopped: Callable[[], bool] = lambda: False):
+        """
+        send the entries in order and acknowledge them, until the spool is empty, stopped returns True or
+        the cluster is unreachable again; a batch the cluster rejects is logged and dropped, replaying it
+        again would hold back everything behind it
+        """
+        entry = self.peek()
+        while entry is not None and not stopped():
+            try:
+                send(entry)
+            except Exception as err:  # pylint: disable=broad-exception-caught
+                if is_unreachable(err):
+                    return
+                logger.error("dropping spooled batch for database %s: %s", entry.database, err)
+            self.ack(entry)
+            entry = self.peek()
+
+    def close(self):
+        with self._lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+            if self._reader is not None:
+                self._reader.close()
+                self._reader = None
+
+    def _open_writer(self):
+        self._writer_segment = self._next_segment
+        self._next_segment += 1
+        self._writer = open(self._path(self._writer_segment), 'ab')  # pylint: disable=consider-using-with
+        self._writer_size = 0
+        self._segments.append(self._writer_segment)
+        if self.config.fsync:
+            _fsync_directory(self.config.directory)
+
+    def _seal(self):
+        self._writer.close()
+        self._writer = None
+        self._writer_segment = -1
+
+    def _open_reader(self, segment: int):
+        with open(self._path(segment), 'rb') as f:
+            self._reader = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._reader_segment = segment
+        self._reader_pos = 0
+
+    def _remove_reader(self):
+        size = len(self._reader)
+        self._reader.close()
+        self._reader = None
+        os.remove(self._path(self._reader_segment))
+        self._segments.remove(self._reader_segment)
+        self._bytes -= size
+        self._reader_segment = -1
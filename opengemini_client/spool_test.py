@@ -0,0 +1,205 @@
+# Copyright 2025 openGemini Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import os
+import tempfile
+import time
+import unittest
+from datetime import datetime, timedelta, timezone
+from http import HTTPStatus
+
+import requests
+
+from opengemini_client import client_impl, grpc_client, models, test_utils
+from opengemini_client.async_client import AsyncOpenGeminiDBClient
+from opengemini_client.balancer_test import closed_port
+from opengemini_client.spool import Spool, SpoolEntry, SpoolKind, check_spool_config
+
+
+def entry(payload: bytes, kind: SpoolKind = SpoolKind.LINE_PROTOCOL) -> SpoolEntry:
+    return SpoolEntry(kind=kind, database='db0', rp='rp0', payload=payload)
+
+
+def drain(spool: Spool) -> list:
+    payloads = []
+    item = spool.peek()
+    while item is not None:
+        payloads.append(item.payload)
+        spool.ack(item)
+        item = spool.peek()
+    return payloads
+
+
+def batch_points(value: int) -> models.BatchPoints:
+    point = models.Point(measurement='cpu', precision=models.Precision.PrecisionSecond, fields={'v': value},
+                         timestamp=datetime(2025, 1, 1, tzinfo=timezone.utc))
+    return models.BatchPoints(points=[point])
+
+
+def wait_for(condition, timeout: float = 5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not met in time")
+        time.sleep(0.02)
+
+
+class SpoolTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(self.tmp.cleanup)
+        self.config = models.SpoolConfig(directory=self.tmp.name, segment_size=64, max_bytes=1024)
+
+    def test_check_config(self):
+        check_spool_config(None)
+        check_spool_config(self.config)
+        for config in [models.SpoolConfig(directory=''), models.SpoolConfig(directory='d', segment_size=0),
+                       models.SpoolConfig(directory='d', segment_size=10, max_bytes=5),
+                       models.SpoolConfig(directory='d', replay_interval=timedelta(0))]:
+            with self.assertRaises(ValueError):
+                check_spool_config(config)
+
+    def test_order_across_segments(self):
+        spool = Spool(self.config)
+        payloads = [f'cpu v={i}'.encode() * 3 for i in range(10)]
+        for payload in payloads:
+            self.assertTrue(spool.append(entry(payload)))
+        self.assertGreater(len(os.listdir(self.tmp.name)), 1)
+        item = spool.peek()
+        self.assertEqual(('db0', 'rp0', SpoolKind.LINE_PROTOCOL), (item.database, item.rp, item.kind))
+        self.assertEqual(item.payload, spool.peek().payload)
+        self.assertEqual(payloads, drain(spool))
+        self.assertTrue(spool.empty())
+        self.assertEqual(0, spool.size)
+        self.assertEqual([], os.listdir(self.tmp.name))
+        spool.close()
+
+    def test_append_while_reading(self):
+        spool = Spool(self.config)
+        spool.append(entry(b'a'))
+        item = spool.peek()
+        spool.append(entry(b'b'))
+        spool.ack(item)
+        spool.append(entry(b'c'))
+        self.assertEqual([b'b', b'c'], drain(spool))
+        spool.close()
+
+    def test_max_bytes(self):
+        spool = Spool(self.config)
+        appended = 0
+        while spool.append(entry(b'x' * 40)):
+            appended += 1
+        self.assertGreater(appended, 0)
+        self.assertLessEqual(spool.size, self.config.max_bytes)
+        spool.ack(spool.peek())
+        self.assertTrue(spool.append(entry(b'x' * 40)))
+        spool.close()
+
+    def test_replay_after_restart(self):
+        spool = Spool(self.config)
+        for i in range(5):
+            spool.append(entry(str(i).encode() * 30, SpoolKind.RECORDS))
+        spool.ack(spool.peek())
+        spool.close()
+        spool = Spool(self.config)
+        self.assertEqual([str(i).encode() * 30 for i in range(1, 5)], drain(spool))
+        spool.close()
+
+    def test_torn_tail(self):
+        spool = Spool(self.config)
+        spool.append(entry(b'whole'))
+        spool.close()
+        (name,) = os.listdir(self.tmp.name)
+        with open(os.path.join(self.tmp.name, name), 'ab') as f:
+            f.write(b'\x00\x00\x00\x30torn')
+        spool = Spool(self.config)
+        with self.assertLogs('opengemini_client.spool', 'WARNING'):
+            self.assertEqual([b'whole'], drain(spool))
+        spool.close()
+
+
+class ClientSpoolTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(self.tmp.cleanup)
+        self.port = closed_port()
+        self.cfg = models.Config(address=[models.Address(host='127.0.0.1', port=self.port)],
+                                 spool_config=models.SpoolConfig(directory=self.tmp.name,
+                                                                 replay_interval=timedelta(milliseconds=50)))
+
+    def test_spool_and_replay(self):
+        with client_impl.OpenGeminiDBClient(self.cfg) as cli:
+            for i in range(3):
+                cli.write_batch_points('db0', batch_points(i))
+            self.assertFalse(cli.spool.empty())
+            with test_utils.StubServer(port=self.port) as server:
+                wait_for(cli.spool.empty)
+                writes = [request.body for request in server.requests if request.path == '/write']
+                self.assertEqual([b'cpu v=%di 1735689600000000000\n' % i for i in range(3)], writes)
+
+    def test_rejected_write_is_not_spooled(self):
+        def handler(_request: test_utils.StubRequest) -> test_utils.StubResponse:
+            return test_utils.StubResponse(status=HTTPStatus.BAD_REQUEST, body=b'bad')
+
+        with test_utils.StubServer(handler) as server:
+            self.cfg.address = [server.address]
+            with client_impl.OpenGeminiDBClient(self.cfg) as cli:
+                with self.assertRaises(requests.HTTPError):
+                    cli.write_batch_points('db0', batch_points(1))
+                self.assertTrue(cli.spool.empty())
+
+    def test_rejected_write_with_broad_retryable_exceptions(self):
+        def handler(_request: test_utils.StubRequest) -> test_utils.StubResponse:
+            return test_utils.StubResponse(status=HTTPStatus.BAD_REQUEST, body=b'bad')
+
+        with test_utils.StubServer(handler) as server:
+            self.cfg.address = [server.address]
+            self.cfg.retry_config = models.RetryConfig(max_attempts=1,
+                                                       retryable_exceptions=(requests.RequestException,))
+            with client_impl.OpenGeminiDBClient(self.cfg) as cli:
+                with self.assertRaises(requests.HTTPError):
+                    cli.write_batch_points('db0', batch_points(1))
+                self.assertTrue(cli.spool.empty())
+            self.assertEqual(1, len([request for request in server.requests if request.path == '/write']))
+
+    def test_spool_full(self):
+        self.cfg.spool_config.segment_size = self.cfg.spool_config.max_bytes = 16
+        with client_impl.OpenGeminiDBClient(self.cfg) as cli:
+            with self.assertRaises(requests.ConnectionError):
+                cli.write_batch_points('db0', batch_points(1))
+
+    def test_records_round_trip(self):
+        records = grpc_client.points_to_records(batch_points(1))
+        self.assertEqual(records, grpc_client.unmarshal_records(grpc_client.marshal_records(records)))
+
+
+class AsyncClientSpoolTest(unittest.IsolatedAsyncioTestCase):
+
+    async def test_spool_and_replay(self):
+        with tempfile.TemporaryDirectory() as directory:
+            port = closed_port()
+            cfg = models.Config(address=[models.Address(host='127.0.0.1', port=port)],
+                                spool_config=models.SpoolConfig(directory=directory,
+                                                                replay_interval=timedelta(milliseconds=50)))
+            async with AsyncOpenGeminiDBClient(cfg) as cli:
+                await cli.write_batch_points('db0', batch_points(1))
+                self.assertFalse(cli.spool.empty())
+                with test_utils.StubServer(port=port) as server:
+                    await asyncio.wait_for(cli.spool_task, 5)
+                    self.assertTrue(cli.spool.empty())
+                    self.assertEqual([b'cpu v=1i 1735689600000000000\n'],
+                                     [request.body for request in server.requests if request.path == '/write'])
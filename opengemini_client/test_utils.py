@@ -12,8 +12,20 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+# pylint: disable=no-member
+import threading
+from concurrent import futures
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List
+from urllib.parse import parse_qs, urlparse
+
+import grpc
+
 from opengemini_client import client_impl
 from opengemini_client import models
+from opengemini_client.proto import write_pb2, write_pb2_grpc
 
 
 def get_test_default_client():
@@ -23,3 +35,132 @@ def get_test_default_client():
                         ))
     cli = client_impl.OpenGeminiDBClient(cfg)
     return cli
+
+
+@dataclass
+class StubRequest:
+    method: str
+    path: str
+    params: Dict[str, str]
+    headers: Dict[str, str]
+    body: bytes
+
+
+@dataclass
+class StubResponse:
+    status: int = HTTPStatus.NO_CONTENT
+    body: bytes = b''
+    headers: Dict[str, str] = field(default_factory=dict)
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def _read_body(self) -> bytes:
+        if self.headers.get('Transfer-Encoding', '').lower() == 'chunked':
+            body = b''
+            while True:
+                size = int(self.rfile.readline().strip(), 16)
+                chunk = self.rfile.read(size + 2)[:size]
+                if size == 0:
+                    return body
+                body += chunk
+        return self.rfile.read(int(self.headers.get('Content-Length', 0)))
+
+    def _handle(self):
+        url = urlparse(self.path)
+        request = StubRequest(method=self.command, path=url.path,
+                              params={k: v[0] for k, v in parse_qs(url.query).items()},
+                              headers=dict(self.headers.items()), body=self._read_body())
+        self.server.stub.requests.append(request)
+        response = self.server.stub.handler(request)
+        self.send_response(response.status)
+        for key, value in response.headers.items():
+            self.send_header(key, value)
+        self.send_header('Content-Length', str(len(response.body)))
+        self.end_headers()
+        self.wfile.write(response.body)
+
+    do_GET = _handle
+    do_POST = _handle
+
+    def log_message(self, *args):
+        pass
+
+
+class StubServer:
+    """
+    local http server that records requests and answers them with handler, for tests without openGemini
+    """
+
+    def __init__(self, handler: Callable[[StubRequest], StubResponse] = None, port: int = 0):
+        self.requests: List[StubRequest] = []
+        self.handler = handler or (lambda request: StubResponse())
+        self.server = ThreadingHTTPServer(('127.0.0.1', port), _StubHandler)
+        self.server.stub = self
+        self.thread = threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True)
+
+    @property
+    def address(self) -> models.Address:
+        return models.Address(host='127.0.0.1', port=self.server.server_address[1])
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, _exc_type, _exc_val, _exc_tb):
+        self.stop()
+
+
+class StubWriteService(write_pb2_grpc.WriteServiceServicer):
+    """
+    grpc write service that records requests and the peers they came from
+    """
+
+    def __init__(self):
+        self.requests = []
+        self.peers = set()
+
+    def Write(self, request, context):
+        self.requests.append(request)
+        self.peers.add(context.peer())
+        return write_pb2.WriteResponse(code=write_pb2.Success)
+
+    def Ping(self, request, context):
+        return write_pb2.PingResponse(status=write_pb2.Up)
+
+
+class StubGrpcServer:
+    """
+    local grpc server running service, for tests without openGemini
+    """
+
+    def __init__(self, service: write_pb2_grpc.WriteServiceServicer = None):
+        self.service = service or StubWriteService()
+        self.server = grpc.server(futures.ThreadPoolExecutor(max_workers=2))
+        write_pb2_grpc.add_WriteServiceServicer_to_server(self.service, self.server)
+        self.port = self.server.add_insecure_port('127.0.0.1:0')
+
+    @property
+    def address(self) -> models.Address:
+        return models.Address(host='127.0.0.1', port=self.port)
+
+    def start(self):
+        self.server.start()
+
+    def stop(self):
+        self.server.stop(None)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, _exc_type, _exc_val, _exc_tb):
+        self.stop()
@@ -12,12 +12,15 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import gzip
+import threading
 import time
 import unittest
 from datetime import datetime
+from http import HTTPStatus
 
 import requests
-from opengemini_client import models
+from opengemini_client import client_impl, line_protocol, models
 from opengemini_client import test_utils
 
 
@@ -45,3 +48,90 @@ class WriteTest(unittest.TestCase):
             with self.assertRaises(requests.exceptions.HTTPError) as context:
                 cli.write_batch_points("write_test1", models.BatchPoints(points=[point]))
             self.assertRegex(str(context.exception), "database not found")
+
+
+class GzipWriteTest(unittest.TestCase):
+
+    def setUp(self):
+        self.points = [models.Point(measurement='gzip_mm', precision=models.Precision.PrecisionSecond,
+                                    fields={'x': float(i)}, tags={'host': f'h{i % 7}'},
+                                    timestamp=datetime.fromtimestamp(1700000000 + i)) for i in range(5000)]
+        self.expected = line_protocol.encode_batch_points(models.BatchPoints(points=self.points))
+
+    def write(self, **kwargs):
+        with test_utils.StubServer() as server:
+            cfg = models.Config(address=[server.address], gzip_enabled=True, **kwargs)
+            with client_impl.OpenGeminiDBClient(cfg) as cli:
+                cli.write_batch_points('gzip_db', models.BatchPoints(points=self.points))
+            return server.requests[0]
+
+    def test_gzip_level(self):
+        request = self.write(gzip_level=1)
+        self.assertEqual('gzip', request.headers['Content-Encoding'])
+        self.assertEqual(self.expected, gzip.decompress(request.body))
+
+    def test_gzip_min_size(self):
+        request = self.write(gzip_min_size=len(self.expected) + 1)
+        self.assertNotIn('Content-Encoding', request.headers)
+        self.assertEqual(self.expected, request.body)
+
+    def test_gzip_streaming(self):
+        request = self.write(gzip_streaming=True, gzip_level=6)
+        self.assertEqual('gzip', request.headers['Content-Encoding'])
+        self.assertEqual('chunked', request.headers['Transfer-Encoding'])
+        self.assertEqual(self.expected, gzip.decompress(request.body))
+
+    def test_invalid_gzip_level(self):
+        with self.assertRaises(ValueError):
+            client_impl.OpenGeminiDBClient(models.Config(address=[models.Address(host='127.0.0.1', port=8086)],
+                                                         gzip_level=10))
+
+
+class ParallelWriteTest(unittest.TestCase):
+
+    def setUp(self):
+        self.points = [models.Point(measurement='parallel_mm', precision=models.Precision.PrecisionSecond,
+                                    fields={'x': float(i)}, timestamp=datetime.fromtimestamp(1700000000 + i))
+                       for i in range(1000)]
+        # both servers must be inside a request at the same time, or the barrier breaks
+        self.barrier = threading.Barrier(2, timeout=5)
+
+    def handle(self, request: test_utils.StubRequest) -> test_utils.StubResponse:
+        if request.params['db'] == 'broken':
+            return test_utils.StubResponse(status=HTTPStatus.INTERNAL_SERVER_ERROR)
+        try:
+            self.barrier.wait()
+        except threading.BrokenBarrierError:
+            return test_utils.StubResponse(status=HTTPStatus.SERVICE_UNAVAILABLE)
+        return test_utils.StubResponse()
+
+    def test_sub_batches_sent_concurrently(self):
+        with test_utils.StubServer(self.handle) as server1, test_utils.StubServer(self.handle) as server2:
+            cfg = models.Config(address=[server1.address, server2.address],
+                                parallel_write_config=models.ParallelWriteConfig(sub_batch_size=250))
+            with client_impl.OpenGeminiDBClient(cfg) as cli:
+                result = cli.write_batch_points_parallel('parallel_db', models.BatchPoints(points=self.points))
+            self.assertTrue(result.success)
+            self.assertEqual(4, len(result.sub_batches))
+            self.assertEqual(2, len(server1.requests))
+            self.assertEqual(2, len(server2.requests))
+            body = b''.join(request.body for request in server1.requests + server2.requests)
+            expected = line_protocol.encode_batch_points(models.BatchPoints(points=self.points))
+            self.assertEqual(sorted(expected.splitlines()), sorted(body.splitlines()))
+
+    def test_failed_sub_batches(self):
+        with test_utils.StubServer(self.handle) as server:
+            cfg = models.Config(address=[server.address],
+                                parallel_write_config=models.ParallelWriteConfig(sub_batch_size=300))
+            with client_impl.OpenGeminiDBClient(cfg) as cli:
+                result = cli.write_batch_points_parallel('broken', models.BatchPoints(points=self.points))
+        self.assertFalse(result.success)
+        self.assertEqual([0, 1, 2, 3], [sub.index for sub in result.failed])
+        self.assertEqual([300, 300, 300, 100], [len(sub.batch_points.points) for sub in result.failed])
+        self.assertIsInstance(result.failed[0].error, requests.HTTPError)
+
+    def test_requires_config(self):
+        cfg = models.Config(address=[models.Address(host='127.0.0.1', port=8086)])
+        with client_impl.OpenGeminiDBClient(cfg) as cli:
+            with self.assertRaises(ValueError):
+                cli.write_batch_points_parallel('parallel_db', models.BatchPoints(points=self.points))
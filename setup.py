@@ -23,6 +23,12 @@ setup(
     long_description_content_type="text/markdown",
     url="https://github.com/openGemini/opengemini-client-python.git",
     packages=find_packages(),
+    extras_require={
+        "lz4": ["lz4"],
+        "zstd": ["zstandard"],
+        "snappy": ["python-snappy"],
+        "msgpack": ["msgpack"],
+    },
     classifiers=[
         "Programming Language :: Python :: 3",
         "Operating System :: OS Independent",